@@ -0,0 +1,436 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+可合并的提交聚合 - 按 (项目, 作者) 预计算的部分聚合
+
+扫描时为每个项目的每个作者身份计算一份部分聚合并随缓存保存，
+生成作者、团队、全组织报告时只需合并部分聚合，无需重新遍历提交列表。
+所有字段（计数、求和、直方图、每日统计、文件变更计数、Top-K 堆、提交说明词频、编码会话）都满足结合律，合并顺序不影响数值。
+"""
+
+import heapq
+from datetime import date, datetime
+from typing import Dict, List, Any, Iterable, Optional, Tuple
+
+import histogram_backend
+from commit_messages import MessageStats
+
+AGGREGATE_VERSION = 7
+
+# 部分聚合中每个排行榜保留的条目数（报告可配置的最大 top-k）
+LEADERBOARD_CAPACITY = 20
+
+# 逐提交维护的排行榜；条目为 (score, timestamp, short_hash, date, project, message, additions, deletions)
+COMMIT_BOARDS = ('top_refactors', 'largest_commits', 'largest_deletions')
+
+# 相邻提交间隔超过该值即切分为新的编码会话
+SESSION_GAP_SECONDS = 2 * 3600
+
+_SECONDS_PER_DAY = 86400
+# date(1970, 1, 1).toordinal()
+_EPOCH_ORDINAL = 719163
+_EPOCH = datetime(1970, 1, 1)
+
+
+def local_seconds(commit: Dict[str, Any]) -> int:
+    """提交在作者本地时区的"墙钟"秒数（author_ts + tz_offset）
+
+    旧数据没有 author_ts / tz_offset 时退回解析 date 字符串中的本地时间。
+    """
+    author_ts = commit.get('author_ts')
+    tz_offset = commit.get('tz_offset')
+    if author_ts is not None and tz_offset is not None:
+        return author_ts + tz_offset
+    local = datetime.fromisoformat(commit['date']).replace(tzinfo=None)
+    return int((local - _EPOCH).total_seconds())
+
+
+def format_time_of_day(seconds: Optional[int]) -> Optional[str]:
+    """一天内的秒数格式化为 HH:MM:SS"""
+    if seconds is None:
+        return None
+    return f"{seconds // 3600:02d}:{seconds % 3600 // 60:02d}:{seconds % 60:02d}"
+
+
+class TopK:
+    """有界小顶堆：流式保留分数最高的 k 个条目，O(n log k)，可合并
+
+    条目为元组，按 (score, 并列比较字段...) 比较；堆顶是当前第 k 名，
+    新条目不超过堆顶时直接丢弃，不需要保存或排序全部数据。
+    """
+
+    __slots__ = ('k', 'heap')
+
+    def __init__(self, k: int = LEADERBOARD_CAPACITY, items: Iterable[Tuple] = None):
+        self.k = k
+        self.heap = []
+        for item in items or []:
+            self.push(item)
+
+    def accepts(self, score, tiebreak) -> bool:
+        """分数为 score 的条目能否进入榜单（用于在构造条目前提前过滤）"""
+        heap = self.heap
+        if len(heap) < self.k:
+            return True
+        floor = heap[0]
+        return score > floor[0] or (score == floor[0] and tiebreak > floor[1])
+
+    def push(self, item: Tuple):
+        heap = self.heap
+        if len(heap) < self.k:
+            heapq.heappush(heap, item)
+        elif item > heap[0]:
+            heapq.heapreplace(heap, item)
+
+    def merge(self, other: 'TopK'):
+        for item in other.heap:
+            self.push(item)
+
+    def items(self, limit: int = None) -> List[Tuple]:
+        """按分数从高到低返回条目"""
+        ranked = sorted(self.heap, reverse=True)
+        return ranked[:limit] if limit is not None else ranked
+
+
+class SessionTracker:
+    """流式编码会话切分：逐条输入提交时间，相邻提交间隔超过 SESSION_GAP_SECONDS 即开始新会话
+
+    只保存当前会话的 (起点, 终点, 提交数)，输入按时间正序或倒序时每条 O(1)、结果精确；
+    乱序输入会产生重叠的会话，在 close 时按会话（而不是提交）排序合并。
+    会话列表 [start, end, commits] 可跨项目/身份合并：间隔不超过阈值的会话属于同一会话。
+    """
+
+    __slots__ = ('sessions', '_start', '_end', '_count')
+
+    def __init__(self, sessions: List[List[int]] = None):
+        self.sessions = sessions or []
+        self._start = self._end = None
+        self._count = 0
+
+    def add(self, seconds: int):
+        if not self._count:
+            self._start = self._end = seconds
+        elif seconds > self._end:
+            if seconds - self._end > SESSION_GAP_SECONDS:
+                self.sessions.append([self._start, self._end, self._count])
+                self._start, self._count = seconds, 0
+            self._end = seconds
+        elif seconds < self._start:
+            if self._start - seconds > SESSION_GAP_SECONDS:
+                self.sessions.append([self._start, self._end, self._count])
+                self._end, self._count = seconds, 0
+            self._start = seconds
+        self._count += 1
+
+    def close(self) -> List[List[int]]:
+        """结束当前会话，返回按起点排序并合并后的会话列表"""
+        if self._count:
+            self.sessions.append([self._start, self._end, self._count])
+            self._start = self._end = None
+            self._count = 0
+        self.sessions = _coalesce_sessions(self.sessions)
+        return self.sessions
+
+    def merge(self, other: 'SessionTracker') -> 'SessionTracker':
+        self.sessions = _coalesce_sessions(self.close() + other.close())
+        return self
+
+
+def _coalesce_sessions(sessions: List[List[int]]) -> List[List[int]]:
+    """合并重叠或间隔不超过阈值的会话（输入为有序会话列表拼接时排序近似线性）"""
+    if len(sessions) < 2:
+        return sessions
+    sessions.sort()
+    result = [list(sessions[0])]
+    for start, end, count in sessions[1:]:
+        last = result[-1]
+        if start - last[1] <= SESSION_GAP_SECONDS:
+            if end > last[1]:
+                last[1] = end
+            last[2] += count
+        else:
+            result.append([start, end, count])
+    return result
+
+
+class CommitAggregate:
+    """单次遍历、可合并、可序列化的提交聚合
+
+    一次循环内累加汇总、月/星期/小时分布、每日统计、重构指标和项目统计。
+    时间维度由 author_ts + tz_offset 整数运算得到（作者本地时区），
+    日期和月份字符串按天缓存，不解析也不切片日期字符串。
+    backend 为 numpy 时时间维度改由 histogram_backend 向量化计算，需在读取前调用 finalize。
+    """
+
+    def __init__(self, backend: str = 'python'):
+        # numpy 后端只收集时间和行数列，时间维度在 finalize 中向量化计算
+        self.vectorized = backend == 'numpy'
+        # (本地秒数, 新增行数, 删除行数)
+        self._columns = ([], [], [])
+        self.total_commits = 0
+        self.total_additions = 0
+        self.total_deletions = 0
+        self.files_changed = 0
+        self.refactor_commits = 0
+        # 字典按首次出现顺序保存，与原先多次遍历的输出顺序一致
+        self.monthly = {}
+        self.weekday = {}
+        self.hourly = {}
+        # date -> [count, additions, deletions, latest_seconds]（最晚提交时刻，一天内的秒数）
+        self.daily = {}
+        # project -> [commits, additions, deletions]
+        self.projects = {}
+        # project -> {文件路径: 变更次数}
+        self.files = {}
+        # project -> {语言: 变更行数}（每个提交的变更行数平均分摊到其修改的文件）
+        self.languages = {}
+        # 排行榜：净删除最多（重构）、变更最大、删除最多的提交
+        self.boards = {name: TopK() for name in COMMIT_BOARDS}
+        # 提交说明分类、引用和关键词
+        self.messages = MessageStats()
+        # 编码会话（本地时间秒数）
+        self.sessions = SessionTracker()
+        # 天序号 -> (date, month, weekday)
+        self._day_keys = {}
+
+    def add_commits(self, project_name: str, commits: Iterable[Dict[str, Any]]):
+        """累加一个项目的提交"""
+        monthly, weekday, hourly, daily = self.monthly, self.weekday, self.hourly, self.daily
+        day_keys = self._day_keys
+        refactors = self.boards['top_refactors']
+        largest = self.boards['largest_commits']
+        largest_deletions = self.boards['largest_deletions']
+        vectorized = self.vectorized
+        add_session = self.sessions.add
+        locals_, adds, dels = self._columns
+        project = self.projects.setdefault(project_name, [0, 0, 0])
+        project_files = self.files.setdefault(project_name, {})
+        project_languages = self.languages.setdefault(project_name, {})
+        messages = []
+
+        for commit in commits:
+            messages.append(commit.get('message', ''))
+            additions = commit.get('additions', 0)
+            deletions = commit.get('deletions', 0)
+            local = local_seconds(commit)
+            add_session(local)
+
+            self.total_commits += 1
+            self.total_additions += additions
+            self.total_deletions += deletions
+            self.files_changed += commit['files_changed']
+            project[0] += 1
+            project[1] += additions
+            project[2] += deletions
+            for path in commit.get('changed_files') or ():
+                project_files[path] = project_files.get(path, 0) + 1
+            languages = commit.get('languages')
+            if languages and (additions or deletions):
+                share = (additions + deletions) / len(languages)
+                for lang in languages:
+                    project_languages[lang] = project_languages.get(lang, 0) + share
+
+            days = local // _SECONDS_PER_DAY
+            keys = day_keys.get(days)
+            if keys is None:
+                day_date = date.fromordinal(days + _EPOCH_ORDINAL)
+                day_str = day_date.isoformat()
+                keys = day_keys[days] = (day_str, day_str[:7], day_date.weekday())
+            day, month, wd = keys
+
+            # 重构贡献：删除代码行数较多的提交
+            if deletions > additions * 1.5:
+                self.refactor_commits += 1
+
+            # 排行榜（并列时较新的提交优先）：先与堆顶比较，进榜时才构造条目
+            timestamp = commit.get('timestamp', 0)
+            lines = additions + deletions
+            net_deleted = deletions - additions
+            take_refactor = net_deleted > 0 and refactors.accepts(net_deleted, timestamp)
+            take_largest = lines > 0 and largest.accepts(lines, timestamp)
+            take_deletions = deletions > 0 and largest_deletions.accepts(deletions, timestamp)
+            if take_refactor or take_largest or take_deletions:
+                tail = (timestamp, commit.get('short_hash') or commit.get('hash', '')[:8], day,
+                        project_name, commit.get('message', '')[:50], additions, deletions)
+                if take_refactor:
+                    refactors.push((net_deleted,) + tail)
+                if take_largest:
+                    largest.push((lines,) + tail)
+                if take_deletions:
+                    largest_deletions.push((deletions,) + tail)
+
+            if vectorized:
+                locals_.append(local)
+                adds.append(additions)
+                dels.append(deletions)
+                continue
+
+            monthly[month] = monthly.get(month, 0) + 1
+            weekday[wd] = weekday.get(wd, 0) + 1
+
+            seconds = local - days * _SECONDS_PER_DAY
+            hour = seconds // 3600
+            hourly[hour] = hourly.get(hour, 0) + 1
+
+            stats = daily.get(day)
+            if stats is None:
+                daily[day] = [1, additions, deletions, seconds]
+            else:
+                stats[0] += 1
+                stats[1] += additions
+                stats[2] += deletions
+                # 更新最晚提交时间
+                if seconds > stats[3]:
+                    stats[3] = seconds
+
+        self.messages.add_messages(messages)
+
+    def finalize(self) -> 'CommitAggregate':
+        """结束当前会话；numpy 后端由收集的列一次性计算时间维度，并入已有的直方图"""
+        self.sessions.close()
+        locals_, adds, dels = self._columns
+        if locals_:
+            histograms = histogram_backend.time_histograms(locals_, adds, dels)
+            self._merge_time(histograms['monthly'], histograms['weekday'],
+                             histograms['hourly'], histograms['daily'])
+            self._columns = ([], [], [])
+        return self
+
+    def _merge_time(self, monthly: Dict, weekday: Dict, hourly: Dict, daily: Dict):
+        for target, source in ((self.monthly, monthly), (self.weekday, weekday), (self.hourly, hourly)):
+            for key, count in source.items():
+                target[key] = target.get(key, 0) + count
+        for day, (count, additions, deletions, latest) in daily.items():
+            stats = self.daily.get(day)
+            if stats is None:
+                self.daily[day] = [count, additions, deletions, latest]
+            else:
+                stats[0] += count
+                stats[1] += additions
+                stats[2] += deletions
+                if latest > stats[3]:
+                    stats[3] = latest
+
+    def merge(self, other: 'CommitAggregate') -> 'CommitAggregate':
+        """合并另一份聚合（原地修改并返回自身）"""
+        self.finalize()
+        other.finalize()
+        self.total_commits += other.total_commits
+        self.total_additions += other.total_additions
+        self.total_deletions += other.total_deletions
+        self.files_changed += other.files_changed
+        self.refactor_commits += other.refactor_commits
+        self._merge_time(other.monthly, other.weekday, other.hourly, other.daily)
+        for name, (commits, additions, deletions) in other.projects.items():
+            project = self.projects.setdefault(name, [0, 0, 0])
+            project[0] += commits
+            project[1] += additions
+            project[2] += deletions
+        for name, file_changes in other.files.items():
+            project_files = self.files.setdefault(name, {})
+            for path, changes in file_changes.items():
+                project_files[path] = project_files.get(path, 0) + changes
+        for name, language_lines in other.languages.items():
+            project_languages = self.languages.setdefault(name, {})
+            for lang, lines in language_lines.items():
+                project_languages[lang] = project_languages.get(lang, 0) + lines
+        for name, board in other.boards.items():
+            self.boards[name].merge(board)
+        self.messages.merge(other.messages)
+        self.sessions.merge(other.sessions)
+        return self
+
+    @classmethod
+    def merged(cls, aggregates: Iterable['CommitAggregate']) -> 'CommitAggregate':
+        """合并多份聚合为一份新的聚合（不修改输入）"""
+        result = cls()
+        for aggregate in aggregates:
+            result.merge(aggregate)
+        return result
+
+    def top_refactors(self, limit: int = 5) -> List[Dict[str, Any]]:
+        """净删除行数最多的提交"""
+        return [
+            {
+                'date': day,
+                'message': message,
+                'net_lines': net_lines,
+            }
+            for net_lines, _, _, day, _, message, _, _ in self.boards['top_refactors'].items(limit)
+        ]
+
+    def commit_board(self, name: str, limit: int) -> List[Dict[str, Any]]:
+        """逐提交排行榜（largest_commits / largest_deletions）"""
+        return [
+            {
+                'date': day,
+                'hash': short_hash,
+                'project': project,
+                'message': message,
+                'additions': additions,
+                'deletions': deletions,
+                'lines': additions + deletions,
+            }
+            for _, _, short_hash, day, project, message, additions, deletions in self.boards[name].items(limit)
+        ]
+
+    def to_dict(self) -> Dict[str, Any]:
+        """序列化为可JSON存储的字典（整数键的直方图保存为键值对列表）"""
+        self.finalize()
+        return {
+            'version': AGGREGATE_VERSION,
+            'total_commits': self.total_commits,
+            'total_additions': self.total_additions,
+            'total_deletions': self.total_deletions,
+            'files_changed': self.files_changed,
+            'refactor_commits': self.refactor_commits,
+            'monthly': list(self.monthly.items()),
+            'weekday': list(self.weekday.items()),
+            'hourly': list(self.hourly.items()),
+            'daily': [[day] + stats for day, stats in self.daily.items()],
+            'projects': [[name] + stats for name, stats in self.projects.items()],
+            'files': self.files,
+            'languages': self.languages,
+            'boards': {name: [list(item) for item in board.heap] for name, board in self.boards.items()},
+            'messages': self.messages.to_dict(),
+            'sessions': self.sessions.sessions,
+        }
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> 'CommitAggregate':
+        """从 to_dict 的结果恢复"""
+        if data.get('version') != AGGREGATE_VERSION:
+            raise ValueError(f"不支持的聚合版本: {data.get('version')}")
+        aggregate = cls()
+        aggregate.total_commits = data['total_commits']
+        aggregate.total_additions = data['total_additions']
+        aggregate.total_deletions = data['total_deletions']
+        aggregate.files_changed = data['files_changed']
+        aggregate.refactor_commits = data['refactor_commits']
+        aggregate.monthly = {key: count for key, count in data['monthly']}
+        aggregate.weekday = {key: count for key, count in data['weekday']}
+        aggregate.hourly = {key: count for key, count in data['hourly']}
+        aggregate.daily = {row[0]: row[1:] for row in data['daily']}
+        aggregate.projects = {row[0]: row[1:] for row in data['projects']}
+        aggregate.files = {name: dict(file_changes) for name, file_changes in data['files'].items()}
+        aggregate.languages = {name: dict(language_lines) for name, language_lines in data['languages'].items()}
+        for name, items in data['boards'].items():
+            aggregate.boards[name] = TopK(items=(tuple(item) for item in items))
+        aggregate.messages = MessageStats.from_dict(data['messages'])
+        aggregate.sessions = SessionTracker(data['sessions'])
+        return aggregate
+
+
+def build_partials(project_name: str, commits: Iterable[Dict[str, Any]],
+                   backend: str = 'python') -> Dict[Tuple[str, str], CommitAggregate]:
+    """按作者身份 (name, email) 计算一个项目的部分聚合"""
+    grouped: Dict[Tuple[str, str], List[Dict[str, Any]]] = {}
+    for commit in commits:
+        grouped.setdefault((commit['author'], commit['email']), []).append(commit)
+
+    partials = {}
+    for identity, author_commits in grouped.items():
+        aggregate = CommitAggregate(backend)
+        aggregate.add_commits(project_name, author_commits)
+        partials[identity] = aggregate.finalize()
+    return partials
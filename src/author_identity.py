@@ -0,0 +1,237 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+作者身份 - 身份倒排索引和别名聚类
+
+1. AuthorIndex: 一次遍历采集结果，建立 身份 -> 规范作者 -> 各项目提交位置 的倒排索引。
+   作者映射对每个 (name, email) 只计算一次并缓存；分组时直接按索引取出作者在各项目下的
+   部分聚合和提交，不再对每位作者的每个别名逐项目、逐提交匹配。
+   往年快照、代码归属、协作关系等按身份归并的环节共用同一个 key()。
+2. suggest_mappings: 按邮箱、GitHub noreply ID 和规范化的名字/邮箱前缀为每个身份生成若干键，
+   共享任一键的身份用并查集合并为同一人，输出建议的 author_mapping 条目（手工映射优先）。
+   每个身份的键数是常数，整体近似线性。
+"""
+
+import re
+import unicodedata
+from pathlib import Path
+from typing import Dict, List, Any, Callable, Optional, Tuple
+
+import yaml
+
+from logger_config import get_logger
+
+logger = get_logger(__name__)
+
+Identity = Tuple[str, str]
+
+# 建议映射的输出文件（与 author_mapping.yaml 同目录，确认后可复制过去）
+SUGGESTIONS_FILE = 'author_mapping.suggested.yaml'
+# 规范化后短于该长度的名字/邮箱前缀不参与合并，避免 "js"、"dev" 之类误合并
+MIN_KEY_LENGTH = 4
+# 常见的通用名字和邮箱前缀，不能说明是同一个人
+GENERIC_KEYS = frozenset({
+    'admin', 'administrator', 'build', 'contact', 'deploy', 'developer', 'github', 'gitlab',
+    'info', 'jenkins', 'mail', 'none', 'noreply', 'root', 'support', 'team', 'test', 'ubuntu',
+    'unknown', 'user',
+})
+
+_NOREPLY_RE = re.compile(r'^(?:(\d+)\+)?([^@]+)@users\.noreply\.github\.com$')
+_TOKEN_RE = re.compile(r'[^\W_]+')
+
+
+class AuthorIndex:
+    """作者身份倒排索引"""
+
+    def __init__(self, projects_data: List[Dict[str, Any]], mapping: Callable[[str], str]):
+        """
+        Args:
+            projects_data: 采集结果（含 partials: {(name, email): CommitAggregate} 和 commits）
+            mapping: 由 "Name <email>" 得到规范作者ID的函数（作者映射）
+        """
+        self._mapping = mapping
+        self._canonical: Dict[Identity, str] = {}
+        # 规范作者 -> 原始身份（按首次出现顺序）
+        self.aliases: Dict[str, List[Identity]] = {}
+        # 规范作者 -> {项目序号: [提交下标]}，项目按采集顺序
+        self.positions: Dict[str, Dict[int, List[int]]] = {}
+
+        for project_index, project_data in enumerate(projects_data):
+            # 部分聚合的键即为该项目中出现的身份，没有保留提交明细时也能确定作者参与的项目
+            for identity in project_data.get('partials') or {}:
+                self.positions.setdefault(self.key(identity), {}).setdefault(project_index, [])
+            for commit_index, commit in enumerate(project_data.get('commits', [])):
+                author = self.commit_key(commit)
+                self.positions.setdefault(author, {}).setdefault(project_index, []).append(commit_index)
+
+    def key(self, identity: Identity) -> str:
+        """身份对应的规范作者ID（带缓存）"""
+        author = self._canonical.get(identity)
+        if author is None:
+            author = self._canonical[identity] = self._mapping(f"{identity[0]} <{identity[1]}>")
+            self.aliases.setdefault(author, []).append(identity)
+        return author
+
+    def commit_key(self, commit: Dict[str, Any]) -> str:
+        """提交对应的规范作者ID"""
+        return self.key((commit.get('author', ''), commit.get('email', '')))
+
+    @property
+    def identity_count(self) -> int:
+        """已映射的身份数"""
+        return len(self._canonical)
+
+
+def normalize_name(text: str) -> Optional[str]:
+    """名字或邮箱前缀的规范形式：去掉重音、大小写和分隔符，去掉每个词末尾的数字，词按字母序拼接
+
+    "Sun_Tao"、"Tao Sun"、"sun.tao" 都得到 "suntao"，"rattus128" 得到 "rattus"；
+    过短或通用的结果返回 None。
+    """
+    text = ''.join(ch for ch in unicodedata.normalize('NFKD', text) if not unicodedata.combining(ch))
+    tokens = [token.rstrip('0123456789') for token in _TOKEN_RE.findall(text.lower())]
+    key = ''.join(sorted(token for token in tokens if token))
+    if len(key) < MIN_KEY_LENGTH or key in GENERIC_KEYS:
+        return None
+    return key
+
+
+def identity_keys(name: str, email: str) -> List[str]:
+    """身份的聚类键：完整邮箱、GitHub noreply 的数字ID、规范化的名字和邮箱前缀（或 GitHub 登录名）"""
+    email = email.strip().lower()
+    keys = []
+    local = ''
+    if email:
+        keys.append('e:' + email)
+        match = _NOREPLY_RE.match(email)
+        if match:
+            if match.group(1):
+                keys.append('gh:' + match.group(1))
+            local = match.group(2)
+        else:
+            local = email.split('@', 1)[0].split('+', 1)[0]
+    for text in (name, local):
+        key = normalize_name(text)
+        if key:
+            keys.append('n:' + key)
+    return keys
+
+
+def identity_commits(projects_data: List[Dict[str, Any]]) -> Dict[Identity, int]:
+    """各身份在采集结果中的提交数（由部分聚合得到）"""
+    commits: Dict[Identity, int] = {}
+    for project_data in projects_data:
+        for identity, aggregate in (project_data.get('partials') or {}).items():
+            commits[identity] = commits.get(identity, 0) + aggregate.total_commits
+    return commits
+
+
+def suggest_mappings(identities: Dict[Identity, int], mapping: Callable[[str], str]) -> Dict[str, str]:
+    """用并查集把疑似同一人的身份聚类，给出建议的作者映射
+
+    Args:
+        identities: {(name, email): 提交数}
+        mapping: 现有的作者映射函数；已被手工映射的身份不再给出建议，
+            但映射到同一作者的身份视为同一簇
+
+    Returns:
+        {"Name <email>": 规范作者ID}。簇内有手工映射时规范作者取其中提交最多的映射目标，
+        否则取提交最多的身份（优先非 noreply 邮箱）
+    """
+    items = list(identities.items())
+    parent = list(range(len(items)))
+    size = [1] * len(items)
+
+    def find(i: int) -> int:
+        while parent[i] != i:
+            parent[i] = parent[parent[i]]
+            i = parent[i]
+        return i
+
+    author_infos = []
+    targets = []
+    owner: Dict[str, int] = {}
+    for i, ((name, email), _) in enumerate(items):
+        author_info = f"{name} <{email}>"
+        target = mapping(author_info)
+        author_infos.append(author_info)
+        targets.append(target)
+        keys = identity_keys(name, email)
+        if target != author_info:
+            keys.append('m:' + target)
+        for key in keys:
+            j = owner.setdefault(key, i)
+            a, b = find(i), find(j)
+            if a != b:
+                if size[a] < size[b]:
+                    a, b = b, a
+                parent[b] = a
+                size[a] += size[b]
+
+    clusters: Dict[int, List[int]] = {}
+    for i in range(len(items)):
+        clusters.setdefault(find(i), []).append(i)
+
+    suggestions = {}
+    for members in clusters.values():
+        if len(members) < 2:
+            continue
+        mapped = [i for i in members if targets[i] != author_infos[i]]
+        if mapped:
+            weights: Dict[str, int] = {}
+            for i in mapped:
+                weights[targets[i]] = weights.get(targets[i], 0) + items[i][1]
+            canonical = max(sorted(weights), key=lambda target: weights[target])
+        else:
+            best = max(members, key=lambda i: (not _NOREPLY_RE.match(items[i][0][1].lower()), items[i][1],
+                                               -i))
+            canonical = author_infos[best]
+        for i in members:
+            if i not in mapped and author_infos[i] != canonical:
+                suggestions[author_infos[i]] = canonical
+    return dict(sorted(suggestions.items(), key=lambda item: (item[1], item[0])))
+
+
+def save_suggestions(path: Path, suggestions: Dict[str, str]):
+    """写出建议映射（YAML，格式与 author_mapping.yaml 相同），没有建议时删除旧文件"""
+    if not suggestions:
+        if path.exists():
+            path.unlink()
+        return
+    header = (
+        "# 自动生成的作者映射建议（同一人的多个身份），请确认后复制到 author_mapping.yaml\n"
+        "# 也可以设置 identity_clustering.apply: true 直接应用（手工映射优先）\n"
+    )
+    with open(path, 'w', encoding='utf-8') as f:
+        f.write(header)
+        yaml.safe_dump(suggestions, f, allow_unicode=True, sort_keys=False, width=1000)
+
+
+def cluster_author_mapping(projects_data: List[Dict[str, Any]], author_mapping: Dict[str, str],
+                           mapping: Callable[[str], str], options: Dict[str, Any],
+                           config_dir: Path) -> Dict[str, str]:
+    """身份聚类阶段：生成建议映射文件，按配置决定是否应用
+
+    Args:
+        projects_data: 采集结果
+        author_mapping: 手工作者映射
+        mapping: 使用手工映射的作者映射函数
+        options: config.yaml 的 identity_clustering 配置
+        config_dir: 建议映射的输出目录
+
+    Returns:
+        实际使用的作者映射（apply 时合并了建议映射）
+    """
+    if not options.get('enabled'):
+        return author_mapping
+    suggestions = suggest_mappings(identity_commits(projects_data), mapping)
+    save_suggestions(config_dir / SUGGESTIONS_FILE, suggestions)
+    if not suggestions:
+        logger.info("身份聚类: 没有发现疑似同一人的身份")
+        return author_mapping
+    logger.info(f"身份聚类: {len(suggestions)} 个身份建议合并到 {len(set(suggestions.values()))} 位作者，"
+                f"已写入 {config_dir / SUGGESTIONS_FILE}")
+    if not options.get('apply'):
+        return author_mapping
+    # 建议只包含未被手工映射的身份，合并后手工映射仍然优先
+    return {**author_mapping, **suggestions}
@@ -0,0 +1,179 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+缓存编码 - 紧凑的列式压缩格式（带可单独读取的头部）
+
+格式: MAGIC(4) | 压缩算法(1) | 头部长度(4, 大端) | 头部JSON | 各列的压缩数据
+
+- 头部不压缩，包含记录数、列名、聚合值和每列数据的偏移/长度，
+  读取总数/语言统计时无需解压提交数据，只需要部分列时只解压这些列
+- 列数据按列存储，重复的字符串（作者、邮箱、文件路径）使用字典编码
+- 解码时可只取部分行（先解出 hash 列确定需要的行，再按行取其他列）
+- 优先使用 zstd（需安装 zstandard），否则使用标准库 zlib
+"""
+
+import json
+import struct
+import zlib
+from typing import Dict, List, Any, Iterable
+
+try:
+    import zstandard
+except ImportError:  # zstd为可选依赖
+    zstandard = None
+
+
+MAGIC = b'YCC1'
+CODEC_ZLIB = 1
+CODEC_ZSTD = 2
+
+_PREFIX = struct.Struct('>4sBI')
+
+# 编码时使用的压缩算法（同一块内所有列相同）
+_CODEC = CODEC_ZSTD if zstandard is not None else CODEC_ZLIB
+
+
+def _compress(raw: bytes) -> bytes:
+    if _CODEC == CODEC_ZSTD:
+        return zstandard.ZstdCompressor(level=10).compress(raw)
+    return zlib.compress(raw, 6)
+
+
+def _decompress(codec: int, payload: bytes) -> bytes:
+    if codec == CODEC_ZLIB:
+        return zlib.decompress(payload)
+    if codec == CODEC_ZSTD:
+        if zstandard is None:
+            raise ValueError("缓存使用zstd压缩，请安装 zstandard: pip install zstandard")
+        return zstandard.ZstdDecompressor().decompress(payload)
+    raise ValueError(f"未知的压缩算法: {codec}")
+
+
+def _encode_column(values: List[Any]) -> Dict[str, Any]:
+    """编码单列：字符串列和字符串列表列使用字典编码"""
+    sample = next((v for v in values if v is not None), None)
+
+    if isinstance(sample, str):
+        table, index = [], {}
+        codes = []
+        for value in values:
+            if value is None:
+                codes.append(-1)
+                continue
+            code = index.get(value)
+            if code is None:
+                code = index[value] = len(table)
+                table.append(value)
+            codes.append(code)
+        # 字典编码只在有重复值时才划算
+        if len(table) < len(values):
+            return {'type': 'dict', 'table': table, 'codes': codes}
+
+    elif isinstance(sample, list) and all(isinstance(x, str) for v in values if v for x in v):
+        table, index = [], {}
+        codes = []
+        for value in values:
+            row = []
+            for item in value or []:
+                code = index.get(item)
+                if code is None:
+                    code = index[item] = len(table)
+                    table.append(item)
+                row.append(code)
+            codes.append(row)
+        return {'type': 'dict_list', 'table': table, 'codes': codes}
+
+    return {'type': 'plain', 'values': values}
+
+
+def _decode_column(column: Dict[str, Any], rows: List[int] = None) -> List[Any]:
+    """解码单列，rows 给出时只解码这些行（按给定顺序）"""
+    kind = column['type']
+    if kind == 'plain':
+        values = column['values']
+        return values if rows is None else [values[i] for i in rows]
+    table = column['table']
+    codes = column['codes'] if rows is None else [column['codes'][i] for i in rows]
+    if kind == 'dict':
+        return [table[code] if code >= 0 else None for code in codes]
+    if kind == 'dict_list':
+        return [[table[code] for code in row] for row in codes]
+    raise ValueError(f"未知的列编码: {kind}")
+
+
+def encode_records(records: Iterable[Dict[str, Any]], columns: List[str],
+                   aggregates: Dict[str, Any] = None) -> bytes:
+    """将记录列表编码为紧凑的二进制块
+
+    Args:
+        records: 记录列表（字典）
+        columns: 需要保存的字段
+        aggregates: 写入头部的聚合值（如总数、语言统计）
+    """
+    records = list(records)
+    segments = {}
+    chunks = []
+    offset = 0
+    for name in columns:
+        column = _encode_column([r.get(name) for r in records])
+        compressed = _compress(json.dumps(column, ensure_ascii=False, separators=(',', ':')).encode('utf-8'))
+        segments[name] = [offset, len(compressed)]
+        chunks.append(compressed)
+        offset += len(compressed)
+
+    header = json.dumps({
+        'version': 2,
+        'count': len(records),
+        'columns': list(columns),
+        'segments': segments,
+        'aggregates': aggregates or {},
+    }, ensure_ascii=False, separators=(',', ':')).encode('utf-8')
+
+    return _PREFIX.pack(MAGIC, _CODEC, len(header)) + header + b''.join(chunks)
+
+
+def _split(data: bytes):
+    magic, codec, header_len = _PREFIX.unpack_from(data, 0)
+    if magic != MAGIC:
+        raise ValueError("不是有效的缓存块")
+    start = _PREFIX.size
+    return codec, data[start:start + header_len], start + header_len
+
+
+def read_header(data: bytes) -> Dict[str, Any]:
+    """只读取头部（记录数、列名、聚合值），不解压列数据"""
+    _, header, _ = _split(data)
+    return json.loads(header.decode('utf-8'))
+
+
+def decode_columns(data: bytes, columns: List[str] = None,
+                   rows: List[int] = None) -> Dict[str, List[Any]]:
+    """解码列数据
+
+    Args:
+        data: 编码后的块
+        columns: 需要的列，None 时解码全部列；只解压这些列的数据
+        rows: 需要的行下标，None 时解码全部行
+    """
+    codec, header, offset = _split(data)
+    header = json.loads(header.decode('utf-8'))
+    segments = header['segments']
+    names = columns if columns is not None else header['columns']
+    decoded = {}
+    for name in names:
+        if name not in segments:
+            continue
+        start, length = segments[name]
+        start += offset
+        column = json.loads(_decompress(codec, data[start:start + length]).decode('utf-8'))
+        decoded[name] = _decode_column(column, rows)
+    return decoded
+
+
+def decode_records(data: bytes, columns: List[str] = None, rows: List[int] = None) -> List[Dict[str, Any]]:
+    """解码为记录列表（rows 给出时只解码这些行）"""
+    decoded = decode_columns(data, columns, rows)
+    if not decoded:
+        return []
+    names = list(decoded)
+    return [dict(zip(names, row)) for row in zip(*(decoded[name] for name in names))]
@@ -0,0 +1,203 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+扫描缓存管理 - 空间预算、LRU淘汰和命令行工具
+
+用法:
+    python src/cache_manager.py list [--year 2025]
+    python src/cache_manager.py verify
+    python src/cache_manager.py prune [--max-size-mb 200] [--older-than-days 90] [--project NAME] [--year 2024]
+    python src/cache_manager.py warm
+"""
+
+import os
+import sys
+import time
+from pathlib import Path
+from typing import Dict, List, Any, Tuple
+
+# 添加src目录到路径
+sys.path.insert(0, str(Path(__file__).parent))
+
+from commit_store import CommitStore
+from logger_config import get_logger
+
+logger = get_logger(__name__)
+
+# 没有记录扫描耗时的条目（如旧缓存导入），按每个提交5毫秒估算重扫成本
+_ESTIMATED_SECONDS_PER_COMMIT = 0.005
+
+
+class CacheManager:
+    """扫描缓存管理器
+
+    每个条目对应一个项目的一个年份，记录占用空间、最近访问时间和扫描耗时。
+    超出空间预算时按"闲置时间 / 重扫成本"从高到低淘汰：
+    长期未访问、重新扫描又便宜的条目优先淘汰，扫描昂贵的大仓库尽量保留。
+    """
+
+    def __init__(self, store: CommitStore, max_size_mb: float = None):
+        self.store = store
+        self.max_size_bytes = int(max_size_mb * 1024 * 1024) if max_size_mb else None
+
+    @staticmethod
+    def _rescan_cost(entry: Dict[str, Any]) -> float:
+        """条目的重扫成本（秒）"""
+        if entry.get('scan_duration'):
+            return entry['scan_duration']
+        return max(entry.get('total_commits', 0) * _ESTIMATED_SECONDS_PER_COMMIT, 0.1)
+
+    def list_entries(self, year: int = None) -> List[Dict[str, Any]]:
+        """列出所有缓存条目"""
+        return self.store.list_scans(year)
+
+    def total_size(self) -> int:
+        """所有条目占用空间（字节）"""
+        return sum(entry['size_bytes'] for entry in self.list_entries())
+
+    def eviction_order(self, now: float = None) -> List[Dict[str, Any]]:
+        """按淘汰优先级排序的条目（最先淘汰的在前）"""
+        now = now or time.time()
+
+        def score(entry):
+            idle = now - (entry.get('last_access') or 0)
+            return idle / self._rescan_cost(entry)
+
+        return sorted(self.list_entries(), key=score, reverse=True)
+
+    def _evict(self, entries: List[Dict[str, Any]]) -> List[Tuple[str, int]]:
+        evicted = []
+        for entry in entries:
+            self.store.delete_scan(entry['repo'], entry['year'])
+            evicted.append((entry['repo'], entry['year']))
+            logger.info(f"淘汰缓存: {entry['repo']} ({entry['year']}), "
+                        f"{entry['size_bytes'] / 1024:.1f}KB, 重扫成本 {self._rescan_cost(entry):.1f}秒")
+        if evicted:
+            self.store.vacuum()
+        return evicted
+
+    def enforce_budget(self, max_size_bytes: int = None) -> List[Tuple[str, int]]:
+        """淘汰条目直到总占用不超过预算
+
+        Returns:
+            被淘汰的 [(repo, year), ...]
+        """
+        budget = max_size_bytes if max_size_bytes is not None else self.max_size_bytes
+        if budget is None:
+            return []
+
+        total = self.total_size()
+        to_evict = []
+        for entry in self.eviction_order():
+            if total <= budget:
+                break
+            to_evict.append(entry)
+            total -= entry['size_bytes']
+        return self._evict(to_evict)
+
+    def prune(self, max_size_bytes: int = None, older_than_days: float = None,
+              repo: str = None, year: int = None) -> List[Tuple[str, int]]:
+        """按条件清理条目，最后再执行空间预算"""
+        now = time.time()
+        to_evict = []
+        if repo is not None or year is not None or older_than_days is not None:
+            for entry in self.list_entries():
+                if repo is not None and entry['repo'] != repo:
+                    continue
+                if year is not None and entry['year'] != year:
+                    continue
+                if older_than_days is not None and now - (entry.get('last_access') or 0) < older_than_days * 86400:
+                    continue
+                to_evict.append(entry)
+
+        evicted = self._evict(to_evict)
+        evicted.extend(self.enforce_budget(max_size_bytes))
+        return evicted
+
+    def verify(self) -> Dict[Tuple[str, int], List[str]]:
+        """校验所有条目，返回有问题的条目及问题描述"""
+        problems = {}
+        integrity = self.store.integrity_check()
+        if integrity != 'ok':
+            problems[('*', 0)] = [f"数据库完整性检查失败: {integrity}"]
+        for entry in self.list_entries():
+            entry_problems = self.store.verify_scan(entry['repo'], entry['year'])
+            if entry_problems:
+                problems[(entry['repo'], entry['year'])] = entry_problems
+        return problems
+
+
+def _format_time(timestamp: float) -> str:
+    if not timestamp:
+        return '-'
+    return time.strftime('%Y-%m-%d %H:%M', time.localtime(timestamp))
+
+
+def main():
+    import argparse
+    from config_loader import ConfigLoader
+
+    project_root = Path(__file__).parent.parent
+    os.chdir(project_root)
+
+    parser = argparse.ArgumentParser(description='Git扫描缓存管理')
+    parser.add_argument('--config', default=str(project_root / 'config' / 'config.yaml'), help='配置文件路径')
+    subparsers = parser.add_subparsers(dest='command', required=True)
+
+    list_parser = subparsers.add_parser('list', help='列出缓存条目')
+    list_parser.add_argument('--year', type=int, help='只列出指定年份')
+
+    subparsers.add_parser('verify', help='校验缓存完整性')
+
+    prune_parser = subparsers.add_parser('prune', help='清理缓存条目')
+    prune_parser.add_argument('--max-size-mb', type=float, help='空间预算（MB），默认使用配置 cache.max_size_mb')
+    prune_parser.add_argument('--older-than-days', type=float, help='清理超过N天未访问的条目')
+    prune_parser.add_argument('--project', help='清理指定项目')
+    prune_parser.add_argument('--year', type=int, help='清理指定年份')
+
+    subparsers.add_parser('warm', help='预热缓存（扫描配置中所有未缓存的项目）')
+
+    args = parser.parse_args()
+
+    config = ConfigLoader(args.config).load()
+    cache_dir = Path(config.get('cache_dir', './.git_scan_cache'))
+    max_size_mb = config.get('cache', {}).get('max_size_mb')
+
+    if args.command == 'warm':
+        from git_collector import GitDataCollector
+        collector_config = config.copy()
+        collector_config['authors'] = []
+        GitDataCollector(collector_config).collect_all_parallel()
+        return
+
+    manager = CacheManager(CommitStore(cache_dir / 'commits.db'), max_size_mb)
+
+    if args.command == 'list':
+        entries = manager.list_entries(args.year)
+        print(f"{'项目':<30} {'年份':>6} {'提交':>8} {'大小(KB)':>10} {'扫描耗时(s)':>12} {'最近访问':>18}")
+        for entry in entries:
+            duration = f"{entry['scan_duration']:.1f}" if entry.get('scan_duration') else '-'
+            print(f"{entry['repo']:<30} {entry['year']:>6} {entry['total_commits']:>8} "
+                  f"{entry['size_bytes'] / 1024:>10.1f} {duration:>12} {_format_time(entry.get('last_access')):>18}")
+        total_mb = sum(e['size_bytes'] for e in entries) / (1024 * 1024)
+        budget = f" / 预算 {max_size_mb}MB" if max_size_mb else ''
+        print(f"\n共 {len(entries)} 个条目，{total_mb:.2f}MB{budget}")
+
+    elif args.command == 'verify':
+        problems = manager.verify()
+        if not problems:
+            print("缓存校验通过")
+            return
+        for (repo, year), items in problems.items():
+            for item in items:
+                print(f"✗ {repo} ({year}): {item}")
+        sys.exit(1)
+
+    elif args.command == 'prune':
+        max_size_bytes = int(args.max_size_mb * 1024 * 1024) if args.max_size_mb else None
+        evicted = manager.prune(max_size_bytes, args.older_than_days, args.project, args.year)
+        print(f"已清理 {len(evicted)} 个条目")
+
+
+if __name__ == '__main__':
+    main()
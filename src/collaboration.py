@@ -0,0 +1,141 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+作者协作关系 - 由共同修改的文件推断"和谁合作最多"
+
+1. 作者和文件（项目 + 路径）分别驻留为整数ID，建立稀疏的"作者×文件"关联：
+   touches[文件ID] = {时间窗口: {作者ID: 修改次数}}
+2. 只有在同一时间窗口内修改过同一文件的作者才算协作，权重按窗口距数据中最晚的活跃窗口的时间指数衰减；
+   每个关联按 1/(作者数-1) 归一，避免锁文件、CHANGELOG 这类人人都改的文件主导结果，
+   超过 MAX_FILE_AUTHORS 位作者的文件窗口直接跳过。
+3. 作者对以整数键 a * 作者数 + b 稀疏累加，只展开实际共享文件的作者对，不做作者两两嵌套循环。
+"""
+
+import heapq
+from typing import Dict, List, Any, Callable, Iterable, Optional
+
+# 协作时间窗口（天）：同一窗口内修改同一文件才算协作
+WINDOW_DAYS = 30
+# 权重半衰期（天）：越早的协作权重越低
+HALF_LIFE_DAYS = 90
+# 单个文件窗口的作者数超过该值时视为公共文件，不计入协作
+MAX_FILE_AUTHORS = 50
+# 每位作者保留的协作者数
+TOP_COLLABORATORS = 5
+
+_SECONDS_PER_DAY = 86400
+
+
+def collaboration_graph(projects_data: Iterable[Dict[str, Any]],
+                        key: Callable[[Dict[str, Any]], Optional[str]],
+                        top: int = TOP_COLLABORATORS) -> Dict[str, List[Dict[str, Any]]]:
+    """构建作者协作图，返回每位作者协作最多的作者
+
+    Args:
+        projects_data: 项目数据列表（含 project_name 和带 changed_files 的 commits）
+        key: 由提交记录得到规范作者ID的函数，返回 None 的提交不参与；结果按 (author, email) 缓存
+        top: 每位作者保留的协作者数
+
+    Returns:
+        {作者ID: [{'author_id', 'name', 'weight', 'shared_files'}, ...]}，按权重降序
+    """
+    window_seconds = WINDOW_DAYS * _SECONDS_PER_DAY
+
+    # 整数驻留
+    author_ids: Dict[str, int] = {}
+    author_names: List[str] = []
+    identity_ids: Dict[tuple, Optional[int]] = {}
+    file_ids: Dict[tuple, int] = {}
+
+    # 第一遍：逐提交建立 文件ID -> {窗口: {作者: 次数}}（窗口为绝对窗口序号）
+    touches: List[Dict[int, Dict[int, int]]] = []
+    first_window = last_window = None
+    for project_data in projects_data:
+        project_name = project_data['project_name']
+        for commit in project_data.get('commits', []):
+            changed_files = commit.get('changed_files')
+            if not changed_files:
+                continue
+            identity = (commit.get('author', ''), commit.get('email', ''))
+            author = identity_ids.get(identity, -1)
+            if author == -1:
+                author_id = key(commit)
+                if author_id is None:
+                    author = None
+                else:
+                    author = author_ids.get(author_id)
+                    if author is None:
+                        author = author_ids[author_id] = len(author_names)
+                        author_names.append(author_id)
+                identity_ids[identity] = author
+            if author is None:
+                continue
+
+            window = commit.get('timestamp', 0) // window_seconds
+            if first_window is None or window < first_window:
+                first_window = window
+            if last_window is None or window > last_window:
+                last_window = window
+            for path in changed_files:
+                file_key = (project_name, path)
+                file_id = file_ids.get(file_key)
+                if file_id is None:
+                    file_id = file_ids[file_key] = len(touches)
+                    touches.append({})
+                windows = touches[file_id]
+                cell = windows.get(window)
+                if cell is None:
+                    windows[window] = {author: 1}
+                else:
+                    cell[author] = cell.get(author, 0) + 1
+
+    n = len(author_names)
+    if n < 2:
+        return {author_id: [] for author_id in author_names}
+
+    # 每个窗口的衰减系数
+    decay = {
+        window: 0.5 ** ((last_window - window) * WINDOW_DAYS / HALF_LIFE_DAYS)
+        for window in range(first_window, last_window + 1)
+    }
+
+    # 第二遍：只展开共享文件窗口的作者对，按整数键稀疏累加
+    weights: Dict[int, float] = {}
+    shared_files: Dict[int, int] = {}
+    for windows in touches:
+        # 同一文件的多个窗口只计一次共享文件
+        file_pairs = set()
+        for window, cell in windows.items():
+            k = len(cell)
+            if k < 2 or k > MAX_FILE_AUTHORS:
+                continue
+            factor = decay[window] / (k - 1)
+            authors = sorted(cell.items())
+            for i, (a, count_a) in enumerate(authors):
+                base = a * n
+                for b, count_b in authors[i + 1:]:
+                    pair = base + b
+                    weights[pair] = weights.get(pair, 0.0) + factor * min(count_a, count_b)
+                    file_pairs.add(pair)
+        for pair in file_pairs:
+            shared_files[pair] = shared_files.get(pair, 0) + 1
+
+    # 每位作者取权重最高的 top 个协作者
+    neighbours: Dict[int, List[tuple]] = {}
+    for pair, weight in weights.items():
+        a, b = divmod(pair, n)
+        neighbours.setdefault(a, []).append((weight, b, shared_files[pair]))
+        neighbours.setdefault(b, []).append((weight, a, shared_files[pair]))
+
+    result = {}
+    for author, author_id in enumerate(author_names):
+        result[author_id] = [
+            {
+                'author_id': author_names[other],
+                'name': author_names[other].split('<')[0].strip(),
+                'weight': round(weight, 2),
+                'shared_files': files,
+            }
+            for weight, other, files in heapq.nlargest(top, neighbours.get(author, []))
+        ]
+    return result
@@ -0,0 +1,184 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+提交说明分析 - 约定式提交类型分类、Issue/PR 引用检测和关键词词频
+
+正则在模块加载时预编译，每条提交说明的标题行只分词一次；
+MessageStats 是可合并的计数器，随部分聚合在扫描时计算并缓存，生成报告时只需合并。
+
+分类顺序：合并提交 -> Revert -> 约定式提交前缀（feat: / fix(scope)!: ...）
+-> 标题中的常见中英文关键词（修复、新增、重构 ...）-> other
+"""
+
+import re
+from typing import Dict, Any, Iterable, List, Tuple
+
+# 约定式提交类型（Conventional Commits）
+CONVENTIONAL_TYPES = ('feat', 'fix', 'refactor', 'perf', 'docs', 'style', 'test',
+                      'build', 'ci', 'chore', 'revert')
+_TYPE_ALIASES = {'feature': 'feat', 'bugfix': 'fix', 'hotfix': 'fix', 'doc': 'docs', 'tests': 'test'}
+
+# 类型名后只能跟 (scope)、! 和冒号，普通标题（如 "Update README"）在类型名后即匹配失败
+_CONVENTIONAL_RE = re.compile(r'\s*([A-Za-z]+)(?:\([^)]*\))?(!)?\s*[:：]')
+_MERGE_RE = re.compile(r'Merge (?:pull request|branch|remote-tracking branch|tag)\b')
+# Issue/PR 引用：#123、owner/repo#123、GH-123、JIRA 风格的 ABC-123（排除 &#39; 这类HTML实体）
+_REFERENCE_RE = re.compile(r'(?<!&)#\d+|\b[A-Z][A-Z0-9]+-\d+')
+# 标题分词：英文单词/标识符，或连续汉字（不做中文分词）
+_TOKEN_RE = re.compile(r'[a-z][a-z0-9_]*|[\u4e00-\u9fff]+')
+
+# 非约定式标题按词归类（取标题中最先出现的提示词）
+_HINT_WORDS = {
+    'fix': 'fix', 'fixes': 'fix', 'fixed': 'fix', 'bug': 'fix', 'bugfix': 'fix', 'hotfix': 'fix',
+    'add': 'feat', 'adds': 'feat', 'added': 'feat', 'implement': 'feat', 'implements': 'feat',
+    'implemented': 'feat', 'support': 'feat',
+    'refactor': 'refactor', 'refactors': 'refactor', 'refactored': 'refactor', 'refactoring': 'refactor',
+    'perf': 'perf', 'performance': 'perf', 'speedup': 'perf', 'optimize': 'perf', 'optimise': 'perf',
+    'optimized': 'perf', 'optimised': 'perf',
+    'doc': 'docs', 'docs': 'docs', 'readme': 'docs',
+    'test': 'test', 'tests': 'test',
+}
+_HINT_PHRASES = (
+    ('修复', 'fix'), ('修正', 'fix'), ('解决', 'fix'),
+    ('新增', 'feat'), ('添加', 'feat'), ('增加', 'feat'), ('支持', 'feat'), ('实现', 'feat'),
+    ('重构', 'refactor'), ('优化', 'perf'), ('性能', 'perf'), ('文档', 'docs'), ('测试', 'test'),
+)
+
+_STOPWORDS = frozenset((
+    'the', 'and', 'for', 'with', 'from', 'into', 'when', 'that', 'this', 'not', 'are', 'was',
+    'use', 'via', 'all', 'some', 'more', 'less', 'new', 'now', 'also', 'only', 'pull', 'request',
+    'merge', 'branch', 'revert', 'update', 'updates', 'updated', 'add', 'adds', 'added',
+    'remove', 'removed', 'fix', 'fixes', 'fixed', 'wip',
+) + CONVENTIONAL_TYPES)
+
+# 报告中的关键词条数
+TOP_KEYWORDS = 20
+
+
+def _hint_type(token: str):
+    if token[0] < '\u4e00':
+        return _HINT_WORDS.get(token)
+    for phrase, commit_type in _HINT_PHRASES:
+        if phrase in token:
+            return commit_type
+    return None
+
+
+def classify_message(message: str) -> Tuple[str, bool, bool, int, List[str]]:
+    """分类一条提交说明
+
+    标题只分词一次，提示词归类和关键词都基于同一份分词结果。
+
+    Returns:
+        (类型, 是否使用约定式前缀, 是否破坏性变更, Issue/PR 引用数, 标题关键词)
+    """
+    subject = message.split('\n', 1)[0].strip()
+    references = len(_REFERENCE_RE.findall(message)) if '#' in message or '-' in message else 0
+
+    if subject.startswith('Merge ') and _MERGE_RE.match(subject):
+        return 'merge', False, False, references, []
+    if subject.startswith('Revert '):
+        return 'revert', False, False, references, []
+
+    commit_type = None
+    breaking = False
+    match = _CONVENTIONAL_RE.match(subject)
+    if match:
+        name = match.group(1).lower()
+        name = _TYPE_ALIASES.get(name, name)
+        if name in CONVENTIONAL_TYPES:
+            commit_type = name
+            breaking = match.group(2) is not None
+            subject = subject[match.end():]
+    conventional = commit_type is not None
+    if 'BREAKING CHANGE' in message:
+        breaking = True
+
+    if references:
+        subject = _REFERENCE_RE.sub(' ', subject)
+    words = []
+    for token in _TOKEN_RE.findall(subject.lower()):
+        if commit_type is None:
+            commit_type = _hint_type(token)
+        if token[0] < '\u4e00':
+            if len(token) >= 3 and token not in _STOPWORDS:
+                words.append(token)
+        elif 2 <= len(token) <= 4:
+            words.append(token)
+    return commit_type or 'other', conventional, breaking, references, words
+
+
+class MessageStats:
+    """可合并的提交说明统计：类型计数、破坏性变更、引用和关键词词频"""
+
+    __slots__ = ('types', 'conventional', 'breaking', 'referenced', 'references', 'keywords')
+
+    def __init__(self):
+        self.types: Dict[str, int] = {}
+        # 使用约定式前缀的提交数
+        self.conventional = 0
+        self.breaking = 0
+        # 带 Issue/PR 引用的提交数，以及引用总数
+        self.referenced = 0
+        self.references = 0
+        self.keywords: Dict[str, int] = {}
+
+    def add_messages(self, messages: Iterable[str]):
+        """批量累加提交说明"""
+        types, keywords = self.types, self.keywords
+        for message in messages:
+            commit_type, conventional, breaking, references, words = classify_message(message)
+            types[commit_type] = types.get(commit_type, 0) + 1
+            if conventional:
+                self.conventional += 1
+            if breaking:
+                self.breaking += 1
+            if references:
+                self.referenced += 1
+                self.references += references
+            for word in words:
+                keywords[word] = keywords.get(word, 0) + 1
+
+    def merge(self, other: 'MessageStats') -> 'MessageStats':
+        for target, source in ((self.types, other.types), (self.keywords, other.keywords)):
+            for key, count in source.items():
+                target[key] = target.get(key, 0) + count
+        self.conventional += other.conventional
+        self.breaking += other.breaking
+        self.referenced += other.referenced
+        self.references += other.references
+        return self
+
+    def summary(self, total_commits: int, top_keywords: int = TOP_KEYWORDS) -> Dict[str, Any]:
+        """报告中的提交说明分析"""
+        types = sorted(self.types.items(), key=lambda x: x[1], reverse=True)
+        keywords = sorted(self.keywords.items(), key=lambda x: (-x[1], x[0]))[:top_keywords]
+        return {
+            'types': {name: count for name, count in types},
+            'conventional_ratio': round(self.conventional / total_commits * 100, 1) if total_commits else 0,
+            'breaking_changes': self.breaking,
+            'referenced_commits': self.referenced,
+            'reference_ratio': round(self.referenced / total_commits * 100, 1) if total_commits else 0,
+            'references': self.references,
+            'top_keywords': [{'word': word, 'count': count} for word, count in keywords],
+        }
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            'types': self.types,
+            'conventional': self.conventional,
+            'breaking': self.breaking,
+            'referenced': self.referenced,
+            'references': self.references,
+            'keywords': self.keywords,
+        }
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> 'MessageStats':
+        stats = cls()
+        stats.types = dict(data['types'])
+        stats.conventional = data['conventional']
+        stats.breaking = data['breaking']
+        stats.referenced = data['referenced']
+        stats.references = data['references']
+        stats.keywords = dict(data['keywords'])
+        return stats
@@ -0,0 +1,636 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+提交存储 - 基于SQLite的本地提交数据库（替代按项目的JSON缓存文件）
+
+- commits 表只保存可索引的标量字段（时间、作者、增删行数），用于按需查询切片；
+  时间范围按作者本地时间（local_ts = author_ts + tz_offset）划分，与分析时的日期口径一致
+- 提交说明、变更文件等明细按扫描打包为紧凑的列式压缩块（见 cache_codec），按需解码
+- 每个 (项目, 年份, 作者身份) 的部分聚合（见 aggregates）随扫描保存，报告直接合并
+"""
+
+import json
+import sqlite3
+import threading
+import time
+import zlib
+from datetime import datetime
+from pathlib import Path
+from typing import Dict, List, Any, Iterable, Optional, Tuple
+
+import cache_codec
+from aggregates import local_seconds
+from logger_config import get_logger
+
+logger = get_logger(__name__)
+
+
+# commits 表中的标量字段
+_COMMIT_COLUMNS = (
+    'hash', 'date', 'timestamp', 'author_ts', 'tz_offset', 'author', 'email',
+    'files_changed', 'additions', 'deletions', 'analysis_level',
+)
+
+# 打包进扫描明细块的字段（体积大、只在需要明细时解码）
+_DETAIL_COLUMNS = ('hash', 'message', 'languages', 'changed_files')
+
+# scans 表中除明细块以外的字段
+_SCAN_COLUMNS = (
+    'repo', 'year', 'project', 'path', 'branch', 'total_commits', 'total_additions',
+    'total_deletions', 'language_stats', 'since_ts', 'until_ts', 'scan_time', 'config_hash',
+    'size_bytes', 'scan_duration', 'last_access',
+)
+
+
+class CommitStore:
+    """SQLite提交存储
+
+    - commits 表以 (repo, hash) 为主键，按 local_ts（作者本地时间）和 (author, email) 建索引
+    - scans 表记录每个项目每个年份的扫描元数据（分支、语言统计、文件变更计数等）和提交明细块
+    - commit_stats 表以提交SHA为键缓存变更统计，跨项目、跨年份共享；每行记录采集逻辑版本，
+      版本不同的行不被使用（prune_commit_stats 清理）
+    - aggregates 表保存每个项目年份下每个作者身份的部分聚合（压缩JSON）
+    - blame_cache 表以文件内容的 blob SHA 为键缓存逐作者的存活行数，未变化的文件不重复 blame
+    - 使用WAL模式，每个线程独立连接，读操作可与写操作并发
+    """
+
+    SCHEMA_VERSION = 3
+
+    def __init__(self, db_path):
+        self.db_path = Path(db_path)
+        self.db_path.parent.mkdir(parents=True, exist_ok=True)
+        self._local = threading.local()
+        self._init_schema()
+
+    def _connect(self) -> sqlite3.Connection:
+        """获取当前线程的数据库连接"""
+        conn = getattr(self._local, 'conn', None)
+        if conn is None:
+            conn = sqlite3.connect(str(self.db_path), timeout=30)
+            conn.row_factory = sqlite3.Row
+            conn.execute('PRAGMA journal_mode=WAL')
+            conn.execute('PRAGMA synchronous=NORMAL')
+            self._local.conn = conn
+        return conn
+
+    def _init_schema(self):
+        """初始化表结构"""
+        conn = self._connect()
+        with conn:
+            conn.execute("CREATE TABLE IF NOT EXISTS meta (key TEXT PRIMARY KEY, value TEXT)")
+            row = conn.execute("SELECT value FROM meta WHERE key = 'schema_version'").fetchone()
+            if row is not None and row['value'] != str(self.SCHEMA_VERSION):
+                # 存储格式升级：扫描数据需重新采集（按SHA的变更统计格式不变，予以保留）
+                logger.info(f"提交存储格式已升级 (v{row['value']} -> v{self.SCHEMA_VERSION})，将重新扫描项目")
+                conn.execute("DROP TABLE IF EXISTS commits")
+                conn.execute("DROP TABLE IF EXISTS scans")
+                conn.execute("DROP TABLE IF EXISTS aggregates")
+            conn.execute(
+                "INSERT OR REPLACE INTO meta (key, value) VALUES ('schema_version', ?)",
+                (str(self.SCHEMA_VERSION),)
+            )
+            conn.executescript("""
+                CREATE TABLE IF NOT EXISTS scans (
+                    repo TEXT NOT NULL,
+                    year INTEGER NOT NULL,
+                    project TEXT NOT NULL,
+                    path TEXT,
+                    branch TEXT,
+                    total_commits INTEGER NOT NULL DEFAULT 0,
+                    total_additions INTEGER NOT NULL DEFAULT 0,
+                    total_deletions INTEGER NOT NULL DEFAULT 0,
+                    language_stats TEXT,
+                    since_ts INTEGER,
+                    until_ts INTEGER,
+                    scan_time TEXT,
+                    config_hash TEXT,
+                    size_bytes INTEGER NOT NULL DEFAULT 0,
+                    scan_duration REAL,
+                    last_access REAL,
+                    file_changes TEXT,
+                    detail BLOB,
+                    PRIMARY KEY (repo, year)
+                );
+                CREATE TABLE IF NOT EXISTS commits (
+                    repo TEXT NOT NULL,
+                    hash TEXT NOT NULL,
+                    date TEXT,
+                    timestamp INTEGER NOT NULL,
+                    author_ts INTEGER,
+                    tz_offset INTEGER,
+                    author TEXT,
+                    email TEXT,
+                    files_changed INTEGER NOT NULL DEFAULT 0,
+                    additions INTEGER NOT NULL DEFAULT 0,
+                    deletions INTEGER NOT NULL DEFAULT 0,
+                    analysis_level TEXT,
+                    local_ts INTEGER NOT NULL,
+                    PRIMARY KEY (repo, hash)
+                );
+                CREATE INDEX IF NOT EXISTS idx_commits_local_ts ON commits (local_ts);
+                CREATE INDEX IF NOT EXISTS idx_commits_author ON commits (author, email);
+                CREATE INDEX IF NOT EXISTS idx_commits_repo_local_ts ON commits (repo, local_ts);
+                CREATE TABLE IF NOT EXISTS aggregates (
+                    repo TEXT NOT NULL,
+                    year INTEGER NOT NULL,
+                    author TEXT NOT NULL,
+                    email TEXT NOT NULL,
+                    total_commits INTEGER NOT NULL DEFAULT 0,
+                    data BLOB NOT NULL,
+                    PRIMARY KEY (repo, year, author, email)
+                );
+                CREATE TABLE IF NOT EXISTS commit_stats (
+                    hash TEXT PRIMARY KEY,
+                    files_changed INTEGER NOT NULL DEFAULT 0,
+                    additions INTEGER NOT NULL DEFAULT 0,
+                    deletions INTEGER NOT NULL DEFAULT 0,
+                    changed_files TEXT,
+                    collector_version TEXT
+                );
+                CREATE TABLE IF NOT EXISTS blame_cache (
+                    blob TEXT PRIMARY KEY,
+                    authors TEXT NOT NULL
+                );
+            """)
+            self._ensure_column(conn, 'scans', 'config_hash', 'TEXT')
+            self._ensure_column(conn, 'scans', 'size_bytes', 'INTEGER NOT NULL DEFAULT 0')
+            self._ensure_column(conn, 'scans', 'scan_duration', 'REAL')
+            self._ensure_column(conn, 'scans', 'last_access', 'REAL')
+            self._ensure_column(conn, 'scans', 'file_changes', 'TEXT')
+            self._ensure_column(conn, 'commits', 'author_ts', 'INTEGER')
+            self._ensure_column(conn, 'commits', 'tz_offset', 'INTEGER')
+            self._ensure_column(conn, 'commit_stats', 'collector_version', 'TEXT')
+
+    @staticmethod
+    def _ensure_column(conn: sqlite3.Connection, table: str, column: str, definition: str):
+        """为旧库补充新增的列"""
+        existing = {row['name'] for row in conn.execute(f"PRAGMA table_info({table})")}
+        if column not in existing:
+            conn.execute(f"ALTER TABLE {table} ADD COLUMN {column} {definition}")
+
+    @staticmethod
+    def _row_to_commit(row: sqlite3.Row) -> Dict[str, Any]:
+        """数据库行转换为提交记录字典"""
+        commit = {key: row[key] for key in _COMMIT_COLUMNS}
+        commit['short_hash'] = commit['hash'][:8]
+        commit['message'] = ''
+        commit['languages'] = []
+        commit['changed_files'] = []
+        return commit
+
+    @staticmethod
+    def _scan_from_row(row: sqlite3.Row) -> Dict[str, Any]:
+        """数据库行转换为扫描元数据字典"""
+        scan = dict(row)
+        scan['language_stats'] = json.loads(scan['language_stats']) if scan['language_stats'] else {}
+        return scan
+
+    def _insert_commits(self, conn: sqlite3.Connection, repo: str,
+                        commits: Iterable[Dict[str, Any]]) -> int:
+        """在给定连接（事务）中写入提交记录的标量字段（附带用于范围查询的作者本地时间 local_ts）"""
+        rows = [(repo,) + tuple(c.get(key) for key in _COMMIT_COLUMNS) + (local_seconds(c),) for c in commits]
+        if rows:
+            placeholders = ', '.join('?' * (len(_COMMIT_COLUMNS) + 2))
+            conn.executemany(
+                f"INSERT OR REPLACE INTO commits (repo, {', '.join(_COMMIT_COLUMNS)}, local_ts) "
+                f"VALUES ({placeholders})",
+                rows
+            )
+        return len(rows)
+
+    def _replace_partials(self, conn: sqlite3.Connection, repo: str, year: int,
+                          partials: Dict[Tuple[str, str], Dict[str, Any]]) -> int:
+        """在给定连接（事务）中替换项目年份的部分聚合，返回写入的字节数"""
+        conn.execute("DELETE FROM aggregates WHERE repo = ? AND year = ?", (repo, year))
+        rows = [
+            (repo, year, author, email, data.get('total_commits', 0),
+             zlib.compress(json.dumps(data, ensure_ascii=False, separators=(',', ':')).encode('utf-8')))
+            for (author, email), data in partials.items()
+        ]
+        conn.executemany(
+            "INSERT INTO aggregates (repo, year, author, email, total_commits, data) VALUES (?, ?, ?, ?, ?, ?)",
+            rows
+        )
+        return sum(len(row[-1]) for row in rows)
+
+    def save_project(self, repo: str, year: int, project_data: Dict[str, Any],
+                     since_ts: int = None, until_ts: int = None, config_hash: str = None,
+                     scan_duration: float = None,
+                     partials: Dict[Tuple[str, str], Dict[str, Any]] = None):
+        """保存项目扫描结果
+
+        仅替换该项目在扫描时间范围内的提交，其他年份的数据保持不变。
+        since_ts / until_ts 为作者本地时间（墙钟秒数，见 ReportPeriod.since_ts）。
+        config_hash 记录产生该结果的采集配置，配置变化时据此单独失效该条目；
+        scan_duration 记录扫描耗时，作为缓存淘汰时的重扫成本；
+        partials 为按作者身份计算的部分聚合 {(name, email): CommitAggregate.to_dict()}。
+        """
+        commits = project_data.get('commits', [])
+        total_additions = sum(c.get('additions', 0) for c in commits)
+        total_deletions = sum(c.get('deletions', 0) for c in commits)
+        language_stats = project_data.get('language_stats', {})
+        file_changes = json.dumps(project_data.get('file_changes', {}), ensure_ascii=False, separators=(',', ':'))
+
+        detail = cache_codec.encode_records(commits, _DETAIL_COLUMNS, aggregates={
+            'total_commits': len(commits),
+            'total_additions': total_additions,
+            'total_deletions': total_deletions,
+            'language_stats': language_stats,
+        })
+        # 条目占用空间：明细块 + commits 表中的标量行（字符串长度加整数字段的估算）
+        size_bytes = len(detail) + len(file_changes) + sum(
+            len(repo) + len(c.get('hash') or '') + len(c.get('date') or '')
+            + len(c.get('author') or '') + len(c.get('email') or '') + 40
+            for c in commits
+        )
+
+        conn = self._connect()
+        with conn:
+            if since_ts is not None and until_ts is not None:
+                conn.execute(
+                    "DELETE FROM commits WHERE repo = ? AND local_ts >= ? AND local_ts < ?",
+                    (repo, since_ts, until_ts)
+                )
+            self._insert_commits(conn, repo, commits)
+            if partials is not None:
+                size_bytes += self._replace_partials(conn, repo, year, partials)
+            else:
+                conn.execute("DELETE FROM aggregates WHERE repo = ? AND year = ?", (repo, year))
+            conn.execute(
+                f"""INSERT OR REPLACE INTO scans ({', '.join(_SCAN_COLUMNS)}, file_changes, detail)
+                    VALUES ({', '.join('?' * (len(_SCAN_COLUMNS) + 2))})""",
+                (
+                    repo, year,
+                    project_data.get('project_name', repo),
+                    project_data.get('path'),
+                    project_data.get('branch', 'HEAD'),
+                    project_data.get('total_commits', len(commits)),
+                    total_additions,
+                    total_deletions,
+                    json.dumps(language_stats, ensure_ascii=False),
+                    since_ts, until_ts,
+                    datetime.now().isoformat(),
+                    config_hash,
+                    size_bytes,
+                    scan_duration,
+                    time.time(),
+                    file_changes,
+                    detail,
+                )
+            )
+
+    def get_scan(self, repo: str, year: int) -> Optional[Dict[str, Any]]:
+        """获取项目扫描元数据（不加载提交）"""
+        row = self._connect().execute(
+            f"SELECT {', '.join(_SCAN_COLUMNS)}, length(detail) AS detail_size FROM scans "
+            "WHERE repo = ? AND year = ?",
+            (repo, year)
+        ).fetchone()
+        return self._scan_from_row(row) if row is not None else None
+
+    def list_scans(self, year: int = None) -> List[Dict[str, Any]]:
+        """列出所有扫描记录"""
+        conn = self._connect()
+        columns = f"{', '.join(_SCAN_COLUMNS)}, length(detail) AS detail_size"
+        if year is None:
+            rows = conn.execute(f"SELECT {columns} FROM scans ORDER BY repo, year").fetchall()
+        else:
+            rows = conn.execute(
+                f"SELECT {columns} FROM scans WHERE year = ? ORDER BY repo", (year,)
+            ).fetchall()
+        return [self._scan_from_row(row) for row in rows]
+
+    def get_file_changes(self, repo: str, year: int) -> Dict[str, int]:
+        """项目年份的文件变更计数 {文件路径: 修改该文件的提交数}（体积较大，不随扫描元数据加载）"""
+        row = self._connect().execute(
+            "SELECT file_changes FROM scans WHERE repo = ? AND year = ?", (repo, year)
+        ).fetchone()
+        return json.loads(row['file_changes']) if row is not None and row['file_changes'] else {}
+
+    def save_file_changes(self, repo: str, year: int, file_changes: Dict[str, int]):
+        """补写项目年份的文件变更计数（旧版缓存条目没有该字段）"""
+        conn = self._connect()
+        with conn:
+            conn.execute(
+                "UPDATE scans SET file_changes = ? WHERE repo = ? AND year = ?",
+                (json.dumps(file_changes, ensure_ascii=False, separators=(',', ':')), repo, year)
+            )
+
+    def load_project(self, repo: str, year: int) -> Optional[Dict[str, Any]]:
+        """加载项目扫描结果（格式与 GitDataCollector.collect_project 一致）"""
+        scan = self.get_scan(repo, year)
+        if scan is None:
+            return None
+
+        commits = self.query_commits(repos=[repo], since=scan['since_ts'], until=scan['until_ts'])
+        return {
+            'project_name': scan['project'],
+            'path': scan['path'],
+            'commits': commits,
+            'language_stats': scan['language_stats'],
+            'file_changes': self.get_file_changes(repo, year),
+            'total_commits': len(commits),
+            'branch': scan['branch'],
+        }
+
+    def query_commits(self, repos: List[str] = None,
+                      identities: List[Tuple[str, str]] = None,
+                      since: int = None, until: int = None,
+                      with_repo: bool = False, details: bool = True) -> List[Dict[str, Any]]:
+        """按条件查询提交记录，结果按时间倒序
+
+        Args:
+            repos: 仓库列表，None表示全部
+            identities: 作者身份列表 [(name, email), ...]，None表示全部
+            since: 起始时间（包含），作者本地时间的墙钟秒数（author_ts + tz_offset）
+            until: 结束时间（不包含），同上
+            with_repo: 是否在记录中附带 repo 字段
+            details: 是否解码提交说明、变更文件等明细；只做统计时可关闭以跳过解压
+        """
+        clauses = []
+        params: List[Any] = []
+
+        if repos is not None:
+            if not repos:
+                return []
+            clauses.append(f"repo IN ({', '.join('?' * len(repos))})")
+            params.extend(repos)
+        if identities is not None:
+            if not identities:
+                return []
+            clauses.append('(' + ' OR '.join(['(author = ? AND email = ?)'] * len(identities)) + ')')
+            for name, email in identities:
+                params.extend((name, email))
+        if since is not None:
+            clauses.append('local_ts >= ?')
+            params.append(since)
+        if until is not None:
+            clauses.append('local_ts < ?')
+            params.append(until)
+
+        sql = "SELECT * FROM commits"
+        if clauses:
+            sql += ' WHERE ' + ' AND '.join(clauses)
+        sql += ' ORDER BY timestamp DESC'
+
+        conn = self._connect()
+        rows = conn.execute(sql, params).fetchall()
+        detail_map = {}
+        if details and rows:
+            wanted: Dict[str, set] = {}
+            for row in rows:
+                wanted.setdefault(row['repo'], set()).add(row['hash'])
+            detail_map = self._load_details(conn, wanted, since, until)
+
+        commits = []
+        for row in rows:
+            commit = self._row_to_commit(row)
+            detail = detail_map.get((row['repo'], row['hash']))
+            if detail:
+                commit.update(detail)
+            if with_repo:
+                commit['repo'] = row['repo']
+            commits.append(commit)
+        return commits
+
+    def _load_details(self, conn: sqlite3.Connection, wanted: Dict[str, set], since: int = None,
+                      until: int = None) -> Dict[Tuple[str, str], Dict[str, Any]]:
+        """从与查询范围重叠的扫描明细块中取出需要的提交明细
+
+        每个块先只解压 hash 列定位需要的行，不含所需提交的块不再解压其他列；
+        其他列只解码这些行，按作者或短时间范围查询时不为整个项目年份构造明细。
+
+        Args:
+            wanted: {repo: 需要明细的提交 hash 集合}
+
+        Returns:
+            {(repo, hash): 明细}
+        """
+        repos = list(wanted)
+        sql = f"SELECT repo, detail FROM scans WHERE detail IS NOT NULL AND repo IN ({', '.join('?' * len(repos))})"
+        params: List[Any] = list(repos)
+        if since is not None:
+            sql += ' AND until_ts > ?'
+            params.append(since)
+        if until is not None:
+            sql += ' AND since_ts < ?'
+            params.append(until)
+
+        columns = [name for name in _DETAIL_COLUMNS if name != 'hash']
+        detail_map = {}
+        for row in conn.execute(sql, params):
+            repo_hashes = wanted[row['repo']]
+            hashes = cache_codec.decode_columns(row['detail'], ['hash']).get('hash', [])
+            indexes = [i for i, commit_hash in enumerate(hashes) if commit_hash in repo_hashes]
+            if not indexes:
+                continue
+            for i, record in zip(indexes, cache_codec.decode_records(row['detail'], columns, indexes)):
+                detail_map[(row['repo'], hashes[i])] = record
+        return detail_map
+
+    def save_partials(self, repo: str, year: int, partials: Dict[Tuple[str, str], Dict[str, Any]]):
+        """单独保存项目年份的部分聚合（用于为旧扫描补算），并计入条目占用空间"""
+        conn = self._connect()
+        with conn:
+            added = self._replace_partials(conn, repo, year, partials)
+            conn.execute(
+                "UPDATE scans SET size_bytes = size_bytes + ? WHERE repo = ? AND year = ?",
+                (added, repo, year)
+            )
+
+    def load_partials(self, year: int, repos: List[str] = None
+                      ) -> Dict[str, Dict[Tuple[str, str], Dict[str, Any]]]:
+        """读取部分聚合
+
+        Returns:
+            {repo: {(name, email): CommitAggregate.to_dict() 的结果}}
+        """
+        sql = "SELECT repo, author, email, data FROM aggregates WHERE year = ?"
+        params: List[Any] = [year]
+        if repos is not None:
+            if not repos:
+                return {}
+            sql += f" AND repo IN ({', '.join('?' * len(repos))})"
+            params.extend(repos)
+
+        result: Dict[str, Dict[Tuple[str, str], Dict[str, Any]]] = {}
+        for row in self._connect().execute(sql + ' ORDER BY repo, rowid', params):
+            data = json.loads(zlib.decompress(row['data']).decode('utf-8'))
+            result.setdefault(row['repo'], {})[(row['author'], row['email'])] = data
+        return result
+
+    def touch_scan(self, repo: str, year: int):
+        """更新扫描条目的最近访问时间（用于LRU淘汰）"""
+        conn = self._connect()
+        with conn:
+            conn.execute(
+                "UPDATE scans SET last_access = ? WHERE repo = ? AND year = ?",
+                (time.time(), repo, year)
+            )
+
+    def verify_scan(self, repo: str, year: int) -> List[str]:
+        """校验扫描条目的完整性，返回发现的问题列表（为空表示正常）"""
+        conn = self._connect()
+        row = conn.execute(
+            "SELECT total_commits, since_ts, until_ts, detail FROM scans WHERE repo = ? AND year = ?",
+            (repo, year)
+        ).fetchone()
+        if row is None:
+            return ['条目不存在']
+
+        problems = []
+        row_count = conn.execute(
+            "SELECT COUNT(*) FROM commits WHERE repo = ? AND local_ts >= ? AND local_ts < ?",
+            (repo, row['since_ts'], row['until_ts'])
+        ).fetchone()[0]
+        if row_count != row['total_commits']:
+            problems.append(f"提交数不一致: 记录 {row['total_commits']}，实际 {row_count}")
+
+        partial_count = conn.execute(
+            "SELECT COUNT(*), SUM(total_commits) FROM aggregates WHERE repo = ? AND year = ?", (repo, year)
+        ).fetchone()
+        if partial_count[0] and partial_count[1] != row_count:
+            problems.append(f"部分聚合提交数不一致: 聚合 {partial_count[1]}，实际 {row_count}")
+
+        if row['detail'] is None:
+            problems.append('缺少明细块')
+        else:
+            try:
+                header = cache_codec.read_header(row['detail'])
+                records = cache_codec.decode_records(row['detail'], ['hash'])
+                if header['count'] != len(records) or len(records) != row_count:
+                    problems.append(f"明细块记录数不一致: 头部 {header['count']}，解码 {len(records)}")
+            except Exception as e:
+                problems.append(f"明细块损坏: {e}")
+        return problems
+
+    def integrity_check(self) -> str:
+        """SQLite数据库完整性检查"""
+        return self._connect().execute("PRAGMA integrity_check").fetchone()[0]
+
+    def vacuum(self):
+        """回收已删除条目占用的磁盘空间"""
+        self._connect().execute("VACUUM")
+
+    def get_commit_stats(self, hashes: Iterable[str], version: str) -> Dict[str, Dict[str, Any]]:
+        """批量查询提交变更统计（按SHA，与项目名和路径无关）
+
+        Args:
+            hashes: 提交SHA
+            version: 采集逻辑版本，只返回该版本保存的统计
+
+        Returns:
+            {hash: {'files_changed', 'additions', 'deletions', 'changed_files'}}
+        """
+        hashes = list(hashes)
+        conn = self._connect()
+        result = {}
+        # 分批查询，避免超过SQLite参数数量上限
+        for start in range(0, len(hashes), 500):
+            batch = hashes[start:start + 500]
+            rows = conn.execute(
+                f"SELECT * FROM commit_stats WHERE collector_version = ? "
+                f"AND hash IN ({', '.join('?' * len(batch))})",
+                [version, *batch]
+            ).fetchall()
+            for row in rows:
+                result[row['hash']] = {
+                    'files_changed': row['files_changed'],
+                    'additions': row['additions'],
+                    'deletions': row['deletions'],
+                    'changed_files': json.loads(row['changed_files']) if row['changed_files'] else [],
+                }
+        return result
+
+    def save_commit_stats(self, stats: Iterable[Dict[str, Any]], version: str) -> int:
+        """批量保存提交变更统计（记录需包含 hash 字段），标记为指定采集逻辑版本"""
+        rows = [
+            (
+                s['hash'], s.get('files_changed', 0), s.get('additions', 0), s.get('deletions', 0),
+                json.dumps(s.get('changed_files') or [], ensure_ascii=False), version,
+            )
+            for s in stats
+        ]
+        if not rows:
+            return 0
+        conn = self._connect()
+        with conn:
+            conn.executemany(
+                "INSERT OR REPLACE INTO commit_stats "
+                "(hash, files_changed, additions, deletions, changed_files, collector_version) "
+                "VALUES (?, ?, ?, ?, ?, ?)",
+                rows
+            )
+        return len(rows)
+
+    def prune_commit_stats(self, version: str) -> int:
+        """删除其他采集逻辑版本（包括未标记版本）保存的变更统计"""
+        conn = self._connect()
+        with conn:
+            cursor = conn.execute(
+                "DELETE FROM commit_stats WHERE collector_version IS NULL OR collector_version != ?", (version,)
+            )
+        return cursor.rowcount
+
+    def get_blame(self, blobs: Iterable[str]) -> Dict[str, List[List[Any]]]:
+        """批量查询文件内容（blob SHA）的 blame 结果
+
+        Returns:
+            {blob: [[name, email, 行数], ...]}，二进制文件为空列表
+        """
+        blobs = list(blobs)
+        conn = self._connect()
+        result = {}
+        for start in range(0, len(blobs), 500):
+            batch = blobs[start:start + 500]
+            rows = conn.execute(
+                f"SELECT blob, authors FROM blame_cache WHERE blob IN ({', '.join('?' * len(batch))})",
+                batch
+            ).fetchall()
+            for row in rows:
+                result[row['blob']] = json.loads(row['authors'])
+        return result
+
+    def save_blame(self, blames: Dict[str, List[List[Any]]]) -> int:
+        """批量保存 blame 结果 {blob: [[name, email, 行数], ...]}"""
+        rows = [
+            (blob, json.dumps(authors, ensure_ascii=False, separators=(',', ':')))
+            for blob, authors in blames.items()
+        ]
+        if not rows:
+            return 0
+        conn = self._connect()
+        with conn:
+            conn.executemany("INSERT OR REPLACE INTO blame_cache (blob, authors) VALUES (?, ?)", rows)
+        return len(rows)
+
+    def delete_scan(self, repo: str, year: int):
+        """删除单个项目年份的扫描记录及其提交"""
+        conn = self._connect()
+        with conn:
+            scan = conn.execute(
+                "SELECT since_ts, until_ts FROM scans WHERE repo = ? AND year = ?", (repo, year)
+            ).fetchone()
+            if scan is None:
+                return
+            conn.execute(
+                "DELETE FROM commits WHERE repo = ? AND local_ts >= ? AND local_ts < ?",
+                (repo, scan['since_ts'], scan['until_ts'])
+            )
+            conn.execute("DELETE FROM scans WHERE repo = ? AND year = ?", (repo, year))
+            conn.execute("DELETE FROM aggregates WHERE repo = ? AND year = ?", (repo, year))
+
+    def clear(self):
+        """清空所有扫描数据（按SHA的变更统计和 blame 结果与项目无关，予以保留）"""
+        conn = self._connect()
+        with conn:
+            conn.execute("DELETE FROM commits")
+            conn.execute("DELETE FROM scans")
+            conn.execute("DELETE FROM aggregates")
+
+    def close(self):
+        """关闭当前线程的连接"""
+        conn = getattr(self._local, 'conn', None)
+        if conn is not None:
+            conn.close()
+            self._local.conn = None
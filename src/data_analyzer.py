@@ -5,9 +5,20 @@
 """
 
 import calendar
-from datetime import datetime
-from collections import defaultdict, Counter
-from typing import Dict, List, Any
+import heapq
+import statistics
+from datetime import date
+from collections import defaultdict
+from typing import Dict, List, Any, Tuple
+
+import histogram_backend
+from aggregates import (CommitAggregate, COMMIT_BOARDS, LEADERBOARD_CAPACITY, SESSION_GAP_SECONDS,
+                        format_time_of_day, build_partials)
+from hotspots import hotspot_summary, count_file_changes
+from report_period import ReportPeriod
+
+# 可配置的排行榜
+LEADERBOARDS = ('largest_commits', 'largest_deletions', 'busiest_days', 'longest_streaks')
 
 
 class DataAnalyzer:
@@ -15,59 +26,220 @@ class DataAnalyzer:
 
     def __init__(self, config: Dict[str, Any]):
         self.config = config
-        self.report_year = config.get('report_year', 2024)
+        # 报告时间范围 [since, until)：report_period（季度/月份/任意范围）或 report_year 整年
+        self.period = ReportPeriod.from_config(config)
+        self.report_year = self.period.since.year
+        # 时间分布计算后端: auto（有NumPy时使用NumPy）/ numpy / python
+        self.backend = histogram_backend.resolve_backend(config.get('analysis', {}).get('backend'))
+        # 排行榜配置: analysis.leaderboards.{size, boards}
+        leaderboard_config = config.get('analysis', {}).get('leaderboards') or {}
+        self.leaderboard_size = min(int(leaderboard_config.get('size', 5)), LEADERBOARD_CAPACITY)
+        self.leaderboards = [name for name in leaderboard_config.get('boards', LEADERBOARDS) if name in LEADERBOARDS]
+        # 每个项目写入报告的最近提交明细条数（只限制明细，统计始终基于全部提交）
+        self.max_detail_commits = config.get('analysis', {}).get('max_detail_commits')
+
+    def load_projects(self, store, identities: List[Tuple[str, str]] = None,
+                      repos: List[str] = None, period: ReportPeriod = None,
+                      partials: bool = False) -> List[Dict[str, Any]]:
+        """从提交存储按需查询数据切片，返回与 analyze 输入一致的项目数据列表
+
+        整年范围直接使用扫描记录中的语言统计和文件变更计数；季度等非整年范围
+        按 [since, until) 查询覆盖年份的提交，语言统计和文件变更计数由范围内的提交重新计算。
+
+        Args:
+            store: CommitStore 实例
+            identities: 作者身份列表 [(name, email), ...]，None表示全部作者
+            repos: 仓库列表，None表示范围内所有已扫描的仓库
+            period: 时间范围，默认报告时间范围
+            partials: 是否同时按作者身份计算部分聚合（与 GitDataCollector 的输出一致）
+        """
+        period = period or self.period
+        # 每个仓库取范围覆盖年份中最近一次扫描的元数据（项目名、路径、分支）
+        scans = {}
+        for year in period.years:
+            for scan in store.list_scans(year):
+                if repos is None or scan['repo'] in repos:
+                    scans[scan['repo']] = scan
+        if not scans:
+            return []
+
+        project_commits = defaultdict(list)
+        for commit in store.query_commits(repos=list(scans), identities=identities,
+                                          since=period.since_ts, until=period.until_ts, with_repo=True):
+            project_commits[commit.pop('repo')].append(commit)
+
+        projects_data = []
+        for repo, scan in scans.items():
+            commits = project_commits.get(repo)
+            if not commits:
+                continue
+            if period.is_full_year:
+                language_stats = scan['language_stats']
+                file_changes = store.get_file_changes(repo, period.since.year)
+            else:
+                language_stats = defaultdict(int)
+                for commit in commits:
+                    for lang in commit.get('languages') or ():
+                        language_stats[lang] += 1
+                language_stats = dict(language_stats)
+                file_changes = count_file_changes(commits)
+            project_data = {
+                'project_name': scan['project'],
+                'path': scan['path'],
+                'commits': commits,
+                'language_stats': language_stats,
+                'file_changes': file_changes,
+                'total_commits': len(commits),
+                'branch': scan['branch'],
+            }
+            if partials:
+                project_data['partials'] = build_partials(scan['project'], commits, self.backend)
+            projects_data.append(project_data)
+        return projects_data
 
     def analyze(self, projects_data: List[Dict[str, Any]], max_commits: int = None) -> Dict[str, Any]:
         """分析所有项目数据
 
+        统计始终基于全部提交；max_commits 只限制每个项目写入报告的提交明细条数。
+
         Args:
             projects_data: 项目数据列表
-            max_commits: 最大提交记录数，用于控制JSON文件大小
+            max_commits: 每个项目保留的最近提交明细数，用于控制JSON文件大小，
+                None 时使用 analysis.max_detail_commits
         """
+        if max_commits is None:
+            max_commits = self.max_detail_commits
 
-        # 聚合数据
-        all_commits = []
+        # 单次遍历聚合所有维度
+        aggregate = CommitAggregate(self.backend)
         language_stats = defaultdict(int)
-        project_commits = defaultdict(list)
+        commit_records = {}
 
         for project_data in projects_data:
             project_name = project_data['project_name']
             commits = project_data.get('commits', [])
 
-            # 如果设置了max_commits，只保留最近的提交
-            if max_commits and len(commits) > max_commits:
-                commits = commits[:max_commits]
-
-            all_commits.extend(commits)
-            project_commits[project_name] = commits
+            aggregate.add_commits(project_name, commits)
+            if max_commits:
+                commit_records[project_name] = self._commit_records(commits, max_commits)
 
             # 聚合语言统计
             for lang, count in project_data.get('language_stats', {}).items():
                 language_stats[lang] += count
 
+        return self.analyze_aggregate(aggregate, language_stats, commit_records)
+
+    def author_projects(self, projects_data: List[Dict[str, Any]],
+                        identities: List[Tuple[str, str]],
+                        positions: Dict[int, List[int]],
+                        max_commits: int = None) -> List[Dict[str, Any]]:
+        """合并作者各身份在每个项目下的部分聚合
+
+        Args:
+            projects_data: 采集结果（含 partials: {(name, email): CommitAggregate}）
+            identities: 作者的身份列表 [(name, email), ...]
+            positions: {项目序号: [提交下标]}，即 AuthorIndex.positions[作者]；
+                只访问作者参与的项目和提交，不再逐项目、逐提交匹配身份
+            max_commits: 每个项目保留的最近提交明细数，None 时使用 analysis.max_detail_commits
+
+        Returns:
+            每个有提交的项目一项，aggregate 为该作者在此项目下的合并聚合，
+            commit_records 为该作者最近的提交明细（未配置明细条数时为空）
+        """
+        if max_commits is None:
+            max_commits = self.max_detail_commits
+        author_projects = []
+        for project_index, commit_indexes in positions.items():
+            project_data = projects_data[project_index]
+            project_partials = project_data.get('partials') or {}
+            partials = [project_partials[identity] for identity in identities if identity in project_partials]
+            if not partials:
+                continue
+            aggregate = CommitAggregate.merged(partials)
+            commit_records = []
+            if max_commits:
+                project_commits = project_data.get('commits', [])
+                commit_records = self._commit_records([project_commits[i] for i in commit_indexes], max_commits)
+            author_projects.append({
+                'project_name': project_data['project_name'],
+                'path': project_data['path'],
+                'aggregate': aggregate,
+                'commit_records': commit_records,
+                'language_stats': project_data.get('language_stats', {}),
+                'total_commits': aggregate.total_commits,
+                'branch': project_data.get('branch', 'HEAD'),
+            })
+        return author_projects
+
+    def analyze_partials(self, author_projects: List[Dict[str, Any]]) -> Dict[str, Any]:
+        """合并部分聚合后分析，输出与 analyze 相同
+
+        Args:
+            author_projects: author_projects() 的结果，每个项目一项 {'aggregate', 'language_stats', ...}
+        """
+        aggregate = CommitAggregate()
+        language_stats = defaultdict(int)
+        commit_records = {}
+        for entry in author_projects:
+            aggregate.merge(entry['aggregate'])
+            if entry.get('commit_records'):
+                commit_records[entry['project_name']] = entry['commit_records']
+            for lang, count in entry.get('language_stats', {}).items():
+                language_stats[lang] += count
+        return self.analyze_aggregate(aggregate, language_stats, commit_records)
+
+    def analyze_aggregate(self, aggregate: CommitAggregate,
+                          language_stats: Dict[str, int],
+                          commit_records: Dict[str, List[Dict]] = None) -> Dict[str, Any]:
+        """由聚合结果生成分析数据
+
+        Args:
+            aggregate: 全部提交的聚合
+            language_stats: 语言统计
+            commit_records: {项目名: 最近的提交明细}，写入对应项目的 commit_records
+        """
+        aggregate.finalize()
+
         # 分析维度
-        summary = self._calculate_summary(all_commits)
-        time_distribution = self._analyze_time_distribution(all_commits)
-        code_quality = self._analyze_code_quality(all_commits)
-        language_analysis = self._analyze_languages(language_stats)
-        project_analysis = self._analyze_projects(project_commits, language_stats)
+        summary = self._calculate_summary(aggregate)
+        time_distribution = self._analyze_time_distribution(aggregate)
+        code_quality = self._analyze_code_quality(aggregate)
+        # 语言分布按作者自己的变更行数计算；旧数据没有逐文件语言时退回项目整体的语言统计
+        author_languages = {}
+        for language_lines in aggregate.languages.values():
+            for lang, lines in language_lines.items():
+                author_languages[lang] = author_languages.get(lang, 0) + lines
+        if author_languages:
+            language_analysis = self._analyze_languages(
+                {lang: round(lines) for lang, lines in author_languages.items()}
+            )
+        else:
+            language_analysis = self._analyze_languages(language_stats)
+        project_analysis = self._analyze_projects(aggregate, commit_records or {})
+        leaderboards = self._build_leaderboards(aggregate)
+        messages = aggregate.messages.summary(aggregate.total_commits)
+        hotspots = hotspot_summary(aggregate.files)
 
         return {
             'year': self.report_year,
+            'period': self.period.to_dict(),
             'summary': summary,
             'time_distribution': time_distribution,
             'code_quality': code_quality,
             'languages': language_analysis,
             'projects': project_analysis,
+            'leaderboards': leaderboards,
+            'messages': messages,
+            'hotspots': hotspots,
             'raw_data': {
-                'total_commits': len(all_commits),
+                'total_commits': aggregate.total_commits,
                 'language_stats': dict(language_stats),
             }
         }
 
-    def _calculate_summary(self, commits: List[Dict]) -> Dict[str, Any]:
+    def _calculate_summary(self, aggregate: CommitAggregate) -> Dict[str, Any]:
         """计算基础汇总数据"""
-        if not commits:
+        if not aggregate.total_commits:
             return {
                 'total_commits': 0,
                 'total_additions': 0,
@@ -78,113 +250,99 @@ class DataAnalyzer:
                 'most_active_day': None,
             }
 
-        total_commits = len(commits)
-        total_additions = sum(c['additions'] for c in commits)
-        total_deletions = sum(c['deletions'] for c in commits)
-        net_lines = total_additions - total_deletions
-        files_changed = sum(c['files_changed'] for c in commits)
-
         # 计算平均每月提交数
-        month_count = len(set(c['date'][:7] for c in commits))
-        avg_commits_per_month = total_commits / month_count if month_count > 0 else 0
+        month_count = len(aggregate.monthly)
+        avg_commits_per_month = aggregate.total_commits / month_count if month_count > 0 else 0
 
-        # 找出最活跃的一天
-        commit_by_day = Counter(c['date'][:10] for c in commits)
-        most_active_day = commit_by_day.most_common(1)[0][0] if commit_by_day else None
+        # 找出最活跃的一天（并列时取最先出现的一天）
+        most_active_day = None
+        most_active_count = 0
+        for date_str, stats in aggregate.daily.items():
+            if stats[0] > most_active_count:
+                most_active_day, most_active_count = date_str, stats[0]
 
         return {
-            'total_commits': total_commits,
-            'total_additions': total_additions,
-            'total_deletions': total_deletions,
-            'net_lines': net_lines,
-            'files_changed': files_changed,
+            'total_commits': aggregate.total_commits,
+            'total_additions': aggregate.total_additions,
+            'total_deletions': aggregate.total_deletions,
+            'net_lines': aggregate.total_additions - aggregate.total_deletions,
+            'files_changed': aggregate.files_changed,
             'avg_commits_per_month': round(avg_commits_per_month, 1),
             'most_active_day': most_active_day,
         }
 
-    def _analyze_time_distribution(self, commits: List[Dict]) -> Dict[str, Any]:
+    def _analyze_time_distribution(self, aggregate: CommitAggregate) -> Dict[str, Any]:
         """分析时间分布"""
-        # 按月统计
-        monthly_commits = defaultdict(int)
-        for commit in commits:
-            month = commit['date'][:7]  # YYYY-MM
-            monthly_commits[month] += 1
-
-        # 按星期统计
         weekday_names = ['周一', '周二', '周三', '周四', '周五', '周六', '周日']
-        weekday_commits = defaultdict(int)
-        for commit in commits:
-            dt = datetime.fromisoformat(commit['date'])
-            weekday_commits[dt.weekday()] += 1
-
-        # 按小时统计
-        hourly_commits = defaultdict(int)
-        for commit in commits:
-            dt = datetime.fromisoformat(commit['date'])
-            hourly_commits[dt.hour] += 1
 
         # 生成日历热力图数据
-        calendar_heatmap = self._generate_calendar_heatmap(commits)
+        calendar_heatmap = self._generate_calendar_heatmap(aggregate)
 
         # 找出最高效时段
-        best_hour = max(hourly_commits.items(), key=lambda x: x[1])[0] if hourly_commits else 0
-        best_weekday = max(weekday_commits.items(), key=lambda x: x[1])[0] if weekday_commits else 0
+        best_hour = max(aggregate.hourly.items(), key=lambda x: x[1])[0] if aggregate.hourly else 0
+        best_weekday = max(aggregate.weekday.items(), key=lambda x: x[1])[0] if aggregate.weekday else 0
 
         return {
-            'monthly': dict(monthly_commits),
-            'weekday': {weekday_names[i]: weekday_commits[i] for i in range(7)},
-            'hourly': dict(hourly_commits),
+            'monthly': dict(aggregate.monthly),
+            'weekday': {weekday_names[i]: aggregate.weekday.get(i, 0) for i in range(7)},
+            'hourly': dict(aggregate.hourly),
             'calendar_heatmap': calendar_heatmap,
             'best_period': {
                 'hour': f"{best_hour}:00-{best_hour+1}:00",
                 'weekday': weekday_names[best_weekday],
-            }
+            },
+            'sessions': self._analyze_sessions(aggregate),
         }
 
-    def _generate_calendar_heatmap(self, commits: List[Dict]) -> List[Dict]:
-        """生成完整的365天日历热力图数据"""
-        from datetime import date, timedelta
-
-        # 按日期统计提交信息
-        daily_stats = defaultdict(lambda: {
-            'count': 0,
-            'additions': 0,
-            'deletions': 0,
-            'latest_time': None
-        })
-
-        for commit in commits:
-            date_str = commit['date'][:10]  # YYYY-MM-DD
-            time_str = commit['date'][11:19]  # HH:MM:SS
+    def _analyze_sessions(self, aggregate: CommitAggregate) -> Dict[str, Any]:
+        """编码会话（按不活跃间隔切分）、最长连续提交天数和最长间断天数
 
-            daily_stats[date_str]['count'] += 1
-            daily_stats[date_str]['additions'] += commit.get('additions', 0)
-            daily_stats[date_str]['deletions'] += commit.get('deletions', 0)
-
-            # 更新最晚提交时间（晚6点-次日早6点算夜间提交）
-            if daily_stats[date_str]['latest_time'] is None or time_str > daily_stats[date_str]['latest_time']:
-                daily_stats[date_str]['latest_time'] = time_str
+        会话已在聚合时流式切分，这里只汇总会话列表和每日统计，不再遍历提交。
+        """
+        sessions = aggregate.sessions.sessions
+        runs = self._active_runs(aggregate)
+
+        longest_streak = None
+        if runs:
+            first, first_ordinal, last, last_ordinal, _ = max(runs, key=lambda run: run[3] - run[1])
+            longest_streak = {'start': first, 'end': last, 'days': last_ordinal - first_ordinal + 1}
+
+        longest_gap = None
+        for previous, current in zip(runs, runs[1:]):
+            days = current[1] - previous[3] - 1
+            if longest_gap is None or days > longest_gap['days']:
+                longest_gap = {
+                    'start': date.fromordinal(previous[3] + 1).isoformat(),
+                    'end': date.fromordinal(current[1] - 1).isoformat(),
+                    'days': days,
+                }
 
-        # 生成完整的365天数据
-        start_date = date(self.report_year, 1, 1)
-        end_date = date(self.report_year, 12, 31)
+        durations = [end - start for start, end, _ in sessions]
+        return {
+            'count': len(sessions),
+            'median_minutes': round(statistics.median(durations) / 60, 1) if durations else 0,
+            'longest_minutes': round(max(durations) / 60, 1) if durations else 0,
+            'avg_commits': round(sum(count for _, _, count in sessions) / len(sessions), 1) if sessions else 0,
+            'gap_minutes': SESSION_GAP_SECONDS // 60,
+            'longest_streak': longest_streak,
+            'longest_gap': longest_gap,
+        }
 
+    def _generate_calendar_heatmap(self, aggregate: CommitAggregate) -> List[Dict]:
+        """生成报告时间范围内每一天的日历热力图数据（整年为365/366天）"""
         result = []
-        current_date = start_date
-        while current_date <= end_date:
+        for current_date in self.period.days():
             date_str = current_date.isoformat()
-            stats = daily_stats.get(date_str, {'count': 0, 'additions': 0, 'deletions': 0, 'latest_time': None})
-            count = stats['count']
+            count, additions, deletions, latest = aggregate.daily.get(date_str, (0, 0, 0, None))
 
             result.append({
                 'date': date_str,
                 'count': count,
-                'additions': stats['additions'],
-                'deletions': stats['deletions'],
-                'latest_time': stats['latest_time'],
+                'additions': additions,
+                'deletions': deletions,
+                'latest_time': format_time_of_day(latest),
                 'level': self._get_heatmap_level(count)
             })
-            current_date += timedelta(days=1)
 
         return result
 
@@ -201,37 +359,64 @@ class DataAnalyzer:
         else:
             return 4
 
-    def _analyze_code_quality(self, commits: List[Dict]) -> Dict[str, Any]:
+    def _analyze_code_quality(self, aggregate: CommitAggregate) -> Dict[str, Any]:
         """分析代码质量指标"""
-        # 重构贡献：删除代码行数较多的提交
-        refactor_commits = [c for c in commits if c['deletions'] > c['additions'] * 1.5]
-
-        # 最大重构
-        top_refactor = sorted(
-            [c for c in commits if c['deletions'] > c['additions']],
-            key=lambda x: x['deletions'] - x['additions'],
-            reverse=True
-        )[:5]
+        total = aggregate.total_commits
 
         # 平均每次提交的代码变更
-        avg_additions = sum(c['additions'] for c in commits) / len(commits) if commits else 0
-        avg_deletions = sum(c['deletions'] for c in commits) / len(commits) if commits else 0
+        avg_additions = aggregate.total_additions / total if total else 0
+        avg_deletions = aggregate.total_deletions / total if total else 0
 
         return {
-            'refactor_commits': len(refactor_commits),
-            'refactor_ratio': round(len(refactor_commits) / len(commits) * 100, 1) if commits else 0,
-            'top_refactors': [
-                {
-                    'date': c['date'][:10],
-                    'message': c['message'][:50],
-                    'net_lines': c['deletions'] - c['additions']
-                }
-                for c in top_refactor
-            ],
+            'refactor_commits': aggregate.refactor_commits,
+            'refactor_ratio': round(aggregate.refactor_commits / total * 100, 1) if total else 0,
+            'top_refactors': aggregate.top_refactors(),
             'avg_additions_per_commit': round(avg_additions, 1),
             'avg_deletions_per_commit': round(avg_deletions, 1),
         }
 
+    def _build_leaderboards(self, aggregate: CommitAggregate) -> Dict[str, List[Dict]]:
+        """生成排行榜（逐提交的榜单在聚合时已由有界堆维护，按天的榜单由每日统计取 top-k）"""
+        k = self.leaderboard_size
+        leaderboards = {}
+        for name in self.leaderboards:
+            if name in COMMIT_BOARDS:
+                leaderboards[name] = aggregate.commit_board(name, k)
+            elif name == 'busiest_days':
+                leaderboards[name] = [
+                    {'date': day, 'commits': count, 'additions': additions, 'deletions': deletions}
+                    for day, (count, additions, deletions, _) in heapq.nlargest(
+                        k, aggregate.daily.items(), key=lambda x: (x[1][0], x[1][1] + x[1][2])
+                    )
+                ]
+            elif name == 'longest_streaks':
+                leaderboards[name] = self._longest_streaks(aggregate, k)
+        return leaderboards
+
+    def _active_runs(self, aggregate: CommitAggregate) -> List[Tuple[str, int, str, int, int]]:
+        """按时间顺序的连续有提交日期段 [(起始日, 起始日序号, 结束日, 结束日序号, 提交数)]"""
+        runs = []
+        for day in sorted(aggregate.daily):
+            ordinal = date.fromisoformat(day).toordinal()
+            count = aggregate.daily[day][0]
+            if runs and ordinal == runs[-1][3] + 1:
+                first, first_ordinal, _, _, commits = runs[-1]
+                runs[-1] = (first, first_ordinal, day, ordinal, commits + count)
+            else:
+                runs.append((day, ordinal, day, ordinal, count))
+        return runs
+
+    def _longest_streaks(self, aggregate: CommitAggregate, k: int) -> List[Dict]:
+        """连续有提交的天数最长的 k 段"""
+        streaks = [
+            (last_ordinal - first_ordinal + 1, commits, first, last)
+            for first, first_ordinal, last, last_ordinal, commits in self._active_runs(aggregate)
+        ]
+        return [
+            {'start': first, 'end': last, 'days': days, 'commits': count}
+            for days, count, first, last in heapq.nlargest(k, streaks)
+        ]
+
     def _analyze_languages(self, language_stats: Dict[str, int]) -> Dict[str, Any]:
         """分析编程语言使用情况"""
         if not language_stats:
@@ -261,33 +446,55 @@ class DataAnalyzer:
                            for lang, count in sorted_languages},
         }
 
-    def _analyze_projects(self, project_commits: Dict[str, List[Dict]],
-                         language_stats: Dict[str, int]) -> List[Dict]:
-        """分析项目参与情况"""
+    def _analyze_projects(self, aggregate: CommitAggregate,
+                         commit_records: Dict[str, List[Dict]]) -> List[Dict]:
+        """分析项目参与情况（每个项目附带作者在该项目中按变更行数计的语言占比）"""
         projects = []
 
-        for project_name, commits in project_commits.items():
+        for project_name, (commits, total_additions, total_deletions) in aggregate.projects.items():
             if not commits:
                 continue
 
-            # 项目语言分布
-            project_languages = defaultdict(int)
-            for commit in commits:
-                # 简化：假设每个项目有一种主要语言
-                pass
-
-            total_additions = sum(c['additions'] for c in commits)
-            total_deletions = sum(c['deletions'] for c in commits)
-
-            projects.append({
+            project = {
                 'name': project_name,
-                'commits': len(commits),
+                'commits': commits,
                 'additions': total_additions,
                 'deletions': total_deletions,
                 'net_lines': total_additions - total_deletions,
-            })
+                'languages': self._language_mix(aggregate.languages.get(project_name, {})),
+            }
+            if commit_records.get(project_name):
+                project['commit_records'] = commit_records[project_name]
+            projects.append(project)
 
         # 按提交数排序
         projects.sort(key=lambda x: x['commits'], reverse=True)
 
         return projects
+
+    @staticmethod
+    def _language_mix(language_lines: Dict[str, float]) -> Dict[str, float]:
+        """{语言: 变更行数} -> {语言: 百分比}，按占比降序"""
+        total = sum(language_lines.values())
+        if not total:
+            return {}
+        return {
+            lang: round(lines / total * 100, 1)
+            for lang, lines in sorted(language_lines.items(), key=lambda x: x[1], reverse=True)
+        }
+
+    @staticmethod
+    def _commit_records(commits: List[Dict], limit: int) -> List[Dict]:
+        """最近 limit 个提交的精简明细（按提交时间倒序）"""
+        recent = heapq.nlargest(limit, commits, key=lambda c: c.get('timestamp', 0))
+        return [
+            {
+                'hash': commit.get('short_hash') or commit.get('hash', '')[:8],
+                'date': commit.get('date', ''),
+                'message': commit.get('message', '').split('\n', 1)[0][:100],
+                'files_changed': commit.get('files_changed', 0),
+                'additions': commit.get('additions', 0),
+                'deletions': commit.get('deletions', 0),
+            }
+            for commit in recent
+        ]
@@ -20,13 +20,23 @@ sys.path.insert(0, str(Path(__file__).parent))
 
 from git_collector import GitDataCollector
 from data_analyzer import DataAnalyzer
+from author_identity import AuthorIndex, cluster_author_mapping
 from llm_client import LLMClient
 from config_loader import ConfigLoader
 from logger_config import get_logger
+from file_utils import atomic_write_json
+from team_rollup import generate_team_reports
+from percentiles import author_percentiles, index_percentiles
+from collaboration import collaboration_graph
+from trends import author_trends, load_history
+from ownership import author_ownership
 
 # 获取logger
 logger = get_logger(__name__)
 
+# 单个项目的提交明细过大时，每个分片文件包含的提交数
+COMMITS_PER_CHUNK = 500
+
 
 def load_config(config_path: str) -> dict:
     """加载配置文件"""
@@ -49,7 +59,7 @@ def load_author_mapping(mapping_path: str) -> Dict[str, str]:
     return mapping
 
 
-def generate_single_report(author_info, author_projects, author_data_map, config, analyzer, llm_client, output_dir, max_file_size_mb=1):
+def generate_single_report(author_info, analyzed_data, config, analyzer, llm_client, output_dir, max_file_size_mb=1):
     """生成单个作者的报告（用于并发处理）
 
     Returns:
@@ -63,9 +73,6 @@ def generate_single_report(author_info, author_projects, author_data_map, config
     # 生成UUID作为访问标识
     author_uuid = str(uuid.uuid4())
 
-    # 分析数据（限制详细提交记录数量以控制文件大小）
-    analyzed_data = analyzer.analyze(author_projects, max_commits=1000)
-
     # 生成AI文案
     ai_text = None
     if llm_client:
@@ -82,7 +89,8 @@ def generate_single_report(author_info, author_projects, author_data_map, config
             'email': author_email,
             'author_id': author_info,
             'uuid': author_uuid,  # 添加UUID
-            'year': config.get('report_year', 2025),
+            'year': analyzer.report_year,
+            'period': analyzer.period.label,
             'generated_at': datetime.now().isoformat(),
         },
         'summary': analyzed_data['summary'],
@@ -90,6 +98,14 @@ def generate_single_report(author_info, author_projects, author_data_map, config
         'code_quality': analyzed_data['code_quality'],
         'languages': analyzed_data['languages'],
         'projects': analyzed_data['projects'],
+        'leaderboards': analyzed_data['leaderboards'],
+        'period': analyzed_data['period'],
+        'percentiles': analyzed_data['percentiles'],
+        'messages': analyzed_data['messages'],
+        'hotspots': analyzed_data['hotspots'],
+        'collaborators': analyzed_data['collaborators'],
+        'trends': analyzed_data['trends'],
+        'ownership': analyzed_data.get('ownership'),
         'ai_text': ai_text,
         'theme': config.get('theme', {}),
     }
@@ -111,11 +127,11 @@ def generate_single_report(author_info, author_projects, author_data_map, config
     if temp_path.stat().st_size > max_file_size_bytes:
         print(f"      警告: JSON文件过大 ({file_size_mb:.2f}MB)，启用分片存储...")
 
-        # 创建分片：将每个项目的commits单独存储
+        # 创建分片：将每个项目的提交明细单独存储
         chunk_files = []
 
         for project_idx, project in enumerate(report_data.get('projects', [])):
-            commits = project.get('commits', [])
+            commits = project.get('commit_records', [])
 
             if not commits:
                 continue
@@ -123,7 +139,7 @@ def generate_single_report(author_info, author_projects, author_data_map, config
             # 计算这个项目的commits大小
             project_data = {
                 'project_name': project.get('name', ''),
-                'commits': commits
+                'commit_records': commits
             }
             project_json = json.dumps(project_data, ensure_ascii=False, indent=2)
             project_size = len(project_json.encode('utf-8'))
@@ -131,7 +147,7 @@ def generate_single_report(author_info, author_projects, author_data_map, config
             # 如果单个项目的commits也很大，进一步分片
             if project_size > max_file_size_bytes:
                 # 将commits分成多个文件，每个文件不超过限制
-                commits_per_chunk = max_commits or 500
+                commits_per_chunk = COMMITS_PER_CHUNK
                 num_chunks = (len(commits) + commits_per_chunk - 1) // commits_per_chunk
 
                 for chunk_idx in range(num_chunks):
@@ -143,7 +159,7 @@ def generate_single_report(author_info, author_projects, author_data_map, config
                         'project_name': project.get('name', ''),
                         'chunk_index': chunk_idx,
                         'total_chunks': num_chunks,
-                        'commits': chunk_commits
+                        'commit_records': chunk_commits
                     }
 
                     chunk_filename = f"{author_uuid}_p{project_idx}_c{chunk_idx}.json"
@@ -162,7 +178,7 @@ def generate_single_report(author_info, author_projects, author_data_map, config
                     f"{author_uuid}_p{project_idx}_c{i}.json"
                     for i in range(num_chunks)
                 ]
-                project['commits'] = []  # 清空主文件中的commits
+                project['commit_records'] = []  # 清空主文件中的提交明细
             else:
                 # 单个项目大小合适，单独存储
                 chunk_filename = f"{author_uuid}_p{project_idx}.json"
@@ -178,7 +194,7 @@ def generate_single_report(author_info, author_projects, author_data_map, config
                 # 在主文件中标记
                 project['commits_chunked'] = True
                 project['commits_chunk_file'] = chunk_filename
-                project['commits'] = []
+                project['commit_records'] = []
 
         # 更新主文件的meta信息
         report_data['meta']['chunked'] = True
@@ -214,6 +230,7 @@ def generate_single_report(author_info, author_projects, author_data_map, config
         'commits': report_data['summary']['total_commits'],
         'net_lines': report_data['summary']['net_lines'],
         'projects': len(report_data['projects']),
+        'percentiles': index_percentiles(report_data['percentiles']),
         'json_file': report_data['meta']['json_file'],
         'generated_at': report_data['meta']['generated_at'],
     }
@@ -243,8 +260,7 @@ def apply_author_mapping(author_info: str, mapping: Dict[str, str]) -> str:
 
 def save_progress(progress_file: Path, data: dict):
     """保存进度"""
-    with open(progress_file, 'w', encoding='utf-8') as f:
-        json.dump(data, f, ensure_ascii=False, indent=2)
+    atomic_write_json(progress_file, data)
 
 
 def main():
@@ -268,7 +284,8 @@ def main():
     if not config:
         sys.exit(1)
 
-    logger.info(f"   - 分析年份: {config.get('report_year', 2025)}")
+    analyzer = DataAnalyzer(config)
+    logger.info(f"   - 分析范围: {analyzer.period.label}")
     logger.info(f"   - 项目数量: {len(config.get('projects', []))}")
 
     # 加载作者映射
@@ -289,22 +306,27 @@ def main():
     print("\n[2/6] 采集Git数据...")
     collector_config = config.copy()
     collector_config['authors'] = []
+    collector_config['report_year'] = analyzer.report_year
     collector = GitDataCollector(collector_config)
 
     all_data = []
-    all_authors = set()
 
-    for project in config.get('projects', []):
+    period = analyzer.period
+    if not period.is_full_year:
+        # 季度/任意范围：确保覆盖年份已扫描（通常命中缓存），再按范围查询提交存储并聚合
+        print(f"\n   报告时间范围: {period.since} ~ {period.until}（不含），覆盖年份 {period.years}")
+        collector.collect_years(period.years)
+        all_data = analyzer.load_projects(collector.store, repos=collector.project_keys(), partials=True)
+        for project_data in all_data:
+            print(f"   [OK] {project_data['project_name']}: 范围内 {project_data['total_commits']} 条提交记录")
+
+    for project in config.get('projects', []) if period.is_full_year else []:
         print(f"\n   扫描项目: {project['name']}")
 
         try:
             project_data = collector.collect_project(project)
             all_data.append(project_data)
 
-            for commit in project_data.get('commits', []):
-                author_info = f"{commit['author']} <{commit['email']}>"
-                all_authors.add(author_info)
-
             print(f"   [OK] 完成: 找到 {len(project_data.get('commits', []))} 条提交记录")
         except Exception as e:
             print(f"   [FAIL] 失败: {str(e)}")
@@ -314,50 +336,31 @@ def main():
         print("\n错误: 未能收集到任何数据")
         sys.exit(1)
 
-    print(f"\n   发现 {len(all_authors)} 位作者")
+    # 身份聚类（可选）：生成建议映射，apply 时与手工映射合并
+    author_mapping = cluster_author_mapping(
+        all_data, author_mapping, lambda author_info: apply_author_mapping(author_info, author_mapping),
+        config.get('identity_clustering', {}), mapping_path.parent
+    )
+
+    # 一次遍历建立作者身份倒排索引（每个身份只做一次作者映射）
+    author_index = AuthorIndex(all_data, lambda author_info: apply_author_mapping(author_info, author_mapping))
+    print(f"\n   发现 {author_index.identity_count} 位作者")
 
     # 3. 应用作者映射并按作者分组
     print("\n[3/6] 按作者分组数据...")
 
-    mapped_authors = {}
-    for author_info in all_authors:
-        mapped_author = apply_author_mapping(author_info, author_mapping)
-        if mapped_author not in mapped_authors:
-            mapped_authors[mapped_author] = []
-        mapped_authors[mapped_author].append(author_info)
-
     author_data_map = {}
-    for mapped_author, original_authors in mapped_authors.items():
+    for mapped_author, positions in author_index.positions.items():
         author_name = mapped_author.split('<')[0].strip()
-        author_email = mapped_author.split('<')[1].replace('>', '').strip() if '<' in mapped_author else ''
+        aliases = author_index.aliases[mapped_author]
 
-        author_projects = []
-        for project_data in all_data:
-            author_commits = []
-            for original_author in original_authors:
-                orig_name = original_author.split('<')[0].strip()
-                orig_email = original_author.split('<')[1].replace('>', '').strip() if '<' in original_author else ''
-
-                commits = [
-                    commit for commit in project_data.get('commits', [])
-                    if commit['author'] == orig_name and commit['email'] == orig_email
-                ]
-                author_commits.extend(commits)
-
-            if author_commits:
-                author_projects.append({
-                    'project_name': project_data['project_name'],
-                    'path': project_data['path'],
-                    'commits': author_commits,
-                    'language_stats': project_data.get('language_stats', {}),
-                    'total_commits': len(author_commits),
-                    'branch': project_data.get('branch', 'HEAD'),
-                })
+        # 按索引合并该作者所有身份的部分聚合
+        author_projects = analyzer.author_projects(all_data, aliases, positions)
 
         if author_projects:
             author_data_map[mapped_author] = author_projects
             total_commits = sum(p['total_commits'] for p in author_projects)
-            mapping_info = f" (映射自 {len(original_authors)} 个名字)" if len(original_authors) > 1 else ""
+            mapping_info = f" (映射自 {len(aliases)} 个名字)" if len(aliases) > 1 else ""
             print(f"   - {author_name}: {total_commits} 次提交{mapping_info}")
 
     # 更新进度
@@ -370,6 +373,37 @@ def main():
         'percentage': 0
     })
 
+    # 合并部分聚合得到每位作者的统计数据，并计算作者间百分位排名（在筛选前，与全部作者比较）
+    analyses = {
+        author_info: analyzer.analyze_partials(author_projects)
+        for author_info, author_projects in author_data_map.items()
+    }
+    percentiles = author_percentiles(analyses, analyzer.backend)
+
+    # 作者协作关系（按映射后的作者ID归并各身份）
+    collaborators = collaboration_graph(all_data, key=author_index.commit_key)
+
+    # 同比趋势：往年数据只读提交存储中缓存的部分聚合，不访问Git
+    trend_years = config.get('analysis', {}).get('trend_years', 0)
+    history = load_history(collector, analyzer, trend_years, key=author_index.key) if trend_years else {}
+    trends = author_trends(analyzer.report_year, analyses, history)
+
+    # 代码归属（可选，git blame 结果按 blob SHA 缓存）
+    ownership = {}
+    if config.get('ownership', {}).get('enabled'):
+        print("\n   统计代码归属（存活行数）...")
+        ownership = author_ownership(collector.collect_ownership(), key=author_index.key)
+
+    for author_info, analyzed_data in analyses.items():
+        analyzed_data['percentiles'] = percentiles[author_info]
+        analyzed_data['collaborators'] = collaborators.get(author_info, [])
+        analyzed_data['trends'] = trends[author_info]
+        if ownership:
+            analyzed_data['ownership'] = ownership.get(author_info)
+
+    # 团队/组织汇总始终基于全部作者，authors 配置的筛选只决定生成哪些个人报告
+    team_data_map = author_data_map
+
     # 筛选指定的作者
     target_authors = config.get('authors', [])
     if target_authors:
@@ -405,7 +439,6 @@ def main():
     # 5. 为每个作者生成JSON报告（支持LLM并发）
     print(f"\n[5/6] 生成JSON报告...")
 
-    analyzer = DataAnalyzer(config)
     output_dir.mkdir(parents=True, exist_ok=True)
 
     report_index = {}
@@ -427,14 +460,13 @@ def main():
                 executor.submit(
                     generate_single_report,
                     author_info,
-                    author_projects,
-                    author_data_map,
+                    analyses[author_info],
                     config,
                     analyzer,
                     llm_client,
                     output_dir
                 ): author_info
-                for author_info, author_projects in author_data_map.items()
+                for author_info in author_data_map
             }
 
             # 收集结果
@@ -462,7 +494,7 @@ def main():
                     print(f"      警告: 生成报告失败 {author_info}: {exc}")
     else:
         # 串行生成报告
-        for idx, (author_info, author_projects) in enumerate(author_data_map.items(), 1):
+        for idx, author_info in enumerate(author_data_map, 1):
             # 更新进度
             save_progress(progress_file, {
                 'status': 'generating',
@@ -473,7 +505,7 @@ def main():
             })
 
             author_uuid, report_data, uuid_info, index_info = generate_single_report(
-                author_info, author_projects, author_data_map,
+                author_info, analyses[author_info],
                 config, analyzer, llm_client, output_dir
             )
 
@@ -486,8 +518,7 @@ def main():
     print(f"\n[6/6] 生成总索引文件和UUID映射...")
 
     index_path = output_dir / 'report_index.json'
-    with open(index_path, 'w', encoding='utf-8') as f:
-        json.dump(report_index, f, ensure_ascii=False, indent=2)
+    atomic_write_json(index_path, report_index)
     print(f"   [OK] 索引文件: report_index.json")
 
     # 保存UUID映射关系（便于管理员查看）
@@ -496,6 +527,13 @@ def main():
         json.dump(uuid_mapping, f, ensure_ascii=False, indent=2)
     print(f"   [OK] UUID映射: uuid_mapping.json")
 
+    # 团队/组织汇总报告（合并已计算的作者部分聚合，不重新分析提交）
+    try:
+        team_index = generate_team_reports(config, team_data_map, analyzer, output_dir)
+        print(f"   [OK] 团队报告: {len(team_index)} 个 (teams/index.json)")
+    except Exception as e:
+        print(f"   警告: 团队报告生成失败 - {str(e)}")
+
     # 统计文件大小
     total_size = sum(
         (output_dir / info['json_file']).stat().st_size
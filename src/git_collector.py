@@ -6,18 +6,33 @@ Git数据采集器
 
 import os
 import git
+import hashlib
 import json
 import time
-from datetime import datetime, timedelta
-from typing import Dict, List, Any
+from datetime import datetime, timedelta, timezone
+from typing import Dict, List, Any, Tuple
 from collections import defaultdict
-from concurrent.futures import ThreadPoolExecutor, as_completed
+from concurrent.futures import ThreadPoolExecutor, as_completed, wait, FIRST_COMPLETED
 import threading
 from pathlib import Path
 from logger_config import get_logger
+from commit_store import CommitStore
+from aggregates import CommitAggregate, build_partials
+from hotspots import count_file_changes
+from report_period import ReportPeriod
+from ownership import repo_ownership, DEFAULT_TIME_BUDGET, DEFAULT_WORKERS
 
 logger = get_logger(__name__)
 
+# 采集逻辑版本号：修改提交分析方式（影响缓存内容）时递增，使旧缓存失效
+COLLECTOR_VERSION = '1.2.0'
+
+# 扫描范围按作者本地时间划分，而 git 按提交者时间过滤，git 的时间范围两端各放宽的天数
+GIT_RANGE_MARGIN_DAYS = 7
+
+# 影响采集结果的 analysis 配置项（其余配置项只影响报告分析，不使缓存失效）
+COLLECTION_ANALYSIS_KEYS = ('max_commits_per_project', 'skip_large_diffs', 'max_diff_size')
+
 
 class GitDataCollector:
     """Git数据采集器"""
@@ -39,61 +54,141 @@ class GitDataCollector:
         self.skip_large_diffs = analysis_config.get('skip_large_diffs', True)  # 跳过超大的diff
         self.max_diff_size = analysis_config.get('max_diff_size', 1000000)  # 最大diff大小（字节）
 
-        # 线程锁，用于保护日志输出和文件写入
+        # 线程锁，用于保护日志输出
         self.log_lock = threading.Lock()
-        self.file_lock = threading.Lock()
-        # 增量持久化目录
+        # 增量持久化目录（SQLite提交存储，支持并发读取和增量写入）
         self.cache_dir = Path(config.get('cache_dir', './.git_scan_cache'))
         self.cache_dir.mkdir(parents=True, exist_ok=True)
+        self.store = CommitStore(self.cache_dir / 'commits.db')
+        # 其他采集逻辑版本保存的变更统计不再可信（例如旧版 changed_files 总是为空）
+        pruned = self.store.prune_commit_stats(COLLECTOR_VERSION)
+        if pruned:
+            logger.info(f"已清理 {pruned} 条旧版本的变更统计缓存")
+
+        # 缓存空间预算（MB），为空表示不限制
+        self.cache_max_size_mb = config.get('cache', {}).get('max_size_mb')
+        # 本次运行的扫描耗时（用于缓存淘汰时估算重扫成本）和缓存命中统计
+        self._scan_durations = {}
+        self._cache_stats_lock = threading.Lock()
+        self.cache_stats = {'scan_hits': 0, 'scan_misses': 0, 'stats_hits': 0, 'stats_misses': 0}
+
+    def _count_cache(self, key: str, amount: int = 1):
+        """累计缓存命中统计（线程安全）"""
+        with self._cache_stats_lock:
+            self.cache_stats[key] += amount
+
+    def _finish_run(self):
+        """运行结束：输出缓存命中率并执行缓存空间预算"""
+        stats = self.cache_stats
+        scan_total = stats['scan_hits'] + stats['scan_misses']
+        commit_total = stats['stats_hits'] + stats['stats_misses']
+        with self.log_lock:
+            logger.info("缓存命中率:")
+            if scan_total:
+                logger.info(f"  - 项目扫描缓存: {stats['scan_hits']}/{scan_total} "
+                            f"({stats['scan_hits'] / scan_total * 100:.1f}%)")
+            if commit_total:
+                logger.info(f"  - 提交变更统计缓存: {stats['stats_hits']}/{commit_total} "
+                            f"({stats['stats_hits'] / commit_total * 100:.1f}%)")
+
+        if self.cache_max_size_mb:
+            from cache_manager import CacheManager
+            try:
+                evicted = CacheManager(self.store, self.cache_max_size_mb).enforce_budget()
+                if evicted:
+                    with self.log_lock:
+                        logger.info(f"缓存超出预算 {self.cache_max_size_mb}MB，已淘汰 {len(evicted)} 个条目")
+            except Exception as e:
+                with self.log_lock:
+                    logger.warning(f"执行缓存空间预算失败: {e}")
+
+    def _get_cache_key(self, project: Dict[str, Any]) -> str:
+        """获取项目在提交存储中的键"""
+        return project.get('name', project.get('path'))
+
+    def _get_config_hash(self, project: Dict[str, Any]) -> str:
+        """计算影响采集结果的配置指纹
+
+        包含采集逻辑版本、作者筛选、影响采集的 analysis 配置以及项目自身的配置
+        （路径、分支、排除规则等），任一变化都会使该项目的缓存失效。
+        只影响报告分析的配置（如 analysis.backend）不参与计算。
+        """
+        analysis_config = self.config.get('analysis', {})
+        fingerprint = {
+            'collector_version': COLLECTOR_VERSION,
+            'authors': sorted(a.lower() for a in self.authors),
+            'analysis': {k: v for k, v in analysis_config.items() if k in COLLECTION_ANALYSIS_KEYS},
+            'project': {k: v for k, v in project.items() if k not in ('name', 'auto_discovered')},
+        }
+        raw = json.dumps(fingerprint, sort_keys=True, ensure_ascii=False, default=str)
+        return hashlib.sha1(raw.encode('utf-8')).hexdigest()[:16]
 
-    def _get_project_cache_path(self, project_name: str, year: int) -> Path:
-        """获取项目缓存文件路径"""
-        safe_name = "".join(c if c.isalnum() or c in ('-', '_') else '_' for c in project_name)
-        return self.cache_dir / f"{safe_name}_{year}.json"
+    def _get_year_range(self) -> Tuple[int, int]:
+        """获取报告年份的时间范围 [since, until)
+
+        按作者本地时间划分（墙钟秒数，author_ts + tz_offset），与分析时的日期、小时口径一致，
+        跨年前后的提交不会因采集机器的时区被划到另一年。
+        """
+        period = ReportPeriod.year(self.report_year)
+        return period.since_ts, period.until_ts
 
     def _save_project_cache(self, project: Dict[str, Any], project_data: Dict[str, Any]):
-        """保存项目扫描结果到缓存文件"""
+        """保存项目扫描结果到提交存储（连同按作者身份的部分聚合）"""
         try:
-            cache_path = self._get_project_cache_path(project.get('name', project.get('path')), self.report_year)
-
-            with self.file_lock:
-                cache_data = {
-                    'project': project,
-                    'data': project_data,
-                    'scan_time': datetime.now().isoformat(),
-                    'report_year': self.report_year
-                }
+            since_ts, until_ts = self._get_year_range()
+            partials = project_data.get('partials')
+            if partials is None:
+                partials = build_partials(project_data['project_name'], project_data.get('commits', []))
+            self.store.save_project(
+                self._get_cache_key(project),
+                self.report_year,
+                project_data,
+                since_ts,
+                until_ts,
+                config_hash=self._get_config_hash(project),
+                scan_duration=self._scan_durations.get(project.get('path')),
+                partials={identity: aggregate.to_dict() for identity, aggregate in partials.items()},
+            )
 
-                with open(cache_path, 'w', encoding='utf-8') as f:
-                    json.dump(cache_data, f, ensure_ascii=False, indent=2)
-
-                with self.log_lock:
-                    logger.info(f"  ✓ 已保存缓存: {cache_path.name}")
+            with self.log_lock:
+                logger.info(f"  ✓ 已保存缓存: {self._get_cache_key(project)} ({len(project_data.get('commits', []))} 个提交)")
         except Exception as e:
             with self.log_lock:
                 logger.warning(f"  ✗ 保存缓存失败: {e}")
 
     def _load_project_cache(self, project: Dict[str, Any]) -> Dict[str, Any]:
-        """从缓存加载项目扫描结果"""
+        """从提交存储加载项目扫描结果"""
         try:
-            cache_path = self._get_project_cache_path(project.get('name', project.get('path')), self.report_year)
-
-            if not cache_path.exists():
+            cache_key = self._get_cache_key(project)
+            scan = self.store.get_scan(cache_key, self.report_year)
+            if scan is None:
+                self._count_cache('scan_misses')
                 return None
 
-            with self.file_lock:
-                with open(cache_path, 'r', encoding='utf-8') as f:
-                    cache_data = json.load(f)
+            # 采集配置变化：只失效该项目的缓存条目
+            if scan.get('config_hash') != self._get_config_hash(project):
+                with self.log_lock:
+                    logger.info(f"  采集配置已变化，缓存失效: {cache_key}")
+                self.store.delete_scan(cache_key, self.report_year)
+                self._count_cache('scan_misses')
+                return None
 
-                # 验证缓存年份是否匹配
-                if cache_data.get('report_year') != self.report_year:
-                    logger.info(f"  缓存年份不匹配，将重新扫描")
-                    return None
+            project_data = self.store.load_project(cache_key, self.report_year)
+            if project_data is None:
+                self._count_cache('scan_misses')
+                return None
+            project_data['partials'] = self._load_partials(cache_key, project_data)
+            if not project_data['file_changes'] and project_data['commits']:
+                # 旧版缓存没有文件变更计数：由缓存的提交补算并写回
+                project_data['file_changes'] = count_file_changes(project_data['commits'])
+                self.store.save_file_changes(cache_key, self.report_year, project_data['file_changes'])
+            self.store.touch_scan(cache_key, self.report_year)
+            self._count_cache('scan_hits')
 
-                with self.log_lock:
-                    logger.info(f"  ✓ 从缓存加载: {cache_path.name}")
+            with self.log_lock:
+                logger.info(f"  ✓ 从缓存加载: {cache_key}")
 
-                return cache_data.get('data')
+            return project_data
         except Exception as e:
             with self.log_lock:
                 logger.warning(f"  ✗ 加载缓存失败: {e}")
@@ -102,11 +197,8 @@ class GitDataCollector:
     def _clear_all_cache(self):
         """清空所有缓存"""
         try:
-            import shutil
-            if self.cache_dir.exists():
-                shutil.rmtree(self.cache_dir)
-                self.cache_dir.mkdir(parents=True, exist_ok=True)
-                logger.info(f"已清空缓存目录: {self.cache_dir}")
+            self.store.clear()
+            logger.info(f"已清空缓存: {self.store.db_path}")
         except Exception as e:
             logger.warning(f"清空缓存失败: {e}")
 
@@ -126,9 +218,28 @@ class GitDataCollector:
         return False
 
     def _is_target_year(self, commit: git.Commit) -> bool:
-        """判断提交是否属于目标年份"""
-        commit_date = datetime.fromtimestamp(commit.committed_date)
-        return commit_date.year == self.report_year
+        """判断提交是否属于目标年份（按作者本地时间，与 _commit_time_fields 的 author_ts + tz_offset 相同）"""
+        since_ts, until_ts = self._get_year_range()
+        return since_ts <= commit.authored_date - commit.author_tz_offset < until_ts
+
+    @staticmethod
+    def _commit_time_fields(commit: git.Commit) -> Dict[str, Any]:
+        """提交的时间字段
+
+        - timestamp: 提交时间（committer），用于排序
+        - author_ts / tz_offset: 作者时间戳和作者时区偏移（秒，东区为正），
+          分析时直接用 author_ts + tz_offset 算出作者本地的日期和小时，无需解析字符串；
+          扫描范围也按它划分（见 _get_year_range）
+        - date: 作者本地时间的ISO字符串，仅用于展示
+        """
+        tz_offset = -commit.author_tz_offset
+        author_date = datetime.fromtimestamp(commit.authored_date, timezone(timedelta(seconds=tz_offset)))
+        return {
+            'date': author_date.isoformat(),
+            'timestamp': commit.committed_date,
+            'author_ts': commit.authored_date,
+            'tz_offset': tz_offset,
+        }
 
     def _get_file_stats(self, diff) -> Dict[str, int]:
         """获取文件变更统计"""
@@ -181,23 +292,26 @@ class GitDataCollector:
         _, ext = os.path.splitext(file_path.lower())
         return ext_map.get(ext, 'Other')
 
-    def _analyze_commit(self, commit: git.Commit, repo) -> Dict[str, Any]:
+    def _analyze_commit(self, commit: git.Commit, repo,
+                        stats_cache: Dict[str, Dict[str, Any]] = None) -> Dict[str, Any]:
         """分析单个提交（用于并发处理）- 极速版本
 
         策略：保证不丢失任何提交，即使分析失败也返回基本信息
+        - 零优先级：按SHA命中变更统计缓存，无需调用git
         - 第一优先级：使用 commit.stats.total（超快速，~1ms）
         - 第二优先级：仅当 stats 失败时才使用 diff（较慢，~10ms）
         - 保底策略：如果全部失败，至少返回提交的基本元数据
+
+        Args:
+            stats_cache: 预先批量查询的 {hash: 变更统计}，为None时单独查询提交存储
         """
-        commit_date = datetime.fromtimestamp(commit.committed_date)
         short_hash = commit.hexsha[:8]
 
         # 基本信息（永远保证有值）
         basic_info = {
             'hash': commit.hexsha,
             'short_hash': short_hash,
-            'date': commit_date.isoformat(),
-            'timestamp': commit.committed_date,
+            **self._commit_time_fields(commit),
             'message': commit.message.strip(),
             'author': commit.author.name,
             'email': commit.author.email,
@@ -209,9 +323,23 @@ class GitDataCollector:
             'analysis_level': 'basic',  # 标记分析级别：basic/stats/diff
         }
 
+        # === 零优先级：按SHA查询变更统计缓存（与项目名、路径、年份无关） ===
+        if stats_cache is None:
+            stats_cache = self.store.get_commit_stats([commit.hexsha], COLLECTOR_VERSION)
+        cached_stats = stats_cache.get(commit.hexsha)
+        if cached_stats is not None:
+            basic_info['files_changed'] = cached_stats['files_changed']
+            basic_info['additions'] = cached_stats['additions']
+            basic_info['deletions'] = cached_stats['deletions']
+            basic_info['changed_files'] = list(cached_stats['changed_files'])
+            basic_info['languages'] = [self._detect_language(f) for f in cached_stats['changed_files']]
+            basic_info['analysis_level'] = 'stats'
+            return basic_info
+
         # === 第一优先级：使用 stats（超快速，1ms） ===
         try:
-            stats = commit.stats.total
+            commit_stats = commit.stats
+            stats = commit_stats.total
             files_changed = stats.get('files', 0)
             additions = stats.get('insertions', 0)
             deletions = stats.get('deletions', 0)
@@ -223,9 +351,9 @@ class GitDataCollector:
             basic_info['analysis_level'] = 'stats'
 
             # 尝试从 stats.files 获取文件列表（不需要 diff，非常快）
-            if hasattr(stats, 'files') and stats.files:
+            if commit_stats.files:
                 try:
-                    for filepath in list(stats.files.keys())[:100]:  # 最多100个文件
+                    for filepath in list(commit_stats.files.keys())[:100]:  # 最多100个文件
                         if filepath:
                             basic_info['changed_files'].append(filepath)
                             lang = self._detect_language(filepath)
@@ -285,10 +413,104 @@ class GitDataCollector:
 
             return basic_info
 
+    def _load_partials(self, cache_key: str, project_data: Dict[str, Any] = None,
+                       year: int = None) -> Dict[Any, CommitAggregate]:
+        """读取缓存条目的部分聚合；旧条目没有或格式过期时由提交补算并写回
+
+        Args:
+            project_data: 条目的项目数据，为None时在需要补算时才从提交存储加载
+            year: 年份，默认报告年份
+        """
+        year = year or self.report_year
+        stored = self.store.load_partials(year, [cache_key]).get(cache_key)
+        if stored:
+            try:
+                return {identity: CommitAggregate.from_dict(data) for identity, data in stored.items()}
+            except (ValueError, KeyError) as e:
+                with self.log_lock:
+                    logger.info(f"  部分聚合格式已过期，重新计算: {cache_key} ({e})")
+
+        if project_data is None:
+            project_data = self.store.load_project(cache_key, year)
+            if project_data is None:
+                return {}
+        partials = build_partials(project_data['project_name'], project_data.get('commits', []))
+        if partials:
+            self.store.save_partials(cache_key, year,
+                                     {identity: aggregate.to_dict() for identity, aggregate in partials.items()})
+        return partials
+
+    def load_year_partials(self, year: int) -> Dict[str, Dict[Tuple[str, str], CommitAggregate]]:
+        """读取往年各项目的部分聚合（只读提交存储，不访问Git）
+
+        只包含当前配置中该年份已扫描过的项目；往年没有扫描过的项目不会为此补扫。
+
+        Returns:
+            {缓存键: {(name, email): CommitAggregate}}
+        """
+        scanned = {scan['repo'] for scan in self.store.list_scans(year)}
+        result = {}
+        for project in self.config.get('projects', []):
+            cache_key = self._get_cache_key(project)
+            if cache_key in scanned:
+                result[cache_key] = self._load_partials(cache_key, year=year)
+        return result
+
+    def project_keys(self) -> List[str]:
+        """当前配置中各项目在提交存储中的键"""
+        return [self._get_cache_key(project) for project in self.config.get('projects', [])]
+
+    def collect_years(self, years: List[int]):
+        """确保各年份的扫描都已在提交存储中（已缓存的年份只读缓存，不访问Git）
+
+        扫描缓存以 (项目, 年份) 为单位，季度或任意范围的报告先调用本方法，
+        再用 DataAnalyzer.load_projects 按范围查询。
+        """
+        for year in years:
+            with self.log_lock:
+                logger.info(f"准备 {year} 年的扫描数据...")
+            collector = self if year == self.report_year else GitDataCollector({**self.config, 'report_year': year})
+            collector.collect_all_parallel()
+
+    def collect_ownership(self) -> Dict[str, Dict[str, Any]]:
+        """统计各项目 HEAD 中每位作者的存活行数（git blame，按 blob SHA 缓存）
+
+        所有项目共享 ownership.time_budget_seconds 的时间预算，预算耗尽后剩余项目标记为不完整。
+
+        Returns:
+            {项目名: ownership.repo_ownership 的结果}
+        """
+        ownership_config = self.config.get('ownership', {})
+        workers = ownership_config.get('workers', DEFAULT_WORKERS)
+        time_budget = ownership_config.get('time_budget_seconds', DEFAULT_TIME_BUDGET)
+        max_file_size = ownership_config.get('max_file_size_kb', 1024) * 1024
+        deadline = time.time() + time_budget
+
+        results = {}
+        for project in self.config.get('projects', []):
+            remaining = deadline - time.time()
+            if remaining <= 0:
+                with self.log_lock:
+                    logger.warning(f"  代码归属超出时间预算，跳过: {project['name']}")
+                results[project['name']] = {
+                    'authors': {}, 'total_lines': 0, 'total_files': 0, 'blamed_files': 0, 'complete': False,
+                }
+                continue
+            try:
+                results[project['name']] = repo_ownership(
+                    project['path'], self.store, workers=workers,
+                    time_budget=remaining, max_file_size=max_file_size,
+                )
+            except Exception as e:
+                with self.log_lock:
+                    logger.warning(f"  代码归属统计失败: {project['name']} ({e})")
+        return results
+
     def collect_project(self, project: Dict[str, Any]) -> Dict[str, Any]:
         """采集单个项目的Git数据（支持并发）"""
         repo_path = project['path']
         project_name = project['name']
+        scan_start = time.time()
 
         try:
             repo = git.Repo(repo_path)
@@ -298,7 +520,6 @@ class GitDataCollector:
         # 数据结构
         commits_data = []
         language_stats = defaultdict(int)
-        file_changes = defaultdict(int)
 
         # 优化：根据年份确定时间范围，减少遍历的提交数量
         # GitPython的iter_commits支持since和until参数进行时间范围过滤
@@ -307,12 +528,16 @@ class GitDataCollector:
 
         try:
             if self.report_year:
-                # 设置目标年份的时间范围（从年初到年末）
-                since_date = datetime(self.report_year, 1, 1)
-                until_date = datetime(self.report_year + 1, 1, 1)  # 下一年1月1日
+                # 报告范围按作者本地时间划分，git 按提交者时间（UTC）过滤：
+                # 两端放宽 GIT_RANGE_MARGIN_DAYS 天覆盖时区差和晚于创作时间的提交（如 rebase），
+                # 是否属于报告年份由 _is_target_year 精确判断
+                since_ts, until_ts = self._get_year_range()
+                margin = timedelta(days=GIT_RANGE_MARGIN_DAYS)
+                since_date = datetime.fromtimestamp(since_ts, timezone.utc) - margin
+                until_date = datetime.fromtimestamp(until_ts, timezone.utc) + margin
 
                 with self.log_lock:
-                    logger.info(f"  时间范围: {since_date.strftime('%Y-%m-%d')} ~ {until_date.strftime('%Y-%m-%d')}")
+                    logger.info(f"  时间范围: {self.report_year}-01-01 ~ {self.report_year + 1}-01-01（作者本地时间）")
         except Exception as e:
             with self.log_lock:
                 logger.warning(f"  时间范围设置失败: {e}, 将遍历所有提交")
@@ -351,19 +576,27 @@ class GitDataCollector:
                 'path': repo_path,
                 'commits': [],
                 'language_stats': {},
+                'file_changes': {},
                 'total_commits': 0,
                 'branch': 'HEAD',
+                'partials': {},
             }
 
+        # 按SHA批量查询变更统计缓存，命中的提交无需再调用git
+        stats_cache = self.store.get_commit_stats((c.hexsha for c in target_commits), COLLECTOR_VERSION)
+        self._count_cache('stats_hits', len(stats_cache))
+        self._count_cache('stats_misses', len(target_commits) - len(stats_cache))
+
         with self.log_lock:
-            logger.info(f"  找到 {len(target_commits)} 个符合条件的提交，开始并发分析...")
+            logger.info(f"  找到 {len(target_commits)} 个符合条件的提交"
+                        f"（变更统计缓存命中 {len(stats_cache)} 个），开始并发分析...")
 
         # 使用线程池并发分析提交
         commits_data = []
         with ThreadPoolExecutor(max_workers=self.commit_workers) as executor:
             # 提交所有任务
             future_to_commit = {
-                executor.submit(self._analyze_commit, commit, repo): commit
+                executor.submit(self._analyze_commit, commit, repo, stats_cache): commit
                 for commit in target_commits
             }
 
@@ -425,12 +658,10 @@ class GitDataCollector:
 
                 except TimeoutError as exc:
                     # 超时也要创建基本记录，保证不丢失
-                    commit_date = datetime.fromtimestamp(commit.committed_date)
                     basic_record = {
                         'hash': commit.hexsha,
                         'short_hash': commit.hexsha[:8],
-                        'date': commit_date.isoformat(),
-                        'timestamp': commit.committed_date,
+                        **self._commit_time_fields(commit),
                         'message': commit.message.strip(),
                         'author': commit.author.name,
                         'email': commit.author.email,
@@ -450,12 +681,10 @@ class GitDataCollector:
 
                 except Exception as exc:
                     # 任何异常都要创建基本记录，保证不丢失
-                    commit_date = datetime.fromtimestamp(commit.committed_date)
                     basic_record = {
                         'hash': commit.hexsha,
                         'short_hash': commit.hexsha[:8],
-                        'date': commit_date.isoformat(),
-                        'timestamp': commit.committed_date,
+                        **self._commit_time_fields(commit),
                         'message': commit.message.strip(),
                         'author': commit.author.name,
                         'email': commit.author.email,
@@ -490,6 +719,18 @@ class GitDataCollector:
                 else:
                     logger.info(f"    ✓ 数据完整: 无丢失")
 
+        # 保存新计算的变更统计（仅保存完整的 stats 结果，供其他项目/年份复用）
+        new_stats = [
+            c for c in commits_data
+            if c.get('analysis_level') == 'stats' and c['hash'] not in stats_cache
+        ]
+        if new_stats:
+            try:
+                self.store.save_commit_stats(new_stats, COLLECTOR_VERSION)
+            except Exception as e:
+                with self.log_lock:
+                    logger.warning(f"  ✗ 保存变更统计缓存失败: {e}")
+
         # 按时间排序
         commits_data.sort(key=lambda x: x['timestamp'], reverse=True)
 
@@ -497,8 +738,7 @@ class GitDataCollector:
         for commit_data in commits_data:
             for lang in commit_data.get('languages', []):
                 language_stats[lang] += 1
-            for file_path in commit_data.get('changed_files', []):
-                file_changes[file_path] += 1
+        file_changes = count_file_changes(commits_data)
 
         # 获取分支名（处理detached HEAD状态）
         try:
@@ -510,13 +750,20 @@ class GitDataCollector:
             except Exception:
                 branch = 'HEAD'
 
+        # 按作者身份计算部分聚合，报告生成时直接合并
+        partials = build_partials(project_name, commits_data)
+
+        self._scan_durations[repo_path] = time.time() - scan_start
+
         return {
             'project_name': project_name,
             'path': repo_path,
             'commits': commits_data,
             'language_stats': dict(language_stats),
+            'file_changes': file_changes,
             'total_commits': len(commits_data),
             'branch': branch,
+            'partials': partials,
         }
 
     def collect_all(self, use_cache: bool = True) -> List[Dict[str, Any]]:
@@ -552,6 +799,7 @@ class GitDataCollector:
             if not projects_to_scan:
                 with self.log_lock:
                     logger.info(f"所有项目均来自缓存，扫描完成！")
+                self._finish_run()
                 return all_data
         else:
             projects_to_scan = self.config.get('projects', [])
@@ -575,6 +823,7 @@ class GitDataCollector:
                     logger.error(f"扫描项目失败: {str(e)}")
                 continue
 
+        self._finish_run()
         return all_data
 
     def collect_all_parallel(self, use_cache: bool = True) -> List[Dict[str, Any]]:
@@ -602,59 +851,60 @@ class GitDataCollector:
         failed_projects = []
         cached_count = 0
 
-        # 尝试从缓存加载已扫描的项目
         if use_cache:
             with self.log_lock:
                 logger.info(f"检查缓存...")
-
-            projects_to_scan = []
-            for project in projects:
-                cached_data = self._load_project_cache(project)
-                if cached_data:
-                    all_data.append(cached_data)
-                    cached_count += 1
-                else:
-                    projects_to_scan.append(project)
-
-            if cached_count > 0:
-                with self.log_lock:
-                    logger.info(f"从缓存加载了 {cached_count}/{len(projects)} 个项目")
-
-            if not projects_to_scan:
-                with self.log_lock:
-                    logger.info(f"所有项目均来自缓存，扫描完成！")
-                return all_data
         else:
-            projects_to_scan = projects
             # 清空缓存
             self._clear_all_cache()
 
-        # 使用线程池并发采集未缓存的项目（使用repo_workers配置）
-        with ThreadPoolExecutor(max_workers=self.repo_workers) as executor:
-            # 提交所有采集任务
-            future_to_project = {
-                executor.submit(self.collect_project, project): project
-                for project in projects_to_scan
-            }
+        # 缓存加载与仓库扫描使用两个线程池并行进行：
+        # 缓存加载全部并发提交，未命中的项目立即转入扫描线程池（使用repo_workers配置），
+        # 无需等待其他项目的缓存加载完成
+        load_workers = min(len(projects), self.max_workers)
+        with ThreadPoolExecutor(max_workers=load_workers) as load_executor, \
+                ThreadPoolExecutor(max_workers=self.repo_workers) as scan_executor:
+            pending = {}
+            for project in projects:
+                if use_cache:
+                    pending[load_executor.submit(self._load_project_cache, project)] = ('load', project)
+                else:
+                    pending[scan_executor.submit(self.collect_project, project)] = ('scan', project)
+
+            while pending:
+                done, _ = wait(pending, return_when=FIRST_COMPLETED)
+                for future in done:
+                    kind, project = pending.pop(future)
+                    project_label = project.get('name', project.get('path'))
+
+                    if kind == 'load':
+                        cached_data = future.result()
+                        if cached_data:
+                            all_data.append(cached_data)
+                            cached_count += 1
+                        else:
+                            pending[scan_executor.submit(self.collect_project, project)] = ('scan', project)
+                        continue
 
-            # 使用as_completed按完成顺序处理结果
-            for future in as_completed(future_to_project):
-                project = future_to_project[future]
-                try:
-                    project_data = future.result()
+                    try:
+                        project_data = future.result()
 
-                    # 立即保存到缓存（增量持久化）
-                    if use_cache:
-                        self._save_project_cache(project, project_data)
+                        # 立即保存到缓存（增量持久化）
+                        if use_cache:
+                            self._save_project_cache(project, project_data)
 
-                    with self.log_lock:
-                        print(f"✓ 完成扫描: {project.get('name', project.get('path'))}")
+                        with self.log_lock:
+                            print(f"✓ 完成扫描: {project_label}")
 
-                    all_data.append(project_data)
-                except Exception as e:
-                    with self.log_lock:
-                        print(f"✗ 扫描失败: {project.get('name', project.get('path'))} - {str(e)}")
-                    failed_projects.append(project)
+                        all_data.append(project_data)
+                    except Exception as e:
+                        with self.log_lock:
+                            print(f"✗ 扫描失败: {project_label} - {str(e)}")
+                        failed_projects.append(project)
+
+        if cached_count > 0:
+            with self.log_lock:
+                logger.info(f"从缓存加载了 {cached_count}/{len(projects)} 个项目")
 
         # 输出失败的项目
         if failed_projects:
@@ -669,4 +919,5 @@ class GitDataCollector:
         print(f"\n并发扫描完成: 成功 {total_success}/{len(projects)} 个项目")
         print(f"  - 从缓存加载: {total_from_cache} 个")
         print(f"  - 新扫描: {total_from_scan} 个")
+        self._finish_run()
         return all_data
@@ -0,0 +1,120 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+文件热点分析 - 用路径前缀树汇总文件变更次数
+
+每个文件的变更次数（修改该文件的提交数）插入前缀树时沿路径累加到各级目录，
+目录汇总只需一次插入，不必对每个目录前缀重新扫描全部文件。
+项目级的文件变更计数随扫描缓存保存在 scans 表（与 language_stats 并列），
+作者级的计数保存在部分聚合中，报告中的 hotspots 由合并后的计数构建。
+"""
+
+import heapq
+from typing import Dict, List, Any, Iterable, Iterator, Tuple
+
+# 报告中热点文件/目录的条数
+HOTSPOT_LIMIT = 10
+# 目录热点只统计前几层目录
+MAX_DIRECTORY_DEPTH = 3
+
+
+class _Node:
+    __slots__ = ('changes', 'files', 'children')
+
+    def __init__(self):
+        self.changes = 0
+        self.files = 0
+        self.children: Dict[str, '_Node'] = {}
+
+
+class PathTrie:
+    """路径前缀树：每个节点保存子树内的变更次数和文件数"""
+
+    def __init__(self, file_changes: Dict[str, int] = None):
+        self.root = _Node()
+        # 文件路径 -> 变更次数
+        self.file_changes: Dict[str, int] = {}
+        for path, changes in (file_changes or {}).items():
+            self.insert(path, changes)
+
+    def insert(self, path: str, changes: int = 1):
+        new_file = path not in self.file_changes
+        self.file_changes[path] = self.file_changes.get(path, 0) + changes
+        node = self.root
+        node.changes += changes
+        node.files += new_file
+        for part in path.split('/')[:-1]:
+            child = node.children.get(part)
+            if child is None:
+                child = node.children[part] = _Node()
+            child.changes += changes
+            child.files += new_file
+            node = child
+
+    def _directories(self, max_depth: int) -> Iterator[Tuple[str, _Node]]:
+        stack = [('', self.root, 0)]
+        while stack:
+            prefix, node, depth = stack.pop()
+            if depth >= max_depth:
+                continue
+            for name, child in node.children.items():
+                path = f"{prefix}{name}/"
+                yield path, child
+                stack.append((path, child, depth + 1))
+
+    def top_files(self, limit: int = HOTSPOT_LIMIT) -> List[Tuple[str, int]]:
+        """变更次数最多的文件"""
+        return heapq.nlargest(limit, self.file_changes.items(), key=lambda x: (x[1], x[0]))
+
+    def top_directories(self, limit: int = HOTSPOT_LIMIT,
+                        max_depth: int = MAX_DIRECTORY_DEPTH) -> List[Tuple[str, int, int]]:
+        """变更次数最多的目录 [(目录/, 变更次数, 文件数)]"""
+        return [
+            (path, node.changes, node.files)
+            for path, node in heapq.nlargest(
+                limit, self._directories(max_depth), key=lambda x: (x[1].changes, x[0])
+            )
+        ]
+
+    def top_level_churn(self) -> Dict[str, int]:
+        """按顶层目录汇总变更次数，根目录下的文件计入 '/'"""
+        churn = {f"{name}/": child.changes for name, child in self.root.children.items()}
+        root_files = self.root.changes - sum(churn.values())
+        if root_files:
+            churn['/'] = root_files
+        return dict(sorted(churn.items(), key=lambda x: x[1], reverse=True))
+
+
+def count_file_changes(commits: Iterable[Dict[str, Any]]) -> Dict[str, int]:
+    """统计每个文件被多少个提交修改"""
+    file_changes: Dict[str, int] = {}
+    for commit in commits:
+        for path in commit.get('changed_files') or ():
+            file_changes[path] = file_changes.get(path, 0) + 1
+    return file_changes
+
+
+def hotspot_summary(project_files: Dict[str, Dict[str, int]], limit: int = HOTSPOT_LIMIT) -> Dict[str, Any]:
+    """由 {项目: {文件路径: 变更次数}} 生成报告中的热点数据"""
+    files = []
+    directories = []
+    churn = {}
+    for project, file_changes in project_files.items():
+        if not file_changes:
+            continue
+        trie = PathTrie(file_changes)
+        files.extend((changes, path, project) for path, changes in trie.top_files(limit))
+        directories.extend((changes, path, count, project) for path, changes, count in trie.top_directories(limit))
+        churn[project] = dict(list(trie.top_level_churn().items())[:limit])
+
+    return {
+        'files': [
+            {'project': project, 'path': path, 'changes': changes}
+            for changes, path, project in heapq.nlargest(limit, files)
+        ],
+        'directories': [
+            {'project': project, 'path': path, 'changes': changes, 'files': count}
+            for changes, path, count, project in heapq.nlargest(limit, directories)
+        ],
+        'churn_by_directory': churn,
+    }
@@ -130,6 +130,17 @@ class LLMClient:
 
         project_scope = '多点开花' if project_count >= 5 else '深耕细作'
 
+        # 作者间排名（仅在有多位作者时提供）
+        percentiles = data.get('percentiles', {})
+        ranking_line = ''
+        if percentiles.get('authors', 0) > 1:
+            metrics = percentiles['metrics']
+            ranking_line = (
+                f"- 团队排名（共{percentiles['authors']}位作者）: "
+                f"提交次数位列前{metrics['total_commits']['top_percent']}%，"
+                f"新增代码行位列前{metrics['total_additions']['top_percent']}%\n"
+            )
+
         prompt = f"""
 请根据以下代码年度数据，生成一份温暖、富有感染力的年度总结文案。
 
@@ -146,7 +157,7 @@ class LLMClient:
 - 平均每月提交: {summary.get('avg_commits_per_month', 0)}
 - 高效时段: {time_dist.get('best_period', {}).get('hour', '未知')}
 - 重构提交占比: {code_quality.get('refactor_ratio', 0)}%
-
+{ranking_line}
 **输出格式要求：**
 
 必须严格按照以下XML格式输出，每个<graph>标签代表一个独立的指标卡片：
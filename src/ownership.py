@@ -0,0 +1,211 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+代码归属（存活行数）- 基于 git blame 统计 HEAD 中每位作者的代码行数
+
+新增/删除行数只反映写了多少代码，存活行数反映其中还有多少留在当前版本里。
+对大仓库逐文件 blame 开销很大，因此：
+1. 结果按文件内容的 blob SHA 缓存在提交存储中（blame_cache 表），未变化的文件永不重复 blame；
+2. 未命中缓存的文件在进程池中并发 blame（解析 porcelain 输出是CPU密集的）；
+3. 整个阶段受时间预算约束，超时后取消剩余任务，已完成的结果照常写入缓存，
+   下次运行从缓存继续，结果标记为不完整（complete: false）。
+"""
+
+import re
+import subprocess
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed, TimeoutError as FuturesTimeout
+from typing import Dict, List, Any, Callable, Optional, Tuple
+
+from logger_config import get_logger
+
+logger = get_logger(__name__)
+
+# 默认时间预算（秒）、并发进程数和单文件大小上限（字节）
+DEFAULT_TIME_BUDGET = 300
+DEFAULT_WORKERS = 4
+DEFAULT_MAX_FILE_SIZE = 1024 * 1024
+# 与 git 相同的二进制判断：前 8000 字节内含 NUL
+_BINARY_PROBE_BYTES = 8000
+
+# porcelain 输出中每组连续行的头部: <sha> <原行号> <当前行号> <本组行数>
+_GROUP_RE = re.compile(r'^([0-9a-f]{40}) \d+ \d+ (\d+)$', re.M)
+# 提交首次出现时头部后紧跟作者信息
+_AUTHOR_RE = re.compile(r'^([0-9a-f]{40}) \d+ \d+ \d+\nauthor (.*)\nauthor-mail <?(.*?)>?$', re.M)
+
+
+def parse_porcelain(output: str) -> List[List[Any]]:
+    """解析 git blame --porcelain 的输出
+
+    Returns:
+        [[name, email, 行数], ...]
+    """
+    commit_lines: Dict[str, int] = {}
+    for sha, count in _GROUP_RE.findall(output):
+        commit_lines[sha] = commit_lines.get(sha, 0) + int(count)
+
+    author_lines: Dict[Tuple[str, str], int] = {}
+    for sha, name, email in _AUTHOR_RE.findall(output):
+        identity = (name, email)
+        author_lines[identity] = author_lines.get(identity, 0) + commit_lines.get(sha, 0)
+    return [[name, email, lines] for (name, email), lines in author_lines.items()]
+
+
+def _blame_blob(repo_path: str, rev: str, path: str, blob: str,
+                deadline: float) -> Tuple[str, Optional[List[List[Any]]]]:
+    """在子进程中 blame 一个文件；预算耗尽时返回 (blob, None)"""
+    timeout = deadline - time.time()
+    if timeout <= 0:
+        return blob, None
+    content = subprocess.run(
+        ['git', '-C', repo_path, 'cat-file', 'blob', blob],
+        capture_output=True, timeout=timeout, check=True,
+    ).stdout
+    if b'\0' in content[:_BINARY_PROBE_BYTES]:
+        return blob, []
+    output = subprocess.run(
+        ['git', '-C', repo_path, 'blame', '--porcelain', rev, '--', path],
+        capture_output=True, timeout=max(deadline - time.time(), 0.001), check=True,
+    ).stdout
+    return blob, parse_porcelain(output.decode('utf-8', errors='replace'))
+
+
+def list_blobs(repo_path: str, rev: str = 'HEAD',
+               max_file_size: int = DEFAULT_MAX_FILE_SIZE) -> List[Tuple[str, str]]:
+    """列出版本中的普通文件 [(blob SHA, 路径)]，跳过符号链接、子模块和超过大小上限的文件"""
+    output = subprocess.run(
+        ['git', '-C', repo_path, 'ls-tree', '-r', '-l', '-z', rev],
+        capture_output=True, check=True,
+    ).stdout.decode('utf-8', errors='replace')
+    blobs = []
+    for entry in output.split('\0'):
+        if not entry:
+            continue
+        meta, path = entry.split('\t', 1)
+        mode, kind, blob, size = meta.split()
+        if kind != 'blob' or mode == '120000' or int(size) > max_file_size:
+            continue
+        blobs.append((blob, path))
+    return blobs
+
+
+def repo_ownership(repo_path: str, store, rev: str = 'HEAD',
+                   workers: int = DEFAULT_WORKERS,
+                   time_budget: float = DEFAULT_TIME_BUDGET,
+                   max_file_size: int = DEFAULT_MAX_FILE_SIZE) -> Dict[str, Any]:
+    """统计一个仓库指定版本中每位作者的存活行数
+
+    Args:
+        repo_path: 仓库路径
+        store: CommitStore 实例（blame 结果按 blob SHA 缓存）
+        rev: 版本，默认 HEAD
+        workers: blame 进程数
+        time_budget: 时间预算（秒）
+        max_file_size: 超过该大小（字节）的文件不参与统计
+
+    Returns:
+        {'authors': {(name, email): 行数}, 'total_lines', 'total_files', 'blamed_files', 'complete'}
+    """
+    deadline = time.time() + time_budget
+    files = list_blobs(repo_path, rev, max_file_size)
+    # 同一内容出现在多个路径时只 blame 一次
+    first_path = {}
+    for blob, path in files:
+        first_path.setdefault(blob, path)
+
+    blames = store.get_blame(first_path)
+    pending = [(blob, path) for blob, path in first_path.items() if blob not in blames]
+    complete = True
+    if pending:
+        logger.info(f"  blame {len(pending)} 个文件（缓存命中 {len(blames)} 个）: {repo_path}")
+        new_blames = {}
+        executor = ProcessPoolExecutor(max_workers=workers)
+        futures = []
+        try:
+            for blob, path in pending:
+                futures.append(executor.submit(_blame_blob, repo_path, rev, path, blob, deadline))
+            for future in as_completed(futures, timeout=max(deadline - time.time(), 0)):
+                try:
+                    blob, authors = future.result()
+                except Exception as e:
+                    logger.debug(f"  blame 失败: {e}")
+                    complete = False
+                    continue
+                if authors is None:
+                    complete = False
+                else:
+                    new_blames[blob] = authors
+        except FuturesTimeout:
+            complete = False
+            logger.warning(f"  blame 超出时间预算 {time_budget:.1f}s，已完成 {len(new_blames)}/{len(pending)} 个文件，"
+                           f"其余文件下次运行继续: {repo_path}")
+        finally:
+            # 取消尚未开始的任务（shutdown 的 cancel_futures 参数需要 Python 3.9）
+            for future in futures:
+                future.cancel()
+            executor.shutdown(wait=False)
+            store.save_blame(new_blames)
+        blames.update(new_blames)
+
+    authors: Dict[Tuple[str, str], int] = {}
+    total_lines = 0
+    blamed_files = 0
+    for blob, _ in files:
+        file_authors = blames.get(blob)
+        if file_authors is None:
+            continue
+        blamed_files += 1
+        for name, email, lines in file_authors:
+            authors[(name, email)] = authors.get((name, email), 0) + lines
+            total_lines += lines
+
+    return {
+        'authors': authors,
+        'total_lines': total_lines,
+        'total_files': len(files),
+        'blamed_files': blamed_files,
+        'complete': complete,
+    }
+
+
+def author_ownership(repo_results: Dict[str, Dict[str, Any]],
+                     key: Callable[[Tuple[str, str]], Optional[str]]) -> Dict[str, Dict[str, Any]]:
+    """按规范作者汇总各项目的存活行数
+
+    Args:
+        repo_results: {项目名: repo_ownership 的结果}
+        key: 由作者身份得到规范作者ID的函数，返回 None 的身份不参与
+
+    Returns:
+        {作者ID: {'surviving_lines', 'share', 'projects': [{'name', 'lines', 'share'}], 'complete'}}
+    """
+    complete = all(result['complete'] for result in repo_results.values())
+    project_lines: Dict[str, Dict[str, int]] = {}
+    for project, result in repo_results.items():
+        for identity, lines in result['authors'].items():
+            author = key(identity)
+            if author is None:
+                continue
+            lines_by_project = project_lines.setdefault(author, {})
+            lines_by_project[project] = lines_by_project.get(project, 0) + lines
+
+    ownership = {}
+    for author, lines_by_project in project_lines.items():
+        projects = [
+            {
+                'name': project,
+                'lines': lines,
+                'share': round(lines / repo_results[project]['total_lines'] * 100, 1),
+            }
+            for project, lines in sorted(lines_by_project.items(), key=lambda x: x[1], reverse=True)
+        ]
+        surviving = sum(lines_by_project.values())
+        # 占比以作者有存活代码的项目的总行数为分母
+        total = sum(repo_results[project]['total_lines'] for project in lines_by_project)
+        ownership[author] = {
+            'surviving_lines': surviving,
+            'share': round(surviving / total * 100, 1) if total else 0,
+            'projects': projects,
+            'complete': complete,
+        }
+    return ownership
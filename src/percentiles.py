@@ -0,0 +1,114 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+作者间百分位排名 - 报告分析完成后的汇总阶段
+
+所有作者的分析结果算完后，对主要指标一次性计算每位作者的百分位排名和全体分布分位数，
+写入各自的报告和 report_index.json，不需要重新读取报告文件。
+安装了 NumPy 时按指标矩阵向量化计算，否则用排序 + 二分查找，结果一致。
+
+排名口径（n 为作者数）：
+- percentile: 指标不高于自己的作者占比（超过了多少同事）
+- top_percent: 指标不低于自己的作者占比（"位列前 x%"）
+- rank: 严格高于自己的作者数 + 1
+"""
+
+from bisect import bisect_left, bisect_right
+from typing import Dict, Any, List, Tuple
+
+from histogram_backend import HAS_NUMPY
+
+if HAS_NUMPY:
+    import numpy as np
+
+# 参与排名的指标: 名称 -> 从分析结果取值的函数
+PERCENTILE_METRICS = {
+    'total_commits': lambda data: data['summary']['total_commits'],
+    'total_additions': lambda data: data['summary']['total_additions'],
+    'net_lines': lambda data: data['summary']['net_lines'],
+    'files_changed': lambda data: data['summary']['files_changed'],
+    'projects': lambda data: len(data['projects']),
+    'refactor_ratio': lambda data: data['code_quality']['refactor_ratio'],
+}
+
+# 全体分布的分位点
+QUANTILES = (25, 50, 75, 90)
+
+
+def _quantile(sorted_values: List[float], q: float) -> float:
+    """线性插值分位数（与 numpy.percentile 默认方法一致）"""
+    position = (len(sorted_values) - 1) * q / 100
+    lower = int(position)
+    upper = min(lower + 1, len(sorted_values) - 1)
+    return sorted_values[lower] + (sorted_values[upper] - sorted_values[lower]) * (position - lower)
+
+
+def _rank_python(values: List[List[float]]) -> Tuple[List[List[int]], List[List[int]], List[List[float]]]:
+    """每个指标: (不高于自己的人数, 严格低于自己的人数, 分位数)"""
+    not_above, below, quantiles = [], [], []
+    for row in values:
+        ordered = sorted(row)
+        not_above.append([bisect_right(ordered, v) for v in row])
+        below.append([bisect_left(ordered, v) for v in row])
+        quantiles.append([_quantile(ordered, q) for q in QUANTILES])
+    return not_above, below, quantiles
+
+
+def _rank_numpy(values: List[List[float]]) -> Tuple[List[List[int]], List[List[int]], List[List[float]]]:
+    matrix = np.asarray(values, dtype=np.float64)
+    ordered = np.sort(matrix, axis=1)
+    not_above = [np.searchsorted(o, row, side='right').tolist() for o, row in zip(ordered, matrix)]
+    below = [np.searchsorted(o, row, side='left').tolist() for o, row in zip(ordered, matrix)]
+    quantiles = np.percentile(ordered, QUANTILES, axis=1).T.tolist()
+    return not_above, below, quantiles
+
+
+def author_percentiles(analyses: Dict[str, Dict[str, Any]],
+                       backend: str = 'python') -> Dict[str, Dict[str, Any]]:
+    """计算每位作者在主要指标上的百分位排名
+
+    Args:
+        analyses: {作者ID: DataAnalyzer 的分析结果}
+        backend: numpy / python（见 histogram_backend.resolve_backend）
+
+    Returns:
+        {作者ID: {'authors': 作者数, 'metrics': {指标: {value, rank, percentile, top_percent, distribution}}}}
+    """
+    authors = list(analyses)
+    n = len(authors)
+    if not n:
+        return {}
+
+    metrics = list(PERCENTILE_METRICS)
+    values = [[PERCENTILE_METRICS[metric](analyses[author]) for author in authors] for metric in metrics]
+    rank = _rank_numpy if backend == 'numpy' and HAS_NUMPY else _rank_python
+    not_above, below, quantiles = rank(values)
+
+    distributions = {}
+    for m, metric in enumerate(metrics):
+        distribution = {f'p{q}': round(value, 1) for q, value in zip(QUANTILES, quantiles[m])}
+        distribution['max'] = max(values[m])
+        distribution['mean'] = round(sum(values[m]) / n, 1)
+        distributions[metric] = distribution
+
+    result = {}
+    for i, author in enumerate(authors):
+        result[author] = {
+            'authors': n,
+            'metrics': {
+                metric: {
+                    'value': values[m][i],
+                    'rank': n - not_above[m][i] + 1,
+                    'percentile': round(not_above[m][i] / n * 100, 1),
+                    'top_percent': round((n - below[m][i]) / n * 100, 1),
+                    'distribution': distributions[metric],
+                }
+                for m, metric in enumerate(metrics)
+            },
+        }
+    return result
+
+
+def index_percentiles(percentiles: Dict[str, Any]) -> Dict[str, float]:
+    """report_index.json 中的精简形式: {指标: top_percent}"""
+    return {metric: item['top_percent'] for metric, item in percentiles.get('metrics', {}).items()}
@@ -12,12 +12,23 @@ from typing import Dict, List, Callable
 
 from git_collector import GitDataCollector
 from data_analyzer import DataAnalyzer
+from aggregates import CommitAggregate, AGGREGATE_VERSION
+from author_identity import AuthorIndex, cluster_author_mapping
 from llm_client import LLMClient
 from config_loader import ConfigLoader
 from logger_config import get_logger
+from file_utils import atomic_write_json
+from team_rollup import generate_team_reports
+from percentiles import author_percentiles, index_percentiles
+from collaboration import collaboration_graph
+from trends import author_trends, load_history
+from ownership import author_ownership
 
 logger = get_logger(__name__)
 
+# 续跑检查点格式版本（v2 起保存部分聚合而不是提交列表）
+CHECKPOINT_VERSION = 5
+
 
 class ReportGenerator:
     """报告生成器"""
@@ -50,7 +61,7 @@ class ReportGenerator:
             except Exception as e:
                 logger.warning(f"清理进度文件失败: {e}")
 
-    def _check_resume_progress(self):
+    def _check_resume_progress(self, period_label: str = None):
         """检查是否有续跑检查点"""
         checkpoint_file = self.output_dir / '.resume_checkpoint.json'
         if checkpoint_file.exists():
@@ -58,6 +69,18 @@ class ReportGenerator:
                 with open(checkpoint_file, 'r', encoding='utf-8') as f:
                     checkpoint_data = json.load(f)
 
+                if (checkpoint_data.get('version') != CHECKPOINT_VERSION
+                        or checkpoint_data.get('aggregate_version') != AGGREGATE_VERSION):
+                    # 旧格式的检查点（或其中的部分聚合版本过期）无法续跑，重新采集
+                    checkpoint_file.unlink()
+                    logger.info("检查点格式已过期，清理检查点文件")
+                    return None
+                if checkpoint_data.get('period') != period_label:
+                    # 报告时间范围已修改，检查点中的数据不再适用
+                    checkpoint_file.unlink()
+                    logger.info("报告时间范围已变化，清理检查点文件")
+                    return None
+
                 # 检查是否有对应的进度文件
                 if self.progress_file.exists():
                     with open(self.progress_file, 'r', encoding='utf-8') as f:
@@ -86,11 +109,22 @@ class ReportGenerator:
                     pass
         return None
 
-    def _save_resume_checkpoint(self, author_data_map, total, report_index=None):
+    def _save_resume_checkpoint(self, author_data_map, total, period_label, report_index=None,
+                                collaborators=None, history=None, ownership=None):
         """保存Git采集后的检查点"""
         checkpoint_file = self.output_dir / '.resume_checkpoint.json'
         checkpoint_data = {
-            'author_data_map': author_data_map,
+            'version': CHECKPOINT_VERSION,
+            'aggregate_version': AGGREGATE_VERSION,
+            'period': period_label,
+            'author_data_map': {
+                author: [{**entry, 'aggregate': entry['aggregate'].to_dict()} for entry in author_projects]
+                for author, author_projects in author_data_map.items()
+            },
+            # 协作关系需要逐提交的文件列表，续跑时不再有原始提交，随检查点保存
+            'collaborators': collaborators or {},
+            'history': history or {},
+            'ownership': ownership or {},
             'total': total,
             'timestamp': datetime.now().isoformat()
         }
@@ -98,8 +132,7 @@ class ReportGenerator:
         if report_index:
             checkpoint_data['report_index'] = report_index
         try:
-            with open(checkpoint_file, 'w', encoding='utf-8') as f:
-                json.dump(checkpoint_data, f, ensure_ascii=False, indent=2)
+            atomic_write_json(checkpoint_file, checkpoint_data)
             logger.info(f"已保存续跑检查点，共 {total} 位作者")
         except Exception as e:
             logger.warning(f"保存检查点失败: {e}")
@@ -136,9 +169,7 @@ class ReportGenerator:
 
     def save_progress(self, data: dict):
         """保存进度"""
-        self.output_dir.mkdir(parents=True, exist_ok=True)
-        with open(self.progress_file, 'w', encoding='utf-8') as f:
-            json.dump(data, f, ensure_ascii=False, indent=2)
+        atomic_write_json(self.progress_file, data)
 
     def generate_all(self, progress_callback: Callable = None) -> bool:
         """生成所有报告 - 支持智能续跑"""
@@ -149,26 +180,35 @@ class ReportGenerator:
             return False
 
         author_mapping = self.load_author_mapping()
+        analyzer = DataAnalyzer(config)
 
         # 检查是否有续跑进度
-        resume_data = self._check_resume_progress()
+        resume_data = self._check_resume_progress(analyzer.period.label)
         start_index = 1  # 默认从头开始
 
         if resume_data:
             # 续跑模式：跳过Git采集，直接使用已有数据
             completed = int(resume_data.get('completed', 0))
             logger.info(f"检测到续跑进度，将从第 {completed + 1} 个作者继续生成LLM分析")
-            author_data_map = resume_data['author_data_map']
+            author_data_map = {
+                author: [{**entry, 'aggregate': CommitAggregate.from_dict(entry['aggregate'])}
+                         for entry in author_projects]
+                for author, author_projects in resume_data['author_data_map'].items()
+            }
+            collaborators = resume_data.get('collaborators', {})
+            # JSON 的键为字符串，恢复为年份
+            history = {int(year): snapshots for year, snapshots in resume_data.get('history', {}).items()}
+            ownership = resume_data.get('ownership', {})
             total = int(resume_data.get('total', 0))
             start_index = completed + 1
         else:
             # 正常模式：完整的Git采集流程
             collector_config = config.copy()
             collector_config['authors'] = []
+            collector_config['report_year'] = analyzer.report_year
             collector = GitDataCollector(collector_config)
 
             all_data = []
-            all_authors = set()
 
             logger.info("开始扫描Git仓库...")
 
@@ -176,7 +216,13 @@ class ReportGenerator:
             projects = config.get('projects', [])
             max_workers = config.get('max_workers', 4)
 
-            if len(projects) > 1 and max_workers > 1:
+            period = analyzer.period
+            if not period.is_full_year:
+                # 季度/任意范围：确保覆盖年份已扫描（通常命中缓存），再按范围查询提交存储并聚合
+                logger.info(f"报告时间范围: {period.since} ~ {period.until}（不含），覆盖年份 {period.years}")
+                collector.collect_years(period.years)
+                all_data = analyzer.load_projects(collector.store, repos=collector.project_keys(), partials=True)
+            elif len(projects) > 1 and max_workers > 1:
                 # 使用并发模式
                 logger.info(f"使用并发扫描模式（并发数: {max_workers}）")
                 all_data = collector.collect_all_parallel()
@@ -191,55 +237,51 @@ class ReportGenerator:
                     except Exception as e:
                         logger.error(f"扫描项目失败: {str(e)}")
 
-            # 收集所有作者
-            for project_data in all_data:
-                for commit in project_data.get('commits', []):
-                    author_info = f"{commit['author']} <{commit['email']}>"
-                    all_authors.add(author_info)
-
             if not all_data:
                 logger.error("未采集到任何数据")
                 return False
 
-            logger.info(f"Git扫描完成，发现 {len(all_authors)} 位作者")
+            # 身份聚类（可选）：生成建议映射，apply 时与手工映射合并
+            author_mapping = cluster_author_mapping(
+                all_data, author_mapping, lambda author_info: self.apply_author_mapping(author_info, author_mapping),
+                config.get('identity_clustering', {}), self.mapping_path.parent
+            )
 
-            # 分组数据
-            mapped_authors = {}
-            for author_info in all_authors:
-                mapped_author = self.apply_author_mapping(author_info, author_mapping)
-                if mapped_author not in mapped_authors:
-                    mapped_authors[mapped_author] = []
-                mapped_authors[mapped_author].append(author_info)
+            # 一次遍历建立作者身份倒排索引（每个身份只做一次作者映射）
+            author_index = AuthorIndex(
+                all_data, lambda author_info: self.apply_author_mapping(author_info, author_mapping)
+            )
+            logger.info(f"Git扫描完成，发现 {author_index.identity_count} 位作者")
 
+            # 分组数据：按索引合并该作者所有身份的部分聚合
             author_data_map = {}
-            for mapped_author, original_authors in mapped_authors.items():
-                author_name = mapped_author.split('<')[0].strip()
-                author_projects = []
-                for project_data in all_data:
-                    author_commits = []
-                    for original_author in original_authors:
-                        orig_name = original_author.split('<')[0].strip()
-                        orig_email = original_author.split('<')[1].replace('>', '').strip() if '<' in original_author else ''
-                        commits = [c for c in project_data.get('commits', []) if c['author'] == orig_name and c['email'] == orig_email]
-                        author_commits.extend(commits)
-                    if author_commits:
-                        author_projects.append({
-                            'project_name': project_data['project_name'],
-                            'path': project_data['path'],
-                            'commits': author_commits,
-                            'total_commits': len(author_commits),
-                            'language_stats': project_data.get('language_stats', {}),  # 添加语言统计
-                        })
+            for mapped_author, positions in author_index.positions.items():
+                author_projects = analyzer.author_projects(
+                    all_data, author_index.aliases[mapped_author], positions
+                )
                 if author_projects:
                     author_data_map[mapped_author] = author_projects
 
+            # 作者协作关系（按映射后的作者ID归并各身份）
+            collaborators = collaboration_graph(all_data, key=author_index.commit_key)
+
+            # 往年快照（只读提交存储中缓存的部分聚合，不访问Git）
+            trend_years = config.get('analysis', {}).get('trend_years', 0)
+            history = load_history(collector, analyzer, trend_years, key=author_index.key) if trend_years else {}
+
+            # 代码归属（可选，git blame 结果按 blob SHA 缓存）
+            ownership = {}
+            if config.get('ownership', {}).get('enabled'):
+                logger.info("统计代码归属（存活行数）...")
+                ownership = author_ownership(collector.collect_ownership(), key=author_index.key)
+
             # 保存中间数据供续跑使用（仅在非续跑模式）
             if not resume_data:
-                self._save_resume_checkpoint(author_data_map, len(author_data_map))
+                self._save_resume_checkpoint(author_data_map, len(author_data_map), analyzer.period.label,
+                                             collaborators=collaborators, history=history, ownership=ownership)
                 logger.info(f"数据采集完成，共 {len(author_data_map)} 位作者，准备生成LLM分析...")
 
         # 生成报告（从start_index开始，支持续跑）
-        analyzer = DataAnalyzer(config)
         self.output_dir.mkdir(parents=True, exist_ok=True)
         report_index = {}
 
@@ -265,15 +307,30 @@ class ReportGenerator:
             except Exception as e:
                 logger.warning(f"LLM客户端初始化失败: {e}，将使用默认模板")
 
+        # 先分析全部作者（合并部分聚合，开销很小），再计算作者间百分位排名；
+        # 续跑时同样基于全部作者重新计算，排名与首次运行一致
+        analyses = {
+            author_info: analyzer.analyze_partials(author_projects)
+            for author_info, author_projects in author_data_map.items()
+        }
+        percentiles = author_percentiles(analyses, analyzer.backend)
+        trends = author_trends(analyzer.report_year, analyses, history)
+        for author_info, analyzed_data in analyses.items():
+            analyzed_data['percentiles'] = percentiles[author_info]
+            analyzed_data['collaborators'] = collaborators.get(author_info, [])
+            analyzed_data['trends'] = trends[author_info]
+            if ownership:
+                analyzed_data['ownership'] = ownership.get(author_info)
+
         # 转换为列表并切片（从start_index开始）
         author_items = list(author_data_map.items())
         for idx in range(start_index - 1, len(author_items)):
-            author_info, author_projects = author_items[idx]
+            author_info = author_items[idx][0]
             author_name = author_info.split('<')[0].strip()
             current_idx = idx + 1
             logger.info(f"[{current_idx}/{total}] 生成报告: {author_name}")
 
-            analyzed_data = analyzer.analyze(author_projects)
+            analyzed_data = analyses[author_info]
 
             # 生成AI文案
             ai_text = None
@@ -291,13 +348,14 @@ class ReportGenerator:
 
             # 构建报告
             safe_name = "".join(c if c.isalnum() or c in ('-', '_') else '_' for c in author_name)
-            json_filename = f"{safe_name}_{config.get('report_year', 2025)}.json"
+            json_filename = f"{safe_name}_{analyzer.period.label}.json"
 
             report_data = {
                 'meta': {
                     'author': author_name,
                     'author_id': author_info,
-                    'year': config.get('report_year', 2025),
+                    'year': analyzer.report_year,
+                    'period': analyzer.period.label,
                     'generated_at': datetime.now().isoformat(),
                     'json_file': json_filename,
                 },
@@ -316,6 +374,7 @@ class ReportGenerator:
                 'commits': report_data['summary']['total_commits'],
                 'net_lines': report_data['summary']['net_lines'],
                 'projects': len(report_data['projects']),
+                'percentiles': index_percentiles(analyzed_data['percentiles']),
             }
 
             # 每生成一个报告就更新进度文件（支持前端实时检测）
@@ -331,15 +390,22 @@ class ReportGenerator:
             self.save_progress(progress_data)
 
             # 同时更新续跑检查点，保存已生成的报告索引
-            self._save_resume_checkpoint(author_data_map, total, report_index)
+            self._save_resume_checkpoint(author_data_map, total, analyzer.period.label, report_index,
+                                         collaborators, history, ownership)
 
             # 调用回调函数
             if progress_callback:
                 progress_callback(progress_data)
 
         # 保存索引
-        with open(self.output_dir / 'report_index.json', 'w', encoding='utf-8') as f:
-            json.dump(report_index, f, ensure_ascii=False, indent=2)
+        atomic_write_json(self.output_dir / 'report_index.json', report_index)
+
+        # 团队/组织汇总报告（合并已计算的作者部分聚合）
+        try:
+            team_index = generate_team_reports(config, author_data_map, analyzer, self.output_dir)
+            logger.info(f"团队汇总完成: {len(team_index)} 个团队报告")
+        except Exception as e:
+            logger.warning(f"生成团队汇总报告失败: {e}")
 
         # 任务完成，清理检查点文件
         checkpoint_file = self.output_dir / '.resume_checkpoint.json'
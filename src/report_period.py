@@ -0,0 +1,145 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+报告时间范围 - 半开区间 [since, until)
+
+扫描缓存仍以 (项目, 年份) 为单位；季度、月份或任意日期范围的报告
+先确保覆盖的年份已扫描（通常已在缓存中），再按范围查询提交存储并聚合，不需要重新扫描Git。
+
+report_period 配置支持：
+- 2025                       整年（与只配置 report_year 相同）
+- 2025-Q3                    季度
+- 2025-07                    月份
+- 2025-07-01..2025-10-01     任意范围（结束日期不包含）
+- {since: 2025-07-01, until: 2025-10-01}
+"""
+
+import re
+from datetime import date, datetime, timedelta
+from typing import Any, Dict, Iterator, List
+
+_QUARTER_RE = re.compile(r'^(\d{4})-?Q([1-4])$', re.I)
+_MONTH_RE = re.compile(r'^(\d{4})-(\d{1,2})$')
+_YEAR_RE = re.compile(r'^(\d{4})$')
+_EPOCH_DATE = date(1970, 1, 1)
+
+
+def _to_date(value: Any) -> date:
+    if isinstance(value, datetime):
+        return value.date()
+    if isinstance(value, date):
+        return value
+    return date.fromisoformat(str(value).strip())
+
+
+def _wall_clock_seconds(day: date) -> int:
+    return (day - _EPOCH_DATE).days * 86400
+
+
+def _add_months(day: date, months: int) -> date:
+    month = day.month - 1 + months
+    return date(day.year + month // 12, month % 12 + 1, 1)
+
+
+def _shift_year(day: date, years: int) -> date:
+    try:
+        return day.replace(year=day.year + years)
+    except ValueError:
+        # 2月29日 -> 2月28日
+        return day.replace(year=day.year + years, day=28)
+
+
+class ReportPeriod:
+    """报告时间范围 [since, until)，按日期划分"""
+
+    __slots__ = ('since', 'until')
+
+    def __init__(self, since: date, until: date):
+        if until <= since:
+            raise ValueError(f"报告时间范围无效: {since} ~ {until}（结束日期不包含，需晚于开始日期）")
+        self.since = since
+        self.until = until
+
+    @classmethod
+    def year(cls, year: int) -> 'ReportPeriod':
+        return cls(date(year, 1, 1), date(year + 1, 1, 1))
+
+    @classmethod
+    def parse(cls, value: Any) -> 'ReportPeriod':
+        """解析 report_period 配置"""
+        if isinstance(value, dict):
+            return cls(_to_date(value['since']), _to_date(value['until']))
+        if isinstance(value, int):
+            return cls.year(value)
+
+        text = str(value).strip()
+        if '..' in text:
+            since, until = text.split('..', 1)
+            return cls(_to_date(since), _to_date(until))
+        match = _YEAR_RE.match(text)
+        if match:
+            return cls.year(int(match.group(1)))
+        match = _QUARTER_RE.match(text)
+        if match:
+            since = date(int(match.group(1)), (int(match.group(2)) - 1) * 3 + 1, 1)
+            return cls(since, _add_months(since, 3))
+        match = _MONTH_RE.match(text)
+        if match:
+            since = date(int(match.group(1)), int(match.group(2)), 1)
+            return cls(since, _add_months(since, 1))
+        raise ValueError(f"无法解析的报告时间范围: {value}（示例: 2025、2025-Q3、2025-07、2025-07-01..2025-10-01）")
+
+    @classmethod
+    def from_config(cls, config: Dict[str, Any]) -> 'ReportPeriod':
+        """配置了 report_period 时使用它，否则为 report_year 整年"""
+        if config.get('report_period'):
+            return cls.parse(config['report_period'])
+        return cls.year(config.get('report_year', 2024))
+
+    @property
+    def is_full_year(self) -> bool:
+        return self.since == date(self.since.year, 1, 1) and self.until == date(self.since.year + 1, 1, 1)
+
+    @property
+    def years(self) -> List[int]:
+        """范围覆盖的年份（扫描缓存的单位）"""
+        return list(range(self.since.year, (self.until - timedelta(days=1)).year + 1))
+
+    @property
+    def since_ts(self) -> int:
+        """开始日期零点的墙钟秒数，与提交的 author_ts + tz_offset（aggregates.local_seconds）同一口径，
+        即按作者本地日期划分范围，与热力图等按作者本地时间计算的日期一致"""
+        return _wall_clock_seconds(self.since)
+
+    @property
+    def until_ts(self) -> int:
+        return _wall_clock_seconds(self.until)
+
+    @property
+    def label(self) -> str:
+        """用于文件名和展示: 2025 / 2025-Q3 / 2025-07 / 2025-07-01_2025-09-30（含结束日）"""
+        if self.is_full_year:
+            return str(self.since.year)
+        if self.since.day == 1:
+            if self.until == _add_months(self.since, 3) and self.since.month % 3 == 1:
+                return f"{self.since.year}-Q{self.since.month // 3 + 1}"
+            if self.until == _add_months(self.since, 1):
+                return f"{self.since.year}-{self.since.month:02d}"
+        return f"{self.since.isoformat()}_{(self.until - timedelta(days=1)).isoformat()}"
+
+    def days(self) -> Iterator[date]:
+        """范围内的每一天"""
+        day = self.since
+        while day < self.until:
+            yield day
+            day += timedelta(days=1)
+
+    def shift_years(self, years: int) -> 'ReportPeriod':
+        """平移若干年的同一时间段（用于同比）"""
+        return ReportPeriod(_shift_year(self.since, years), _shift_year(self.until, years))
+
+    def to_dict(self) -> Dict[str, str]:
+        return {'since': self.since.isoformat(), 'until': self.until.isoformat(), 'label': self.label}
+
+    def __repr__(self) -> str:
+        return f"ReportPeriod({self.since.isoformat()}, {self.until.isoformat()})"
@@ -213,6 +213,18 @@ class ReportHTTPRequestHandler(SimpleHTTPRequestHandler):
             self.send_author_data(author_id)
             return
 
+        # API：获取团队列表
+        if path == '/api/teams':
+            self.send_teams_api()
+            return
+
+        # API：获取团队/组织汇总报告
+        if path.startswith('/api/team/'):
+            from urllib.parse import unquote
+            team_id = unquote(path.split('/')[-1])
+            self.send_team_data(team_id)
+            return
+
         # API：获取生成进度
         if path == '/api/progress':
             self.send_progress_api()
@@ -562,6 +574,43 @@ class ReportHTTPRequestHandler(SimpleHTTPRequestHandler):
 
         self.send_json_response(report_data)
 
+    def _load_team_index(self) -> dict:
+        """读取团队报告索引"""
+        index_file = Path(self.directory) / 'teams' / 'index.json'
+        if not index_file.exists():
+            return {}
+        try:
+            with open(index_file, 'r', encoding='utf-8') as f:
+                return json.load(f)
+        except Exception as e:
+            logger.error(f"读取团队索引失败: {e}")
+            return {}
+
+    def send_teams_api(self):
+        """发送团队列表API"""
+        team_index = self._load_team_index()
+        teams = [
+            {**info, 'api_url': f"/api/team/{team_id}"}
+            for team_id, info in team_index.items()
+        ]
+        self.send_json_response({'total': len(teams), 'teams': teams})
+
+    def send_team_data(self, team_id):
+        """发送团队/组织汇总报告（id为org时为全组织报告）"""
+        team_info = self._load_team_index().get(team_id)
+        if not team_info:
+            self.send_error(404, "Team not found")
+            return
+
+        json_path = Path(self.directory) / 'teams' / team_info['json_file']
+        if not json_path.exists():
+            self.send_error(404, "JSON file not found")
+            return
+
+        with open(json_path, 'r', encoding='utf-8') as f:
+            team_data = json.load(f)
+        self.send_json_response(team_data)
+
     def _load_chunked_report(self, report_data: dict, reports_dir: Path) -> dict:
         """加载分片报告的完整数据
 
@@ -584,16 +633,17 @@ class ReportHTTPRequestHandler(SimpleHTTPRequestHandler):
                 # 如果有多个分片
                 if 'commits_chunks' in project:
                     chunks = project['commits_chunks']
-                    all_commits = []
+                    all_records = []
 
                     for chunk_file in chunks:
                         chunk_path = reports_dir / chunk_file
                         if chunk_path.exists():
                             with open(chunk_path, 'r', encoding='utf-8') as f:
                                 chunk_data = json.load(f)
-                                all_commits.extend(chunk_data.get('commits', []))
+                                all_records.extend(chunk_data.get('commit_records', []))
 
-                    project['commits'] = all_commits
+                    # 分片中是提交明细；project['commits'] 是提交次数，不能覆盖
+                    project['commit_records'] = all_records
                     # 保留分片信息，方便前端了解
                     project['loaded_from_chunks'] = True
 
@@ -605,7 +655,7 @@ class ReportHTTPRequestHandler(SimpleHTTPRequestHandler):
                     if chunk_path.exists():
                         with open(chunk_path, 'r', encoding='utf-8') as f:
                             chunk_data = json.load(f)
-                            project['commits'] = chunk_data.get('commits', [])
+                            project['commit_records'] = chunk_data.get('commit_records', [])
                             project['loaded_from_chunk'] = True
 
             return report_data
@@ -1485,6 +1535,8 @@ def start_server(port: int = 8000, reports_dir: str = './reports'):
     logger.info("API端点:")
     logger.info("  GET /api/authors - 获取作者列表")
     logger.info("  GET /api/author/<id> - 获取特定作者数据")
+    logger.info("  GET /api/teams - 获取团队列表")
+    logger.info("  GET /api/team/<id> - 获取团队汇总报告（org为全组织）")
     logger.info("  GET /api/progress - 获取生成进度")
     logger.info("  POST /api/generate - 生成报告数据")
     logger.info("  GET /report/<id> - 查看个人报告页面")
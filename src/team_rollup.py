@@ -0,0 +1,159 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+团队/组织汇总报告 - 由已计算的作者部分聚合合并生成，不重新分析提交
+
+团队成员在 config.yaml 的 teams 中配置，成员可写作者名、邮箱或 "Name <email>"，
+匹配方式与 author_mapping 相同（作用于映射后的作者）。
+输出到 reports/teams/：每个团队一个 JSON，另有全组织报告（id 为 org）和索引 index.json。
+"""
+
+from datetime import datetime
+from pathlib import Path
+from typing import Dict, List, Any
+
+from aggregates import CommitAggregate
+from data_analyzer import DataAnalyzer
+from file_utils import atomic_write_json
+from logger_config import get_logger
+
+logger = get_logger(__name__)
+
+ORG_TEAM_ID = 'org'
+TOP_CONTRIBUTORS = 10
+
+
+def _split_author(author_info: str):
+    name = author_info.split('<')[0].strip()
+    email = author_info.split('<')[1].replace('>', '').strip() if '<' in author_info else ''
+    return name, email
+
+
+def match_members(author_ids: List[str], members: List[str]) -> List[str]:
+    """按作者ID、作者名或邮箱匹配团队成员"""
+    wanted = {member.strip().lower() for member in members or [] if member}
+    matched = []
+    for author_info in author_ids:
+        name, email = _split_author(author_info)
+        if author_info.lower() in wanted or name.lower() in wanted or (email and email.lower() in wanted):
+            matched.append(author_info)
+    return matched
+
+
+def _team_projects(author_data_map: Dict[str, List[Dict[str, Any]]],
+                   author_ids: List[str]) -> List[Dict[str, Any]]:
+    """按项目合并成员的部分聚合（项目语言统计只计一次）"""
+    projects: Dict[str, Dict[str, Any]] = {}
+    for author_info in author_ids:
+        for entry in author_data_map.get(author_info, []):
+            project = projects.setdefault(entry['project_name'], {
+                'project_name': entry['project_name'],
+                'path': entry.get('path'),
+                'language_stats': entry.get('language_stats', {}),
+                'partials': [],
+            })
+            project['partials'].append(entry['aggregate'])
+
+    return [
+        {
+            'project_name': project['project_name'],
+            'path': project['path'],
+            'language_stats': project['language_stats'],
+            'aggregate': CommitAggregate.merged(project['partials']),
+        }
+        for project in projects.values()
+    ]
+
+
+def _top_contributors(author_data_map: Dict[str, List[Dict[str, Any]]],
+                      author_ids: List[str]) -> List[Dict[str, Any]]:
+    """按提交数排序的主要贡献者"""
+    contributors = []
+    for author_info in author_ids:
+        entries = author_data_map.get(author_info, [])
+        commits = sum(e['aggregate'].total_commits for e in entries)
+        additions = sum(e['aggregate'].total_additions for e in entries)
+        deletions = sum(e['aggregate'].total_deletions for e in entries)
+        contributors.append({
+            'author_id': author_info,
+            'name': _split_author(author_info)[0],
+            'commits': commits,
+            'additions': additions,
+            'deletions': deletions,
+            'net_lines': additions - deletions,
+            'projects': len(entries),
+        })
+    contributors.sort(key=lambda x: (x['commits'], x['net_lines']), reverse=True)
+    return contributors[:TOP_CONTRIBUTORS]
+
+
+def build_team_report(team: Dict[str, Any], author_ids: List[str],
+                      author_data_map: Dict[str, List[Dict[str, Any]]],
+                      analyzer: DataAnalyzer) -> Dict[str, Any]:
+    """合并成员的部分聚合生成一个团队报告"""
+    analyzed = analyzer.analyze_partials(_team_projects(author_data_map, author_ids))
+    analyzed.pop('raw_data', None)
+    return {
+        'meta': {
+            'team_id': team['id'],
+            'name': team.get('name', team['id']),
+            'year': analyzer.report_year,
+            'members': len(author_ids),
+            'generated_at': datetime.now().isoformat(),
+        },
+        **analyzed,
+        'top_contributors': _top_contributors(author_data_map, author_ids),
+    }
+
+
+def generate_team_reports(config: Dict[str, Any], author_data_map: Dict[str, List[Dict[str, Any]]],
+                          analyzer: DataAnalyzer, output_dir: Path) -> Dict[str, Any]:
+    """生成所有团队报告和全组织报告，返回团队索引
+
+    Args:
+        config: 配置（读取 teams）
+        author_data_map: {映射后的作者ID: DataAnalyzer.author_projects() 的结果}
+        analyzer: 数据分析器
+        output_dir: 报告目录（团队报告写入其下的 teams/）
+    """
+    teams_dir = Path(output_dir) / 'teams'
+    teams_dir.mkdir(parents=True, exist_ok=True)
+    period_label = analyzer.period.label
+    author_ids = list(author_data_map)
+
+    teams = [{'id': ORG_TEAM_ID, 'name': '全组织', 'members': None}]
+    for team in config.get('teams') or []:
+        if not team.get('id'):
+            logger.warning(f"跳过未配置id的团队: {team.get('name', '')}")
+            continue
+        if str(team['id']) == ORG_TEAM_ID:
+            logger.warning(f"团队id '{ORG_TEAM_ID}' 保留给全组织报告，已跳过")
+            continue
+        teams.append({**team, 'id': str(team['id'])})
+
+    team_index = {}
+    for team in teams:
+        members = author_ids if team['members'] is None else match_members(author_ids, team['members'])
+        if not members:
+            logger.warning(f"团队 {team['id']} 没有匹配到任何作者，跳过")
+            continue
+
+        report = build_team_report(team, members, author_data_map, analyzer)
+        safe_id = "".join(c if c.isalnum() or c in ('-', '_') else '_' for c in team['id'])
+        json_filename = f"team_{safe_id}_{period_label}.json"
+        report['meta']['json_file'] = json_filename
+        atomic_write_json(teams_dir / json_filename, report)
+
+        team_index[team['id']] = {
+            'id': team['id'],
+            'name': report['meta']['name'],
+            'members': len(members),
+            'commits': report['summary']['total_commits'],
+            'net_lines': report['summary']['net_lines'],
+            'projects': len(report['projects']),
+            'json_file': json_filename,
+        }
+        logger.info(f"  团队报告: {report['meta']['name']} ({len(members)} 人, {report['summary']['total_commits']} 次提交)")
+
+    atomic_write_json(teams_dir / 'index.json', team_index)
+    return team_index
@@ -0,0 +1,188 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+同比趋势 - 由往年缓存的部分聚合计算年度变化
+
+往年数据直接读取提交存储中的部分聚合（格式过期时由存储的提交补算），不访问Git；
+季度等非整年报告与往年的同一时间段比较；
+每位作者每年只保留一个精简快照（提交数、增删行数、参与项目、使用语言），
+不合并完整聚合。报告年份的快照由分析结果得到，口径与往年一致。
+"""
+
+from typing import Dict, List, Any, Callable, Optional, Tuple
+
+# 变更行数占比不低于该百分比的语言才算"使用"，避免偶尔改一个脚本就算新语言
+MIN_LANGUAGE_SHARE = 1.0
+
+
+def _language_set(language_lines: Dict[str, float]) -> List[str]:
+    total = sum(language_lines.values())
+    if not total:
+        return []
+    return sorted(lang for lang, lines in language_lines.items()
+                  if lang != 'Other' and lines / total * 100 >= MIN_LANGUAGE_SHARE)
+
+
+def year_snapshots(year_partials: Dict[str, Dict[Tuple[str, str], Any]],
+                   key: Callable[[Tuple[str, str]], Optional[str]]) -> Dict[str, Dict[str, Any]]:
+    """由一年的部分聚合计算每位作者的精简快照
+
+    Args:
+        year_partials: {缓存键: {(name, email): CommitAggregate}}（GitDataCollector.load_year_partials）
+        key: 由作者身份得到规范作者ID的函数，返回 None 的身份不参与
+
+    Returns:
+        {作者ID: {'commits', 'additions', 'deletions', 'projects', 'languages'}}
+    """
+    totals: Dict[str, List[int]] = {}
+    projects: Dict[str, set] = {}
+    languages: Dict[str, Dict[str, float]] = {}
+    for partials in year_partials.values():
+        for identity, aggregate in partials.items():
+            author = key(identity)
+            if author is None or not aggregate.total_commits:
+                continue
+            total = totals.setdefault(author, [0, 0, 0])
+            total[0] += aggregate.total_commits
+            total[1] += aggregate.total_additions
+            total[2] += aggregate.total_deletions
+            projects.setdefault(author, set()).update(
+                name for name, (commits, _, _) in aggregate.projects.items() if commits
+            )
+            author_languages = languages.setdefault(author, {})
+            for language_lines in aggregate.languages.values():
+                for lang, lines in language_lines.items():
+                    author_languages[lang] = author_languages.get(lang, 0) + lines
+
+    return {
+        author: {
+            'commits': commits,
+            'additions': additions,
+            'deletions': deletions,
+            'projects': sorted(projects[author]),
+            'languages': _language_set(languages[author]),
+        }
+        for author, (commits, additions, deletions) in totals.items()
+    }
+
+
+def analysis_snapshot(analyzed_data: Dict[str, Any]) -> Dict[str, Any]:
+    """由报告年份的分析结果得到与 year_snapshots 相同口径的快照"""
+    summary = analyzed_data['summary']
+    distribution = analyzed_data['languages'].get('distribution', {})
+    return {
+        'commits': summary['total_commits'],
+        'additions': summary['total_additions'],
+        'deletions': summary['total_deletions'],
+        'projects': sorted(project['name'] for project in analyzed_data['projects']),
+        'languages': sorted(lang for lang, share in distribution.items()
+                            if lang != 'Other' and share >= MIN_LANGUAGE_SHARE),
+    }
+
+
+def _growth(current: int, previous: int) -> Optional[float]:
+    """增长百分比；上一年为0时没有意义，返回 None"""
+    if not previous:
+        return None
+    return round((current - previous) / abs(previous) * 100, 1)
+
+
+def compute_trends(year: int, current: Dict[str, Any],
+                   history: Dict[int, Dict[str, Any]]) -> Dict[str, Any]:
+    """计算一位作者的同比趋势
+
+    Args:
+        year: 报告年份
+        current: 报告年份的快照
+        history: {往年: 快照}，没有提交的年份可以缺失
+
+    Returns:
+        报告中的 trends 字段：逐年概况、与上一年相比的变化，
+        以及此前各年都没有出现过的语言和项目
+    """
+    snapshots = {**history, year: current}
+    years = [
+        {
+            'year': y,
+            'commits': snapshot['commits'],
+            'net_lines': snapshot['additions'] - snapshot['deletions'],
+            'projects': len(snapshot['projects']),
+        }
+        for y, snapshot in sorted(snapshots.items())
+    ]
+
+    earlier = [y for y in history if y < year]
+    previous_year = max(earlier) if earlier else None
+    previous = history.get(previous_year, {'commits': 0, 'additions': 0, 'deletions': 0})
+    net_lines = current['additions'] - current['deletions']
+    previous_net = previous['additions'] - previous['deletions']
+
+    seen_languages = set()
+    seen_projects = set()
+    for y in earlier:
+        seen_languages.update(history[y]['languages'])
+        seen_projects.update(history[y]['projects'])
+
+    return {
+        'years': years,
+        'previous_year': previous_year,
+        'commits_delta': current['commits'] - previous['commits'],
+        'commits_growth': _growth(current['commits'], previous['commits']),
+        'net_lines_delta': net_lines - previous_net,
+        'net_lines_growth': _growth(net_lines, previous_net),
+        # 没有往年数据时不标记"新"语言和项目
+        'new_languages': [lang for lang in current['languages'] if lang not in seen_languages] if earlier else [],
+        'new_projects': [name for name in current['projects'] if name not in seen_projects] if earlier else [],
+    }
+
+
+def author_trends(year: int, analyses: Dict[str, Dict[str, Any]],
+                  history: Dict[int, Dict[str, Dict[str, Any]]]) -> Dict[str, Dict[str, Any]]:
+    """为每位作者计算 trends
+
+    Args:
+        year: 报告年份
+        analyses: {作者ID: 报告年份的分析结果}
+        history: {往年: year_snapshots 的结果}
+    """
+    return {
+        author: compute_trends(
+            year,
+            analysis_snapshot(analyzed_data),
+            {y: snapshots[author] for y, snapshots in history.items() if author in snapshots},
+        )
+        for author, analyzed_data in analyses.items()
+    }
+
+
+def load_history(collector, analyzer, years: int,
+                 key: Callable[[Tuple[str, str]], Optional[str]]) -> Dict[int, Dict[str, Dict[str, Any]]]:
+    """读取往年同一时间段的作者快照（只读提交存储）
+
+    整年报告直接使用往年缓存的部分聚合；季度等非整年范围按平移后的范围查询往年缓存的提交再聚合。
+
+    Args:
+        collector: GitDataCollector 实例
+        analyzer: DataAnalyzer 实例（提供报告时间范围）
+        years: 往前读取的年数
+        key: 由作者身份得到规范作者ID的函数
+
+    Returns:
+        {往年: {作者ID: 快照}}，没有任何缓存的年份不出现
+    """
+    period = analyzer.period
+    history = {}
+    for offset in range(years, 0, -1):
+        prior = period.shift_years(-offset)
+        if period.is_full_year:
+            year_partials = collector.load_year_partials(prior.since.year)
+        else:
+            year_partials = {
+                project_data['project_name']: project_data['partials']
+                for project_data in analyzer.load_projects(
+                    collector.store, repos=collector.project_keys(), period=prior, partials=True
+                )
+            }
+        if year_partials:
+            history[prior.since.year] = year_snapshots(year_partials, key)
+    return history
@@ -0,0 +1,71 @@
+# -*- coding: utf-8 -*-
+"""测试配置：src 下的模块使用平铺导入，把 src 加入 sys.path；提供随机提交的构造工具"""
+
+import random
+import sys
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+
+import pytest
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / 'src'))
+
+# 2025-01-01 00:00:00 UTC
+YEAR_START = 1735689600
+YEAR_SECONDS = 365 * 86400
+
+AUTHORS = [
+    ('Alice', 'alice@example.com'),
+    ('alice', 'alice@users.noreply.github.com'),
+    ('Bob', 'bob@example.com'),
+    ('Carol', 'carol@example.com'),
+]
+
+
+def make_commit(author_ts: int, tz_offset: int = 0, author=AUTHORS[0], additions: int = 1,
+                deletions: int = 0, index: int = 0, **fields):
+    """构造与 GitDataCollector 输出结构一致的提交记录"""
+    tz = timezone(timedelta(seconds=tz_offset))
+    commit = {
+        'hash': f'{index:08x}' + '0' * 32,
+        'short_hash': f'{index:08x}',
+        'author': author[0],
+        'email': author[1],
+        'date': datetime.fromtimestamp(author_ts, tz).isoformat(),
+        'timestamp': author_ts,
+        'author_ts': author_ts,
+        'tz_offset': tz_offset,
+        'message': 'fix: something',
+        'additions': additions,
+        'deletions': deletions,
+        'files_changed': 1,
+        'changed_files': ['src/app.py'],
+        'languages': ['Python'],
+    }
+    commit.update(fields)
+    return commit
+
+
+@pytest.fixture
+def random_commits():
+    """random_commits(count, seed, authors=AUTHORS) -> 按时间排序的随机提交（2025年内）"""
+    def build(count: int, seed: int = 0, authors=AUTHORS):
+        rng = random.Random(seed)
+        commits = []
+        for i in range(count):
+            commits.append(make_commit(
+                YEAR_START + 86400 + rng.randrange(YEAR_SECONDS - 2 * 86400),
+                rng.choice([-8 * 3600, 0, 8 * 3600]),
+                author=rng.choice(authors),
+                additions=rng.randint(0, 500),
+                deletions=rng.randint(0, 500),
+                index=seed * 100000 + i,
+                message=rng.choice(['feat: add api', 'fix: crash #12', 'refactor: cleanup', 'Update docs']),
+                changed_files=[f'src/pkg{rng.randint(0, 3)}/m{rng.randint(0, 5)}.py'
+                               for _ in range(rng.randint(1, 3))],
+                languages=rng.choice([['Python'], ['Go', 'C']]),
+                files_changed=rng.randint(1, 3),
+            ))
+        commits.sort(key=lambda c: c['timestamp'], reverse=True)
+        return commits
+    return build
@@ -0,0 +1,80 @@
+# -*- coding: utf-8 -*-
+"""部分聚合：任意切分后合并与单次遍历结果一致，序列化往返不丢信息"""
+
+import json
+import random
+
+import pytest
+
+from aggregates import CommitAggregate, TopK, build_partials
+
+
+def _canonical(aggregate):
+    """与合并顺序无关的形式：直方图和榜单排序，语言行数（浮点累加）取整到小数点后6位"""
+    data = aggregate.to_dict()
+    for key in ('monthly', 'weekday', 'hourly', 'daily', 'projects'):
+        data[key] = sorted(data[key])
+    data['boards'] = {name: sorted(items) for name, items in data['boards'].items()}
+    data['languages'] = {name: {lang: round(value, 6) for lang, value in lines.items()}
+                         for name, lines in data['languages'].items()}
+    return data
+
+
+def _single_pass(projects):
+    aggregate = CommitAggregate()
+    for name, commits in projects.items():
+        aggregate.add_commits(name, commits)
+    return aggregate
+
+
+@pytest.fixture
+def projects(random_commits):
+    return {f'repo{i}': random_commits(300, seed=i) for i in range(3)}
+
+
+def test_merged_partials_match_single_pass(projects):
+    partials = [aggregate for name, commits in projects.items()
+                for aggregate in build_partials(name, commits).values()]
+    random.Random(1).shuffle(partials)
+    assert _canonical(CommitAggregate.merged(partials)) == _canonical(_single_pass(projects))
+
+
+@pytest.mark.parametrize('seed', range(3))
+def test_merge_of_random_splits_matches_single_pass(projects, seed):
+    rng = random.Random(seed)
+    parts = [CommitAggregate() for _ in range(4)]
+    for name, commits in projects.items():
+        chunks = [[] for _ in parts]
+        for commit in commits:
+            chunks[rng.randrange(len(parts))].append(commit)
+        for part, chunk in zip(parts, chunks):
+            part.add_commits(name, chunk)
+
+    merged = parts[0]
+    for part in parts[1:]:
+        merged.merge(part)
+    assert _canonical(merged) == _canonical(_single_pass(projects))
+
+
+def test_merge_with_empty(projects):
+    single = _single_pass(projects)
+    assert _canonical(CommitAggregate().merge(_single_pass(projects))) == _canonical(single)
+    assert _canonical(CommitAggregate.merged([])) == _canonical(CommitAggregate())
+
+
+def test_dict_round_trip(projects):
+    aggregate = _single_pass(projects)
+    stored = json.loads(json.dumps(aggregate.to_dict()))
+    restored = CommitAggregate.from_dict(stored)
+    assert json.loads(json.dumps(restored.to_dict())) == stored
+
+    with pytest.raises(ValueError):
+        CommitAggregate.from_dict({'version': -1})
+
+
+def test_topk_keeps_highest():
+    board = TopK(3, items=[(score, 0) for score in [5, 1, 9, 7, 3]])
+    other = TopK(3, items=[(8, 0), (2, 0)])
+    board.merge(other)
+    assert board.items() == [(9, 0), (8, 0), (7, 0)]
+    assert board.accepts(7, 1) and not board.accepts(7, 0)
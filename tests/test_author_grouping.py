@@ -0,0 +1,50 @@
+# -*- coding: utf-8 -*-
+"""按作者分组：倒排索引 + 部分聚合合并的结果与逐作者直接分析一致"""
+
+from aggregates import build_partials
+from author_identity import AuthorIndex
+from conftest import AUTHORS
+from data_analyzer import DataAnalyzer
+
+MAPPING = {'alice <alice@users.noreply.github.com>': 'Alice <alice@example.com>'}
+
+
+def _projects(random_commits):
+    projects_data = []
+    for i in range(3):
+        name = f'repo{i}'
+        commits = random_commits(150, seed=i, authors=AUTHORS if i else AUTHORS[:2])
+        projects_data.append({
+            'project_name': name,
+            'path': f'/src/{name}',
+            'commits': commits,
+            'language_stats': {'Python': 10 + i, 'Go': i},
+            'total_commits': len(commits),
+            'partials': build_partials(name, commits),
+        })
+    return projects_data
+
+
+def test_grouped_partials_match_direct_analysis(random_commits):
+    analyzer = DataAnalyzer({'report_year': 2025, 'analysis': {'max_detail_commits': 5}})
+    projects_data = _projects(random_commits)
+    index = AuthorIndex(projects_data, lambda author_info: MAPPING.get(author_info, author_info))
+
+    assert set(index.positions) == {'Alice <alice@example.com>', 'Bob <bob@example.com>',
+                                    'Carol <carol@example.com>'}
+    assert len(index.aliases['Alice <alice@example.com>']) == 2
+
+    for author, positions in index.positions.items():
+        grouped = analyzer.analyze_partials(
+            analyzer.author_projects(projects_data, index.aliases[author], positions))
+
+        # 参照：只取该作者（含映射的别名）的提交，一次遍历直接分析
+        own = []
+        for project_data in projects_data:
+            commits = [c for c in project_data['commits'] if index.commit_key(c) == author]
+            if commits:
+                own.append({**project_data, 'commits': commits})
+        direct = analyzer.analyze(own)
+
+        assert grouped == direct, author
+        assert grouped['summary']['total_commits'] == sum(len(p['commits']) for p in own)
@@ -0,0 +1,59 @@
+# -*- coding: utf-8 -*-
+"""身份聚类：规范化键、并查集合并和建议映射（手工映射优先）"""
+
+from author_identity import normalize_name, save_suggestions, suggest_mappings
+
+
+def _identity(mapping):
+    return lambda author_info: mapping.get(author_info, author_info)
+
+
+def test_normalize_name():
+    assert normalize_name('Sun_Tao') == normalize_name('Tao Sun') == normalize_name('sun.tao') == 'suntao'
+    assert normalize_name('rattus128') == 'rattus'
+    assert normalize_name('José') == 'jose'
+    assert normalize_name('js') is None
+    assert normalize_name('admin') is None
+
+
+def test_clusters_by_email_noreply_id_and_name():
+    identities = {
+        ('Tao Sun', 'tao@corp.com'): 40,
+        ('Sun_Tao', 'suntao@gmail.com'): 5,
+        ('suntao', '1234+suntao@users.noreply.github.com'): 10,
+        ('st-bot', '1234+renamed@users.noreply.github.com'): 1,
+        ('Bob', 'bob@corp.com'): 7,
+        ('bob', 'BOB@corp.com'): 2,
+        ('Alice', 'alice@corp.com'): 3,
+    }
+    assert suggest_mappings(identities, _identity({})) == {
+        'bob <BOB@corp.com>': 'Bob <bob@corp.com>',
+        'Sun_Tao <suntao@gmail.com>': 'Tao Sun <tao@corp.com>',
+        'st-bot <1234+renamed@users.noreply.github.com>': 'Tao Sun <tao@corp.com>',
+        'suntao <1234+suntao@users.noreply.github.com>': 'Tao Sun <tao@corp.com>',
+    }
+
+
+def test_noreply_identity_is_not_canonical():
+    identities = {
+        ('rattus', '99+rattus128@users.noreply.github.com'): 50,
+        ('rattus', 'rattus@home.net'): 1,
+    }
+    assert suggest_mappings(identities, _identity({})) == {
+        'rattus <99+rattus128@users.noreply.github.com>': 'rattus <rattus@home.net>',
+    }
+
+
+def test_manual_mapping_wins():
+    manual = {'Tao Sun <tao@corp.com>': 'Tao <tao@corp.com>'}
+    identities = {('Tao Sun', 'tao@corp.com'): 40, ('Sun_Tao', 'suntao@gmail.com'): 5}
+    # 已手工映射的身份不再出现在建议中，簇内其他身份指向手工映射的目标
+    assert suggest_mappings(identities, _identity(manual)) == {'Sun_Tao <suntao@gmail.com>': 'Tao <tao@corp.com>'}
+
+
+def test_save_suggestions_removes_stale_file(tmp_path):
+    path = tmp_path / 'author_mapping.suggested.yaml'
+    save_suggestions(path, {'a <a@x.com>': 'A <a@x.com>'})
+    assert 'A <a@x.com>' in path.read_text(encoding='utf-8')
+    save_suggestions(path, {})
+    assert not path.exists()
@@ -0,0 +1,47 @@
+# -*- coding: utf-8 -*-
+"""列式缓存块：完整往返、按列/按行解码和只读头部"""
+
+import pytest
+
+import cache_codec
+
+COLUMNS = ['hash', 'message', 'languages', 'changed_files', 'additions']
+
+
+@pytest.fixture
+def records(random_commits):
+    commits = random_commits(120)
+    commits[3]['message'] = None
+    commits[5]['languages'] = []
+    return [{name: commit.get(name) for name in COLUMNS} for commit in commits]
+
+
+def test_round_trip(records):
+    block = cache_codec.encode_records(records, COLUMNS, aggregates={'total_commits': len(records)})
+    assert cache_codec.decode_records(block) == records
+    header = cache_codec.read_header(block)
+    assert header['count'] == len(records)
+    assert header['columns'] == COLUMNS
+    assert header['aggregates'] == {'total_commits': len(records)}
+
+
+def test_column_and_row_subsets(records):
+    block = cache_codec.encode_records(records, COLUMNS)
+    rows = [7, 0, 119, 3, 7]
+    assert cache_codec.decode_columns(block, ['hash']) == {'hash': [r['hash'] for r in records]}
+    assert cache_codec.decode_records(block, ['message', 'changed_files'], rows) == [
+        {'message': records[i]['message'], 'changed_files': records[i]['changed_files']} for i in rows
+    ]
+    # 不存在的列被忽略，空行集合得到空结果
+    assert cache_codec.decode_columns(block, ['missing', 'additions'], [1]) == {'additions': [records[1]['additions']]}
+    assert cache_codec.decode_records(block, ['hash'], []) == []
+
+
+def test_empty_input():
+    assert cache_codec.decode_records(cache_codec.encode_records([], COLUMNS)) == []
+    assert cache_codec.decode_records(cache_codec.encode_records([{'hash': 'a'}], [])) == []
+
+
+def test_rejects_foreign_data():
+    with pytest.raises(ValueError):
+        cache_codec.read_header(b'NOPE' + bytes(8))
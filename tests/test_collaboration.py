@@ -0,0 +1,70 @@
+# -*- coding: utf-8 -*-
+"""协作权重：同窗口共享文件、按作者数归一、相对最晚活跃窗口的半衰期衰减"""
+
+import pytest
+
+from collaboration import collaboration_graph, HALF_LIFE_DAYS, MAX_FILE_AUTHORS, WINDOW_DAYS
+from conftest import YEAR_START, make_commit
+
+WINDOW_SECONDS = WINDOW_DAYS * 86400
+# 某个窗口的起点（窗口按绝对时间划分）
+BASE = (YEAR_START // WINDOW_SECONDS + 1) * WINDOW_SECONDS
+
+ALICE = ('Alice', 'alice@example.com')
+BOB = ('Bob', 'bob@example.com')
+CAROL = ('Carol', 'carol@example.com')
+
+
+def _key(commit):
+    return f"{commit['author']} <{commit['email']}>"
+
+
+def _touch(author, path, window=0, project='repo'):
+    return project, make_commit(BASE + window * WINDOW_SECONDS + 3600, author=author, changed_files=[path])
+
+
+def _graph(touches):
+    projects = {}
+    for project, commit in touches:
+        projects.setdefault(project, []).append(commit)
+    return collaboration_graph([{'project_name': name, 'commits': commits} for name, commits in projects.items()],
+                               key=_key)
+
+
+def _weights(graph, author):
+    return {entry['author_id']: (entry['weight'], entry['shared_files'])
+            for entry in graph[f'{author[0]} <{author[1]}>']}
+
+
+def test_pair_in_same_window():
+    graph = _graph([_touch(ALICE, 'a.py'), _touch(BOB, 'a.py'), _touch(CAROL, 'b.py')])
+    assert _weights(graph, ALICE) == {'Bob <bob@example.com>': (1.0, 1)}
+    assert _weights(graph, BOB) == {'Alice <alice@example.com>': (1.0, 1)}
+    assert graph['Carol <carol@example.com>'] == []
+
+
+def test_different_windows_or_projects_do_not_collaborate():
+    graph = _graph([_touch(ALICE, 'a.py'), _touch(BOB, 'a.py', window=1),
+                    _touch(ALICE, 'c.py', project='x'), _touch(BOB, 'c.py', project='y')])
+    assert graph['Alice <alice@example.com>'] == []
+
+
+def test_weight_normalized_by_file_authors():
+    graph = _graph([_touch(ALICE, 'a.py'), _touch(BOB, 'a.py'), _touch(CAROL, 'a.py')])
+    assert _weights(graph, ALICE) == {'Bob <bob@example.com>': (0.5, 1), 'Carol <carol@example.com>': (0.5, 1)}
+
+
+def test_decay_relative_to_latest_active_window():
+    windows = HALF_LIFE_DAYS // WINDOW_DAYS
+    graph = _graph([_touch(ALICE, 'old.py'), _touch(BOB, 'old.py'),
+                    _touch(ALICE, 'new.py', window=windows), _touch(BOB, 'new.py', window=windows)])
+    # 最晚窗口权重 1，早一个半衰期的窗口权重 0.5
+    assert _weights(graph, ALICE) == {'Bob <bob@example.com>': (1.5, 2)}
+
+
+@pytest.mark.parametrize('authors, counted', [(MAX_FILE_AUTHORS, True), (MAX_FILE_AUTHORS + 1, False)])
+def test_public_files_are_skipped(authors, counted):
+    others = [(f'dev{i}', f'dev{i}@example.com') for i in range(authors - 1)]
+    graph = _graph([_touch(author, 'CHANGELOG.md') for author in [ALICE] + others])
+    weights = set(_weights(graph, ALICE).values())
+    assert weights == ({(round(1 / (authors - 1), 2), 1)} if counted else set())
@@ -0,0 +1,20 @@
+# -*- coding: utf-8 -*-
+"""提交说明分类（约定式前缀、关键词回退、合并提交）"""
+
+import pytest
+
+from commit_messages import classify_message
+
+
+@pytest.mark.parametrize('message, kind, conventional, breaking', [
+    ('feat(api)!: drop v1 endpoints', 'feat', True, True),
+    ('  fix: crash on start', 'fix', True, False),
+    ('docs：更新说明', 'docs', True, False),
+    ('refactor(core) : split module', 'refactor', True, False),
+    ('Update README', 'docs', False, False),
+    ('修复 登录 bug', 'fix', False, False),
+    ('Merge pull request #12 from a/b', 'merge', False, False),
+    ('feat(: unterminated scope', 'other', False, False),
+])
+def test_classify_message(message, kind, conventional, breaking):
+    assert classify_message(message)[:3] == (kind, conventional, breaking)
@@ -0,0 +1,137 @@
+# -*- coding: utf-8 -*-
+"""提交存储：保存/加载往返、按作者本地时间的半开区间查询、部分聚合、变更统计版本和存储格式升级"""
+
+import json
+import sqlite3
+
+import pytest
+
+from aggregates import build_partials
+from commit_store import CommitStore
+from conftest import AUTHORS, make_commit
+from report_period import ReportPeriod
+
+YEAR_2025 = ReportPeriod.year(2025)
+YEAR_2026 = ReportPeriod.year(2026)
+HOUR = 3600
+
+
+@pytest.fixture
+def store(tmp_path):
+    store = CommitStore(tmp_path / 'commits.db')
+    yield store
+    store.close()
+
+
+def _project(commits, name='repo'):
+    return {'project_name': name, 'path': f'/src/{name}', 'commits': commits,
+            'language_stats': {'Python': 2}, 'file_changes': {'src/app.py': len(commits)},
+            'total_commits': len(commits), 'branch': 'main'}
+
+
+def _save(store, year, commits, repo='repo', **kwargs):
+    period = ReportPeriod.year(year)
+    store.save_project(repo, year, _project(commits, repo), period.since_ts, period.until_ts, **kwargs)
+
+
+def _hashes(commits):
+    return [c['hash'] for c in commits]
+
+
+def test_save_and_load_round_trip(store, random_commits):
+    commits = random_commits(50)
+    _save(store, 2025, commits, config_hash='abc')
+
+    loaded = store.load_project('repo', 2025)
+    assert loaded['total_commits'] == 50
+    assert loaded['file_changes'] == {'src/app.py': 50}
+    assert [{key: c[key] for key in original} for c, original in zip(loaded['commits'], commits)] == commits
+
+    scan = store.get_scan('repo', 2025)
+    assert scan['config_hash'] == 'abc'
+    assert scan['total_additions'] == sum(c['additions'] for c in commits)
+    assert store.verify_scan('repo', 2025) == []
+
+    store.delete_scan('repo', 2025)
+    assert store.get_scan('repo', 2025) is None
+    assert store.query_commits() == []
+
+
+def test_range_uses_author_local_half_open_bounds(store):
+    # 作者本地时间 2024-12-31 23:30（-08:00）在 UTC 已是 2025 年，仍属于 2024
+    late_2024 = make_commit(YEAR_2025.since_ts - HOUR // 2 + 8 * HOUR, -8 * HOUR, index=1)
+    # 本地 2025-01-01 00:00（+08:00）恰好是区间起点，包含
+    first_2025 = make_commit(YEAR_2025.since_ts - 8 * HOUR, 8 * HOUR, index=2)
+    # 本地 2026-01-01 00:00 是区间终点，不包含
+    first_2026 = make_commit(YEAR_2026.since_ts, 0, index=3)
+    store.save_project('repo', 2025, _project([late_2024, first_2025, first_2026]))
+
+    assert _hashes(store.query_commits(since=YEAR_2025.since_ts, until=YEAR_2025.until_ts)) == [first_2025['hash']]
+    assert _hashes(store.query_commits(until=YEAR_2025.since_ts)) == [late_2024['hash']]
+    assert _hashes(store.query_commits(since=YEAR_2026.since_ts)) == [first_2026['hash']]
+
+
+def test_resave_replaces_only_its_year(store, random_commits):
+    commits_2025 = random_commits(20)
+    commits_2026 = [make_commit(YEAR_2026.since_ts + i * HOUR, index=900 + i) for i in range(3)]
+    _save(store, 2025, commits_2025)
+    _save(store, 2026, commits_2026)
+    _save(store, 2025, commits_2025[:5])
+
+    assert len(store.query_commits(since=YEAR_2025.since_ts, until=YEAR_2025.until_ts)) == 5
+    assert len(store.query_commits(since=YEAR_2026.since_ts, until=YEAR_2026.until_ts)) == 3
+    assert store.verify_scan('repo', 2025) == [] and store.verify_scan('repo', 2026) == []
+
+
+def test_query_filters_and_details(store, random_commits):
+    commits = random_commits(60)
+    _save(store, 2025, commits)
+    _save(store, 2025, random_commits(10, seed=7), repo='other')
+
+    alice = store.query_commits(repos=['repo'], identities=[AUTHORS[0]], with_repo=True)
+    expected = [c for c in commits if (c['author'], c['email']) == AUTHORS[0]]
+    assert _hashes(alice) == _hashes(expected)
+    assert all(c['repo'] == 'repo' for c in alice)
+    assert [c['changed_files'] for c in alice] == [c['changed_files'] for c in expected]
+    assert [c['message'] for c in alice] == [c['message'] for c in expected]
+
+    bare = store.query_commits(repos=['repo'], details=False)
+    assert len(bare) == 60 and all(c['message'] == '' and c['changed_files'] == [] for c in bare)
+    assert store.query_commits(repos=[]) == [] and store.query_commits(identities=[]) == []
+
+
+def test_partials_round_trip(store, random_commits):
+    commits = random_commits(40)
+    partials = {identity: aggregate.to_dict() for identity, aggregate in build_partials('repo', commits).items()}
+    _save(store, 2025, commits, partials=partials)
+
+    # 部分聚合以JSON保存，元组读回为列表
+    assert store.load_partials(2025) == {'repo': {
+        identity: json.loads(json.dumps(data)) for identity, data in partials.items()}}
+    assert store.load_partials(2025, repos=['missing']) == {}
+    assert store.verify_scan('repo', 2025) == []
+
+
+def test_commit_stats_are_versioned(store):
+    store.save_commit_stats([{'hash': 'a' * 40, 'additions': 3, 'changed_files': ['x.py']}], '1.0')
+    assert store.get_commit_stats(['a' * 40], '1.0')['a' * 40]['changed_files'] == ['x.py']
+    assert store.get_commit_stats(['a' * 40], '2.0') == {}
+    assert store.prune_commit_stats('2.0') == 1
+    assert store.get_commit_stats(['a' * 40], '1.0') == {}
+
+
+def test_schema_upgrade_drops_scans_but_keeps_commit_stats(tmp_path, random_commits):
+    path = tmp_path / 'commits.db'
+    store = CommitStore(path)
+    _save(store, 2025, random_commits(10))
+    store.save_commit_stats([{'hash': 'b' * 40}], '1.0')
+    store.close()
+
+    with sqlite3.connect(str(path)) as conn:
+        conn.execute("UPDATE meta SET value = '0' WHERE key = 'schema_version'")
+    conn.close()
+
+    store = CommitStore(path)
+    assert store.list_scans() == [] and store.query_commits() == []
+    assert list(store.get_commit_stats(['b' * 40], '1.0')) == ['b' * 40]
+    store.close()
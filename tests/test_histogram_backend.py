@@ -0,0 +1,71 @@
+# -*- coding: utf-8 -*-
+"""numpy 与纯 Python 两种分析后端的 CommitAggregate 输出应完全一致（含字典顺序）"""
+
+import random
+
+import pytest
+
+pytest.importorskip('numpy')
+
+from aggregates import CommitAggregate  # noqa: E402
+
+# 2025-01-01 00:00:00 UTC
+_YEAR_START = 1735689600
+_YEAR_SECONDS = 365 * 86400
+_TZ_OFFSETS = [-8 * 3600, -5 * 3600, 0, 3600, 5 * 3600 + 1800, 8 * 3600, 14 * 3600]
+
+
+def _random_commits(rng: random.Random, count: int):
+    commits = []
+    for i in range(count):
+        additions = rng.choice([0, rng.randint(0, 50), rng.randint(0, 5000)])
+        deletions = rng.choice([0, rng.randint(0, 50), rng.randint(0, 5000)])
+        commits.append({
+            'hash': f'{i:040x}',
+            'message': rng.choice(['feat: add api', 'fix: crash on start', 'refactor: cleanup', 'docs', '']),
+            'author_ts': _YEAR_START + rng.randrange(_YEAR_SECONDS),
+            'tz_offset': rng.choice(_TZ_OFFSETS),
+            'timestamp': _YEAR_START + rng.randrange(_YEAR_SECONDS),
+            'additions': additions,
+            'deletions': deletions,
+            'files_changed': rng.randint(0, 10),
+            'changed_files': [f'src/m{rng.randint(0, 20)}.py' for _ in range(rng.randint(0, 3))],
+            'languages': rng.choice([['Python'], ['Go', 'C'], []]),
+        })
+    return commits
+
+
+def _aggregate(backend: str, projects):
+    aggregate = CommitAggregate(backend)
+    for name, commits in projects:
+        aggregate.add_commits(name, commits)
+    return aggregate.to_dict()
+
+
+@pytest.mark.parametrize('seed', range(5))
+def test_backends_match_on_random_commits(seed):
+    rng = random.Random(seed)
+    projects = [(f'repo{i}', _random_commits(rng, rng.randint(1, 400))) for i in range(3)]
+    assert _aggregate('numpy', projects) == _aggregate('python', projects)
+
+
+def test_backends_match_after_merge():
+    rng = random.Random(42)
+    projects = [(f'repo{i}', _random_commits(rng, 200)) for i in range(3)]
+
+    def merged(backend):
+        parts = []
+        for name, commits in projects:
+            part = CommitAggregate(backend)
+            part.add_commits(name, commits)
+            parts.append(part)
+        return CommitAggregate.merged(parts).to_dict()
+
+    assert merged('numpy') == merged('python')
+
+
+@pytest.mark.parametrize('projects', [[], [('empty', [])]])
+def test_backends_match_on_empty_input(projects):
+    result = _aggregate('numpy', projects)
+    assert result == _aggregate('python', projects)
+    assert result['monthly'] == [] and result['daily'] == []
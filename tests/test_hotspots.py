@@ -0,0 +1,62 @@
+# -*- coding: utf-8 -*-
+"""路径前缀树：目录汇总与逐前缀暴力统计一致，顶层目录和热点汇总"""
+
+import random
+
+from hotspots import PathTrie, count_file_changes, hotspot_summary
+
+
+def _random_files(seed=0, count=200):
+    rng = random.Random(seed)
+    files = {}
+    for _ in range(count):
+        depth = rng.randint(0, 5)
+        path = '/'.join([f'd{rng.randint(0, 3)}' for _ in range(depth)] + [f'f{rng.randint(0, 9)}.py'])
+        files[path] = files.get(path, 0) + rng.randint(1, 20)
+    return files
+
+
+def _brute_force_directories(files, max_depth):
+    directories = {}
+    for path, changes in files.items():
+        parts = path.split('/')[:-1]
+        for depth in range(1, min(len(parts), max_depth) + 1):
+            prefix = '/'.join(parts[:depth]) + '/'
+            total, count = directories.get(prefix, (0, 0))
+            directories[prefix] = (total + changes, count + 1)
+    return directories
+
+
+def test_directory_rollups_match_brute_force():
+    files = _random_files()
+    trie = PathTrie(files)
+    for max_depth in (1, 3, 10):
+        rolled = {path: (changes, count) for path, changes, count in trie.top_directories(10 ** 6, max_depth)}
+        assert rolled == _brute_force_directories(files, max_depth)
+    assert trie.root.changes == sum(files.values())
+    assert trie.root.files == len(files)
+
+
+def test_insert_accumulates_without_double_counting_files():
+    trie = PathTrie()
+    trie.insert('src/a.py', 2)
+    trie.insert('src/a.py', 3)
+    trie.insert('src/b.py')
+    assert trie.top_directories() == [('src/', 6, 2)]
+    assert trie.top_files() == [('src/a.py', 5), ('src/b.py', 1)]
+
+
+def test_top_level_churn():
+    trie = PathTrie({'src/a.py': 5, 'src/x/b.py': 1, 'docs/c.md': 2, 'README.md': 4})
+    assert trie.top_level_churn() == {'src/': 6, '/': 4, 'docs/': 2}
+
+
+def test_count_and_summary():
+    commits = [{'changed_files': ['a/x.py', 'a/y.py']}, {'changed_files': ['a/x.py']}, {'changed_files': None}]
+    assert count_file_changes(commits) == {'a/x.py': 2, 'a/y.py': 1}
+
+    summary = hotspot_summary({'p1': {'a/x.py': 2, 'a/y.py': 1}, 'p2': {'b/z.py': 5}, 'empty': {}}, limit=2)
+    assert summary['files'] == [{'project': 'p2', 'path': 'b/z.py', 'changes': 5},
+                                {'project': 'p1', 'path': 'a/x.py', 'changes': 2}]
+    assert summary['directories'][0] == {'project': 'p2', 'path': 'b/', 'changes': 5, 'files': 1}
+    assert summary['churn_by_directory'] == {'p1': {'a/': 3}, 'p2': {'b/': 5}}
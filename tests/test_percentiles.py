@@ -0,0 +1,49 @@
+# -*- coding: utf-8 -*-
+"""作者间百分位排名：并列处理、分布分位数，以及 numpy / 纯 Python 结果一致"""
+
+import random
+
+import pytest
+
+from percentiles import author_percentiles, index_percentiles
+
+
+def _analysis(commits, additions=0, net_lines=0, files=0, projects=1, refactor_ratio=0.0):
+    return {
+        'summary': {'total_commits': commits, 'total_additions': additions, 'net_lines': net_lines,
+                    'files_changed': files},
+        'projects': [{}] * projects,
+        'code_quality': {'refactor_ratio': refactor_ratio},
+    }
+
+
+def test_ranks_with_ties():
+    analyses = {'a': _analysis(10), 'b': _analysis(20), 'c': _analysis(20), 'd': _analysis(40)}
+    result = author_percentiles(analyses)
+    commits = {author: result[author]['metrics']['total_commits'] for author in analyses}
+
+    assert [(commits[a]['rank'], commits[a]['percentile'], commits[a]['top_percent']) for a in 'abcd'] == [
+        (4, 25.0, 100.0), (2, 75.0, 75.0), (2, 75.0, 75.0), (1, 100.0, 25.0)]
+    assert commits['a']['distribution'] == {'p25': 17.5, 'p50': 20.0, 'p75': 25.0, 'p90': 34.0,
+                                            'max': 40, 'mean': 22.5}
+    assert result['a']['authors'] == 4
+    # 所有人指标相同时都并列第一
+    assert {m['rank'] for m in (result[a]['metrics']['projects'] for a in analyses)} == {1}
+    assert index_percentiles(result['d'])['total_commits'] == 25.0
+
+
+def test_empty_and_single():
+    assert author_percentiles({}) == {}
+    single = author_percentiles({'a': _analysis(3)})['a']['metrics']['total_commits']
+    assert (single['rank'], single['percentile'], single['top_percent']) == (1, 100.0, 100.0)
+
+
+def test_numpy_backend_matches_python():
+    pytest.importorskip('numpy')
+    rng = random.Random(3)
+    analyses = {
+        f'author{i}': _analysis(rng.randint(0, 50), rng.randint(0, 5000), rng.randint(-500, 500),
+                                rng.randint(0, 100), rng.randint(1, 4), round(rng.random(), 2))
+        for i in range(40)
+    }
+    assert author_percentiles(analyses, 'numpy') == author_percentiles(analyses, 'python')
@@ -0,0 +1,68 @@
+# -*- coding: utf-8 -*-
+"""报告时间范围：配置解析、标签和按作者本地日期的半开区间边界"""
+
+from datetime import date
+
+import pytest
+
+from aggregates import local_seconds
+from conftest import make_commit
+from report_period import ReportPeriod
+
+
+@pytest.mark.parametrize('value, since, until, label', [
+    (2025, date(2025, 1, 1), date(2026, 1, 1), '2025'),
+    ('2025', date(2025, 1, 1), date(2026, 1, 1), '2025'),
+    ('2025-Q3', date(2025, 7, 1), date(2025, 10, 1), '2025-Q3'),
+    ('2025q4', date(2025, 10, 1), date(2026, 1, 1), '2025-Q4'),
+    ('2025-12', date(2025, 12, 1), date(2026, 1, 1), '2025-12'),
+    ('2025-07-01..2025-10-01', date(2025, 7, 1), date(2025, 10, 1), '2025-Q3'),
+    ('2025-07-15..2025-08-01', date(2025, 7, 15), date(2025, 8, 1), '2025-07-15_2025-07-31'),
+    ({'since': '2024-12-01', 'until': date(2025, 2, 1)}, date(2024, 12, 1), date(2025, 2, 1),
+     '2024-12-01_2025-01-31'),
+])
+def test_parse(value, since, until, label):
+    period = ReportPeriod.parse(value)
+    assert (period.since, period.until, period.label) == (since, until, label)
+
+
+@pytest.mark.parametrize('value', ['2025-Q5', '2025-13', 'last year', '2025-07-01..2025-07-01'])
+def test_parse_rejects_invalid(value):
+    with pytest.raises(ValueError):
+        ReportPeriod.parse(value)
+
+
+def test_from_config():
+    assert ReportPeriod.from_config({'report_year': 2023}).label == '2023'
+    assert ReportPeriod.from_config({'report_year': 2023, 'report_period': '2025-Q1'}).label == '2025-Q1'
+
+
+def test_half_open_bounds_use_author_local_time():
+    period = ReportPeriod.parse('2025-Q1')
+
+    def inside(commit):
+        return period.since_ts <= local_seconds(commit) < period.until_ts
+
+    start = period.since_ts
+    end = period.until_ts
+
+    assert inside(make_commit(start))
+    assert not inside(make_commit(start - 1))
+    assert inside(make_commit(end - 1))
+    assert not inside(make_commit(end))
+    # UTC 已是 4 月 1 日 06:00，但作者本地（-08:00）仍是 3 月 31 日
+    assert inside(make_commit(end + 6 * 3600, -8 * 3600))
+    # UTC 还是 12 月 31 日 20:00，作者本地（+08:00）已是 1 月 1 日
+    assert inside(make_commit(start - 4 * 3600, 8 * 3600))
+
+
+def test_years_days_and_shift():
+    period = ReportPeriod.parse('2024-12-15..2025-01-02')
+    assert period.years == [2024, 2025]
+    assert ReportPeriod.parse('2025-Q4').years == [2025]
+    days = list(period.days())
+    assert days[0] == date(2024, 12, 15) and days[-1] == date(2025, 1, 1) and len(days) == 18
+    assert not period.is_full_year and ReportPeriod.year(2025).is_full_year
+
+    leap = ReportPeriod.parse('2024-02-29..2024-03-01').shift_years(-1)
+    assert (leap.since, leap.until) == (date(2023, 2, 28), date(2023, 3, 1))
@@ -0,0 +1,88 @@
+# -*- coding: utf-8 -*-
+"""编码会话切分（任意输入顺序、可合并）和连续提交天数/最长间断"""
+
+import random
+from datetime import date
+
+import pytest
+
+from aggregates import SESSION_GAP_SECONDS, SessionTracker
+from conftest import make_commit
+from data_analyzer import DataAnalyzer
+from report_period import ReportPeriod
+
+GAP = SESSION_GAP_SECONDS
+
+
+def _brute_force(times):
+    sessions = []
+    for t in sorted(times):
+        if sessions and t - sessions[-1][1] <= GAP:
+            sessions[-1][1] = t
+            sessions[-1][2] += 1
+        else:
+            sessions.append([t, t, 1])
+    return sessions
+
+
+def _track(times):
+    tracker = SessionTracker()
+    for t in times:
+        tracker.add(t)
+    return tracker
+
+
+@pytest.fixture
+def times():
+    rng = random.Random(5)
+    t, result = 0, []
+    for _ in range(300):
+        t += rng.choice([60, 600, GAP, GAP + 1, 5 * GAP])
+        result.append(t)
+    return result
+
+
+@pytest.mark.parametrize('order', ['ascending', 'descending', 'shuffled'])
+def test_sessions_independent_of_input_order(times, order):
+    ordered = {'ascending': times, 'descending': times[::-1],
+               'shuffled': random.Random(1).sample(times, len(times))}[order]
+    assert _track(ordered).close() == _brute_force(times)
+
+
+def test_gap_boundary():
+    assert _track([0, GAP]).close() == [[0, GAP, 2]]
+    assert _track([0, GAP + 1]).close() == [[0, 0, 1], [GAP + 1, GAP + 1, 1]]
+
+
+def test_merge_matches_single_tracker(times):
+    rng = random.Random(2)
+    parts = [[], [], []]
+    for t in times:
+        parts[rng.randrange(3)].append(t)
+    merged = _track(parts[0]).merge(_track(parts[1])).merge(_track(parts[2]))
+    assert merged.sessions == _brute_force(times)
+
+
+def test_streaks_and_gaps():
+    days = [date(2025, 1, d) for d in (2, 3, 4, 6, 10, 11)]
+    period = ReportPeriod.year(2025)
+    commits = [make_commit(period.since_ts + (day - period.since).days * 86400 + 10 * 3600, index=i)
+               for i, day in enumerate(days)]
+    commits.append(make_commit(commits[0]['author_ts'] + 600, index=99))
+
+    analyzed = DataAnalyzer({'report_year': 2025}).analyze([{'project_name': 'repo', 'commits': commits}])
+    sessions = analyzed['time_distribution']['sessions']
+    assert sessions['longest_streak'] == {'start': '2025-01-02', 'end': '2025-01-04', 'days': 3}
+    assert sessions['longest_gap'] == {'start': '2025-01-07', 'end': '2025-01-09', 'days': 3}
+    assert sessions['count'] == len(days)
+    assert sessions['longest_minutes'] == 10.0
+    assert analyzed['leaderboards']['longest_streaks'][:3] == [
+        {'start': '2025-01-02', 'end': '2025-01-04', 'days': 3, 'commits': 4},
+        {'start': '2025-01-10', 'end': '2025-01-11', 'days': 2, 'commits': 2},
+        {'start': '2025-01-06', 'end': '2025-01-06', 'days': 1, 'commits': 1},
+    ]
+
+
+def test_no_commits():
+    sessions = DataAnalyzer({'report_year': 2025}).analyze([])['time_distribution']['sessions']
+    assert sessions['count'] == 0 and sessions['longest_streak'] is None and sessions['longest_gap'] is None
@@ -0,0 +1,65 @@
+# -*- coding: utf-8 -*-
+"""团队/组织汇总：由作者部分聚合合并，总数与直接分析全部提交一致"""
+
+import json
+
+from aggregates import build_partials
+from author_identity import AuthorIndex
+from data_analyzer import DataAnalyzer
+from team_rollup import generate_team_reports, match_members
+
+
+def _author_data_map(analyzer, projects_data):
+    index = AuthorIndex(projects_data, lambda author_info: author_info)
+    return {
+        author: analyzer.author_projects(projects_data, index.aliases[author], positions)
+        for author, positions in index.positions.items()
+    }
+
+
+def _projects(random_commits):
+    projects_data = []
+    for i in range(2):
+        commits = random_commits(100, seed=i)
+        projects_data.append({
+            'project_name': f'repo{i}', 'path': f'/src/repo{i}', 'commits': commits,
+            'language_stats': {'Python': 3}, 'partials': build_partials(f'repo{i}', commits),
+        })
+    return projects_data
+
+
+def test_match_members():
+    authors = ['Alice <alice@example.com>', 'Bob <bob@example.com>', 'Carol <carol@example.com>']
+    assert match_members(authors, ['alice', 'BOB@example.com', 'Carol <carol@example.com>', 'nobody']) == authors
+    assert match_members(authors, []) == []
+
+
+def test_team_and_org_totals(random_commits, tmp_path):
+    analyzer = DataAnalyzer({'report_year': 2025})
+    projects_data = _projects(random_commits)
+    author_data_map = _author_data_map(analyzer, projects_data)
+    config = {'teams': [{'id': 'backend', 'name': '后端组', 'members': ['bob@example.com', 'Carol']},
+                        {'id': 'org', 'members': ['Alice']}, {'name': 'no id'}]}
+
+    index = generate_team_reports(config, author_data_map, analyzer, tmp_path)
+    assert set(index) == {'org', 'backend'}
+
+    all_commits = [c for p in projects_data for c in p['commits']]
+    org = json.loads((tmp_path / 'teams' / index['org']['json_file']).read_text(encoding='utf-8'))
+    assert org['meta']['members'] == len(author_data_map)
+    direct = analyzer.analyze(projects_data)['summary']
+    # 最活跃的一天并列时取合并顺序中最先出现的一天，只比较其提交数
+    day_counts = {}
+    for commit in all_commits:
+        day = commit['date'][:10]
+        day_counts[day] = day_counts.get(day, 0) + 1
+    assert day_counts[org['summary'].pop('most_active_day')] == max(day_counts.values())
+    direct.pop('most_active_day')
+    assert org['summary'] == direct
+    assert index['org']['commits'] == len(all_commits)
+    assert sum(c['commits'] for c in org['top_contributors']) == len(all_commits)
+
+    backend = [c for c in all_commits if c['email'] in ('bob@example.com', 'carol@example.com')]
+    assert index['backend']['members'] == 2
+    assert index['backend']['commits'] == len(backend)
+    assert index['backend']['net_lines'] == sum(c['additions'] - c['deletions'] for c in backend)
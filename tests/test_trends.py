@@ -0,0 +1,105 @@
+# -*- coding: utf-8 -*-
+"""同比趋势：与上一年的差值和增长率、没有往年数据时的处理、新语言和新项目"""
+
+from types import SimpleNamespace
+
+from trends import author_trends, compute_trends, year_snapshots
+
+
+def _snapshot(commits, additions=0, deletions=0, projects=(), languages=()):
+    return {'commits': commits, 'additions': additions, 'deletions': deletions,
+            'projects': sorted(projects), 'languages': sorted(languages)}
+
+
+def test_deltas_against_previous_year():
+    history = {
+        2023: _snapshot(4, 40, 10, ['a'], ['Python']),
+        2024: _snapshot(8, 30, 10, ['a', 'b'], ['Go']),
+    }
+    current = _snapshot(12, 50, 20, ['a', 'c'], ['Go', 'Python', 'TypeScript'])
+    trends = compute_trends(2025, current, history)
+
+    assert trends['years'] == [
+        {'year': 2023, 'commits': 4, 'net_lines': 30, 'projects': 1},
+        {'year': 2024, 'commits': 8, 'net_lines': 20, 'projects': 2},
+        {'year': 2025, 'commits': 12, 'net_lines': 30, 'projects': 2},
+    ]
+    assert trends['previous_year'] == 2024
+    assert (trends['commits_delta'], trends['commits_growth']) == (4, 50.0)
+    assert (trends['net_lines_delta'], trends['net_lines_growth']) == (10, 50.0)
+    # 新语言和项目相对此前所有年份，而不只是上一年
+    assert trends['new_languages'] == ['TypeScript']
+    assert trends['new_projects'] == ['c']
+
+
+def test_previous_year_may_be_missing():
+    # 2024 年没有提交时与最近有数据的 2022 年比较
+    trends = compute_trends(2025, _snapshot(3, 5, 10), {2022: _snapshot(6, 10, 5)})
+    assert trends['previous_year'] == 2022
+    assert (trends['commits_delta'], trends['commits_growth']) == (-3, -50.0)
+    # 上一年净行数为正、今年为负：按上一年绝对值计算
+    assert (trends['net_lines_delta'], trends['net_lines_growth']) == (-10, -200.0)
+
+
+def test_no_history():
+    trends = compute_trends(2025, _snapshot(5, 7, 2, ['a'], ['Python']), {})
+    assert trends['years'] == [{'year': 2025, 'commits': 5, 'net_lines': 5, 'projects': 1}]
+    assert trends['previous_year'] is None
+    assert (trends['commits_delta'], trends['commits_growth']) == (5, None)
+    assert (trends['net_lines_delta'], trends['net_lines_growth']) == (5, None)
+    assert trends['new_languages'] == [] and trends['new_projects'] == []
+
+
+def test_zero_previous_has_no_growth():
+    trends = compute_trends(2025, _snapshot(5, 3, 1), {2024: _snapshot(0, 2, 2)})
+    assert trends['commits_delta'] == 5 and trends['commits_growth'] is None
+    assert trends['net_lines_delta'] == 2 and trends['net_lines_growth'] is None
+
+
+def test_later_history_years_are_not_previous():
+    trends = compute_trends(2024, _snapshot(2), {2025: _snapshot(9), 2023: _snapshot(1)})
+    assert trends['previous_year'] == 2023 and trends['commits_delta'] == 1
+    assert [y['year'] for y in trends['years']] == [2023, 2024, 2025]
+
+
+def _aggregate(commits, additions, deletions, projects, languages):
+    return SimpleNamespace(total_commits=commits, total_additions=additions, total_deletions=deletions,
+                           projects=projects, languages=languages)
+
+
+def test_year_snapshots_merge_identities():
+    alice = ('Alice', 'alice@example.com')
+    alias = ('alice', 'alice@users.noreply.github.com')
+    bob = ('Bob', 'bob@example.com')
+    year_partials = {
+        'repo1': {
+            alice: _aggregate(3, 30, 5, {'repo1': (3, 30, 5)}, {'repo1': {'Python': 30, 'Other': 5}}),
+            bob: _aggregate(0, 0, 0, {}, {}),
+        },
+        'repo2': {
+            alias: _aggregate(2, 200, 0, {'repo2': (2, 200, 0), 'ghost': (0, 0, 0)},
+                              {'repo2': {'Go': 1000, 'Shell': 5}}),
+        },
+    }
+    key = {alice: 'alice', alias: 'alice', bob: 'bob'}.get
+    snapshots = year_snapshots(year_partials, key)
+
+    # 没有提交的身份不出现；'Other' 和占比不足 1% 的语言不算使用
+    assert snapshots == {'alice': _snapshot(5, 230, 5, ['repo1', 'repo2'], ['Go', 'Python'])}
+    assert year_snapshots(year_partials, lambda identity: None) == {}
+
+
+def test_author_trends_uses_each_authors_history():
+    analyses = {
+        author: {
+            'summary': {'total_commits': commits, 'total_additions': commits, 'total_deletions': 0},
+            'projects': [{'name': 'repo'}],
+            'languages': {'distribution': {'Python': 99.5, 'Other': 0.5}},
+        }
+        for author, commits in (('alice', 6), ('bob', 2))
+    }
+    history = {2024: {'alice': _snapshot(3, 3, 0, ['repo'], ['Python'])}}
+    trends = author_trends(2025, analyses, history)
+
+    assert trends['alice']['commits_growth'] == 100.0 and trends['alice']['new_projects'] == []
+    assert trends['bob']['previous_year'] is None and trends['bob']['commits_delta'] == 2